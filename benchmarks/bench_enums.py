@@ -0,0 +1,68 @@
+"""
+Microbenchmarks of the enum lookups on the hot paths (report decoding and parameter validation), against the
+original implementations that scanned the members and compared (and hashed) str() of every member.
+
+Run with: python -m benchmarks.bench_enums [--number N]
+"""
+import timeit
+import argparse
+from typing import Any, Type
+
+from million_verifier import FileStatus, Result, Quality, SubResult
+from million_verifier._enums import _BaseEnum
+
+
+def _legacy_contains(cls: Type[_BaseEnum], obj: Any) -> bool:
+    for item in cls:
+        if str(obj) == str(item):
+            return True
+
+    return False
+
+
+def _legacy_eq(member: _BaseEnum, other: Any) -> bool:
+    return isinstance(other, (_BaseEnum, str)) and str(member) == str(other)
+
+
+def _legacy_hash(member: _BaseEnum) -> int:
+    return hash(str(member))
+
+
+def _per_call(statement: Any, number: int) -> float:
+    # best of a few runs, in nanoseconds per call:
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--number", type=int, default=100_000, help="Number of calls per measurement."
+    )
+    args = parser.parse_args()
+
+    print(f"{'lookup':<32}{'legacy (ns)':>14}{'current (ns)':>14}{'speed-up':>10}")
+    for cls in (FileStatus, Result, Quality, SubResult):
+        # the last member is the worst case for a scan:
+        member = list(cls)[-1]
+        value = member.value
+        cases = [
+            (
+                "contains",
+                lambda: _legacy_contains(cls, value),
+                lambda: cls.contains(value),
+            ),
+            ("construct", lambda: cls(value), lambda: cls.from_value(value)),
+            ("eq", lambda: _legacy_eq(member, value), lambda: member == value),
+            ("hash", lambda: _legacy_hash(member), lambda: hash(member)),
+        ]
+        for name, legacy, current in cases:
+            legacy_ns = _per_call(statement=legacy, number=args.number)
+            current_ns = _per_call(statement=current, number=args.number)
+            print(
+                f"{cls.__name__ + '.' + name:<32}{legacy_ns:>14.0f}{current_ns:>14.0f}"
+                f"{legacy_ns / current_ns:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
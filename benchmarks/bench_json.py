@@ -0,0 +1,180 @@
+"""
+Benchmark of decoding API responses (a filelist page and a single verification): microseconds per response for every
+installed JSON backend, against the original implementation (stdlib json, then converting the fields with strptime
+and the enum constructors).
+
+Run with: python -m benchmarks.bench_json [--number N]
+"""
+import json
+import timeit
+import argparse
+from datetime import datetime
+from typing import Callable, Any
+
+from million_verifier import (
+    JsonDecoder,
+    EmailVerification,
+    FileList,
+    FileStatus,
+    Quality,
+    Result,
+    SubResult,
+)
+from million_verifier._api import (
+    parse_email_verification,
+    parse_file_list,
+    PAGINATION_LIMIT,
+)
+from million_verifier._json import _BACKENDS, _is_installed
+
+
+def _legacy_parse_file_info(response: dict) -> dict:
+    # the original implementation, for comparison:
+    info = response.copy()
+    info["file_id"] = int(info["file_id"])
+    info["status"] = FileStatus(info["status"])
+    info["updated_at"] = datetime.strptime(info["updated_at"], "%Y-%m-%d %H:%M:%S")
+    info["createdate"] = datetime.strptime(info["createdate"], "%Y-%m-%d %H:%M:%S")
+    return info
+
+
+def _legacy_file_list(body: bytes) -> dict:
+    response = json.loads(body)
+    return {
+        "files": [_legacy_parse_file_info(info) for info in response["files"]],
+        "total": int(response["total"]),
+    }
+
+
+def _legacy_verification(body: bytes) -> dict:
+    response = json.loads(body)
+    response["quality"] = Quality(response["quality"])
+    response["result"] = Result(response["result"])
+    response["subresult"] = SubResult(response["subresult"])
+    return response
+
+
+def make_file_list(files: int = PAGINATION_LIMIT) -> bytes:
+    """
+    Generate a filelist page shaped like the ones the API returns.
+    """
+    return json.dumps(
+        {
+            "files": [
+                {
+                    "file_id": str(1_000_000 + index),
+                    "file_name": f"contacts-{index}.csv",
+                    "status": "finished",
+                    "unique_emails": 9_500,
+                    "updated_at": "2024-01-02 10:11:12",
+                    "createdate": "2024-01-02 09:00:00",
+                    "percent": 100,
+                    "total_rows": 10_000,
+                    "verified": 9_500,
+                    "unverified": 0,
+                    "ok": 7_000,
+                    "catch_all": 1_000,
+                    "disposable": 100,
+                    "invalid": 1_200,
+                    "unknown": 200,
+                    "reverify": 0,
+                    "credit": 9_500,
+                    "estimated_time_sec": 0,
+                    "error": "",
+                }
+                for index in range(files)
+            ],
+            "total": str(files),
+        }
+    ).encode()
+
+
+def make_verification() -> bytes:
+    """
+    Generate a single-verify response shaped like the ones the API returns.
+    """
+    return json.dumps(
+        {
+            "email": "matthew@gmail.com",
+            "quality": "good",
+            "result": "ok",
+            "resultcode": 1,
+            "subresult": "ok",
+            "free": True,
+            "role": False,
+            "didyoumean": "",
+            "credits": 12_345,
+            "executiontime": 1,
+            "error": "",
+            "livemode": True,
+        }
+    ).encode()
+
+
+def _per_call(statement: Callable[[], Any], number: int) -> float:
+    # best of a few runs, in microseconds per call:
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=2_000,
+        help="Number of responses decoded per measurement.",
+    )
+    args = parser.parse_args()
+
+    file_list = make_file_list()
+    verification = make_verification()
+    cases = [
+        (
+            "legacy",
+            lambda: _legacy_file_list(file_list),
+            lambda: _legacy_verification(verification),
+        )
+    ]
+    for backend in _BACKENDS:
+        if not _is_installed(backend=backend):
+            print(f"{backend} is not installed, skipping it.")
+            continue
+
+        decoder = JsonDecoder(backend=backend)
+        cases.append(
+            (
+                backend,
+                lambda decoder=decoder: parse_file_list(
+                    response=decoder.decode(body=file_list, response_format=FileList),
+                    limit=PAGINATION_LIMIT,
+                ),
+                lambda decoder=decoder: parse_email_verification(
+                    response=decoder.decode(
+                        body=verification, response_format=EmailVerification
+                    ),
+                ),
+            )
+        )
+
+    print(
+        f"{'backend':<12}{'filelist (us)':>16}{'speed-up':>10}{'verify (us)':>16}{'speed-up':>10}"
+    )
+    legacy_list_us = legacy_verify_us = None
+    for name, decode_list, decode_verification in cases:
+        # every backend must decode to the same thing:
+        assert (
+            decode_list() == cases[0][1]() and decode_verification() == cases[0][2]()
+        ), name
+        list_us = _per_call(statement=decode_list, number=args.number)
+        verify_us = _per_call(statement=decode_verification, number=args.number * 10)
+        if legacy_list_us is None:
+            legacy_list_us, legacy_verify_us = list_us, verify_us
+
+        print(
+            f"{name:<12}{list_us:>16.1f}{legacy_list_us / list_us:>9.1f}x"
+            f"{verify_us:>16.2f}{legacy_verify_us / verify_us:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark of report decoding: rows per second for the optimised decoder against the original per-cell loop,
+and the memory held by a decoded report as a list of dicts against records and columns.
+
+Run with: python -m benchmarks.bench_report [--rows N]
+"""
+import io
+import csv
+import time
+import argparse
+import tracemalloc
+from typing import Iterable, Iterator, Callable
+
+from million_verifier import ReportDecoder, ReportColumns, Quality, Result
+
+
+def _legacy_parse_report(lines: Iterable[str]) -> Iterator[dict]:
+    # the original implementation, for comparison:
+    headings = []
+    for csv_row in csv.reader(lines):
+        if not headings:
+            headings = csv_row
+            continue
+
+        row = {}
+        for key, val in zip(headings, csv_row):
+            if key == "quality":
+                row[key] = Quality(val)
+
+            elif key == "result":
+                row[key] = Result(val)
+
+            elif key in ("free", "role"):
+                if val.lower() == "yes":
+                    row[key] = True
+
+                elif val.lower() == "no":
+                    row[key] = False
+
+                else:
+                    raise ValueError(f"Unrecognised {key}: {val}")
+
+            else:
+                row[key] = val
+
+        yield row
+
+
+def make_report(rows: int) -> str:
+    """
+    Generate a csv-report shaped like the ones the API returns.
+    """
+    cells = [
+        ("good", "ok", "ok", "yes", "no"),
+        ("risky", "catch_all", "unknown", "no", "no"),
+        ("bad", "invalid", "no_mailbox", "no", "yes"),
+        ("risky", "unknown", "greylisted", "yes", "no"),
+    ]
+    buffer = io.StringIO()
+    buffer.write("email,first_name,quality,result,subresult,free,role,didyoumean\n")
+    for index in range(rows):
+        quality, result, subresult, free, role = cells[index % len(cells)]
+        buffer.write(
+            f"user{index}@example.com,User,{quality},{result},{subresult},{free},{role},\n"
+        )
+
+    return buffer.getvalue()
+
+
+def rows_per_second(
+    parse: Callable[[Iterable[str]], Iterator[dict]], report: str, repeat: int = 3
+) -> float:
+    lines = report.splitlines(keepends=True)
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(1 for _ in parse(lines))
+        best = min(best, time.perf_counter() - start)
+
+    return rows / best
+
+
+def held_memory(build: Callable[[Iterable[str]], object], report: str) -> int:
+    """
+    Memory (in bytes) held by the result of decoding the report.
+    """
+    lines = report.splitlines(keepends=True)
+    tracemalloc.start()
+    try:
+        result = build(lines)
+        held, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, default=200_000, help="Number of rows in the report."
+    )
+    args = parser.parse_args()
+
+    report = make_report(rows=args.rows)
+    legacy = rows_per_second(parse=_legacy_parse_report, report=report)
+    optimised = rows_per_second(
+        parse=lambda lines: ReportDecoder.iter_report(lines=lines), report=report
+    )
+    print(f"legacy:    {legacy:>12,.0f} rows/sec")
+    print(f"optimised: {optimised:>12,.0f} rows/sec ({optimised / legacy:.1f}x)")
+    columnar = rows_per_second(
+        parse=lambda lines: range(len(ReportColumns.from_lines(lines=lines))),
+        report=report,
+    )
+    print(f"columnar:  {columnar:>12,.0f} rows/sec ({columnar / legacy:.1f}x)")
+
+    dicts_held = held_memory(
+        build=lambda lines: list(ReportDecoder.iter_report(lines=lines)), report=report
+    )
+    records_held = held_memory(
+        build=lambda lines: list(ReportDecoder.iter_records(lines=lines)), report=report
+    )
+    columns_held = held_memory(
+        build=lambda lines: ReportColumns.from_lines(lines=lines), report=report
+    )
+    print(f"list of dicts: {dicts_held / args.rows:>8,.0f} bytes/row")
+    print(
+        f"records:       {records_held / args.rows:>8,.0f} bytes/row ({dicts_held / records_held:.1f}x less)"
+    )
+    print(
+        f"columns:       {columns_held / args.rows:>8,.0f} bytes/row ({dicts_held / columns_held:.1f}x less)"
+    )
+
+
+if __name__ == "__main__":
+    main()
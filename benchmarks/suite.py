@@ -0,0 +1,331 @@
+"""
+Benchmark suite for the client's hot paths, run against a local mock server and synthetic payloads, such that it
+needs neither an API key nor anything beyond the standard library.
+
+Every benchmark reports its throughput, latency percentiles (per iteration) and peak memory (traced in a separate
+run), and is compared against the stored baselines (benchmarks/baselines.json). Timings depend on the machine, so
+baselines are only meaningful when saved and compared on the same machine.
+
+Run with: python -m benchmarks.suite [--quick] [--only NAME] [--save] [--check] [--tolerance FRACTION]
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from million_verifier import (
+    MillionVerifierClient,
+    JsonDecoder,
+    FileList,
+    FileStatus,
+    SubResult,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import parse_file_list, parse_report, PAGINATION_LIMIT
+
+from benchmarks.bench_json import make_file_list
+from benchmarks.bench_report import make_report
+
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# number of files on the server, for the pagination benchmark:
+_LISTED_FILES = 2_000
+
+# metrics where higher is better, the others are better lower:
+_HIGHER_IS_BETTER = frozenset({"throughput"})
+
+
+class Benchmark:
+    """
+    A single benchmark: a function that's timed per iteration, where every iteration processes units (e.g., rows).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        unit: str,
+        units: int = 1,
+        iterations: int = 100,
+        quick: bool = True,
+    ) -> None:
+        """
+        :param name: Name of the benchmark, as stored in the baselines.
+        :param fn: Function to time.
+        :param unit: Unit of the throughput (e.g., rows).
+        :param units: Number of units processed per call of fn.
+        :param iterations: Number of timed calls.
+        :param quick: Whether to run the benchmark with --quick.
+        """
+        self.name = name
+        self.fn = fn
+        self.unit = unit
+        self.units = units
+        self.iterations = iterations
+        self.quick = quick
+
+    def run(self) -> Dict[str, float]:
+        if self.iterations > 1:
+            # warm up connections, caches and lookup tables:
+            self.fn()
+
+        timings = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            self.fn()
+            timings.append(time.perf_counter() - start)
+
+        # tracing slows everything down, so memory is measured in a run of its own:
+        tracemalloc.start()
+        try:
+            self.fn()
+            _, peak = tracemalloc.get_traced_memory()
+
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "throughput": self.units * len(timings) / sum(timings),
+            "p50_ms": _percentile(timings=timings, q=50) * 1e3,
+            "p95_ms": _percentile(timings=timings, q=95) * 1e3,
+            "p99_ms": _percentile(timings=timings, q=99) * 1e3,
+            "peak_kib": peak / 1024,
+        }
+
+
+def _percentile(timings: List[float], q: float) -> float:
+    # nearest rank, on sorted timings:
+    return timings[min(len(timings) - 1, max(0, round(q / 100 * len(timings)) - 1))]
+
+
+def build_benchmarks(server: MockMillionVerifierServer) -> List[Benchmark]:
+    client = MillionVerifierClient(
+        api_key="key",
+        single_api_url=server.url,
+        bulk_api_url=server.url,
+        # every call should make a request:
+        coalesce_requests=False,
+    )
+    decoder = JsonDecoder()
+    file_list = make_file_list(files=PAGINATION_LIMIT)
+
+    # a finished file to download, and enough files for many pages:
+    report_file = server.add_file(
+        contents="".join(f"user{index}@example.com\n" for index in range(10_000))
+    )
+    for index in range(_LISTED_FILES - 1):
+        server.add_file(
+            contents=f"user{index}@example.com\n", file_name=f"file-{index}.txt"
+        )
+
+    client.bulk_job(file_id=report_file["file_id"]).wait(timeout=60)
+    reports = {
+        rows: make_report(rows=rows).splitlines(keepends=True)
+        for rows in (10_000, 1_000_000)
+    }
+    statuses = [member.value for member in FileStatus]
+    sub_results = [member.value for member in SubResult]
+    return [
+        Benchmark(
+            name="verify_round_trip",
+            fn=lambda: client.verify_email_address(email="matthew@gmail.com"),
+            unit="requests",
+            iterations=500,
+        ),
+        Benchmark(
+            name="file_list_page_parse",
+            fn=lambda: parse_file_list(
+                response=decoder.decode(body=file_list, response_format=FileList),
+                limit=PAGINATION_LIMIT,
+            ),
+            unit="files",
+            units=PAGINATION_LIMIT,
+            iterations=500,
+        ),
+        Benchmark(
+            name="file_list_page_round_trip",
+            fn=lambda: client._list_files(limit=PAGINATION_LIMIT),
+            unit="files",
+            units=PAGINATION_LIMIT,
+            iterations=50,
+        ),
+        Benchmark(
+            name="list_files_pagination",
+            fn=lambda: client.list_files(max_workers=4),
+            unit="files",
+            units=_LISTED_FILES,
+            iterations=3,
+        ),
+        Benchmark(
+            name="report_decode_10k",
+            fn=lambda: sum(1 for _ in parse_report(lines=reports[10_000])),
+            unit="rows",
+            units=10_000,
+            iterations=20,
+        ),
+        Benchmark(
+            name="report_decode_1m",
+            fn=lambda: sum(1 for _ in parse_report(lines=reports[1_000_000])),
+            unit="rows",
+            units=1_000_000,
+            iterations=1,
+            quick=False,
+        ),
+        Benchmark(
+            name="get_report_10k",
+            fn=lambda: client.get_report(file_id=report_file["file_id"]),
+            unit="rows",
+            units=10_000,
+            iterations=10,
+        ),
+        Benchmark(
+            name="enum_from_value",
+            fn=lambda: [SubResult.from_value(value) for value in sub_results]
+            + [FileStatus.from_value(value) for value in statuses],
+            unit="lookups",
+            units=len(sub_results) + len(statuses),
+            iterations=10_000,
+        ),
+        Benchmark(
+            name="enum_contains",
+            fn=lambda: [SubResult.contains(value) for value in sub_results],
+            unit="lookups",
+            units=len(sub_results),
+            iterations=10_000,
+        ),
+    ]
+
+
+def compare(
+    result: Dict[str, float], baseline: Optional[Dict[str, float]], tolerance: float
+) -> Tuple[str, bool]:
+    """
+    Compare a result against its baseline.
+
+    :param result: Metrics of the benchmark.
+    :param baseline: Stored metrics of the benchmark, if any.
+    :param tolerance: Fraction by which a metric may be worse than its baseline before it's a regression.
+    :return: Summary of the comparison, and whether the benchmark regressed.
+    """
+    if baseline is None:
+        return "no baseline", False
+
+    changes = []
+    regressed = False
+    for metric in ("throughput", "p50_ms", "peak_kib"):
+        if not baseline.get(metric):
+            continue
+
+        ratio = result[metric] / baseline[metric]
+        worse = (
+            ratio < 1 - tolerance
+            if metric in _HIGHER_IS_BETTER
+            else ratio > 1 + tolerance
+        )
+        regressed = regressed or worse
+        changes.append(f"{metric} {ratio - 1:+.0%}{' !' if worse else ''}")
+
+    return ", ".join(changes), regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Skip the slowest benchmarks (e.g., 1M rows).",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Only run the benchmarks with this name (repeatable).",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the new baselines."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with an error if any benchmark regressed.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Fraction by which a metric may be worse than its baseline (default: 0.25).",
+    )
+    args = parser.parse_args()
+
+    stored = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    baselines: Dict[str, Dict[str, float]] = stored.get("benchmarks", {})
+    results = {}
+    regressions = []
+    with MockMillionVerifierServer(rows_per_second=1_000_000) as server:
+        benchmarks = build_benchmarks(server=server)
+        print(
+            f"{'benchmark':<28}{'throughput':>12}{'':<11}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}"
+            f"{'peak (KiB)':>12}  vs baseline"
+        )
+        for benchmark in benchmarks:
+            if (args.quick and not benchmark.quick) or (
+                args.only and benchmark.name not in args.only
+            ):
+                continue
+
+            result = results[benchmark.name] = benchmark.run()
+            summary, regressed = compare(
+                result=result,
+                baseline=baselines.get(benchmark.name),
+                tolerance=args.tolerance,
+            )
+            if regressed:
+                regressions.append(benchmark.name)
+
+            print(
+                f"{benchmark.name:<28}{result['throughput']:>12,.0f} {benchmark.unit + '/s':<10}"
+                f"{result['p50_ms']:>11.3f}{result['p95_ms']:>11.3f}{result['p99_ms']:>11.3f}"
+                f"{result['peak_kib']:>12,.0f}  {summary}"
+            )
+
+    if args.save:
+        BASELINES_PATH.write_text(
+            json.dumps(
+                {
+                    "machine": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                    },
+                    # keep the baselines of benchmarks that weren't run:
+                    "benchmarks": {
+                        **baselines,
+                        **{
+                            name: {
+                                metric: float(f"{val:.4g}")
+                                for metric, val in result.items()
+                            }
+                            for name, result in results.items()
+                        },
+                    },
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        print(f"Saved baselines to {BASELINES_PATH}.")
+
+    if args.check and regressions:
+        print(f"Regressed: {', '.join(regressions)}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
 from ._client import *
+from ._client_async import *
 from ._utils import (
     MV_SINGLE_API_URL,
     MV_BULK_API_URL,
 )
 from ._exceptions import *
+from ._retry import *
+from ._rate_limit import *
+from ._connection import *
+from ._cache import *
+from ._credits import *
+from ._preprocess import *
+from ._json import *
+from ._hooks import *
+from ._report import *
+from ._columnar import *
+from ._records import *
+from ._single_flight import *
+from ._bulk import *
 from ._enums import *
 from ._formats import *
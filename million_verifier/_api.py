@@ -0,0 +1,352 @@
+"""
+Endpoint definitions shared by the synchronous and asynchronous clients.
+
+Everything in here is transport-agnostic: building (and validating) request parameters and parsing raw
+responses into the typed formats, such that both clients behave identically.
+"""
+from datetime import datetime
+from typing import List, Optional, Iterable, Iterator, IO, TypedDict
+
+from ._utils import (
+    STREAM_CHUNK_SIZE,
+    JsonDict,
+    stringify,
+    datetime_to_str,
+    str_to_datetime,
+    bool_to_int,
+)
+from ._enums import FileStatus, ReportStatus, Result, Quality, SubResult, ResultFilter
+from ._formats import EmailVerification, FileInfo, FileList, ReportEntry
+from ._report import ReportDecoder
+from ._records import EmailVerificationRecord, FileInfoRecord, ReportEntryRecord
+
+
+__all__ = [
+    "PAGINATION_LIMIT",
+    "VERIFY_PATH",
+    "CREDITS_PATH",
+    "UPLOAD_PATH",
+    "FILE_INFO_PATH",
+    "FILE_LIST_PATH",
+    "DOWNLOAD_PATH",
+    "STOP_PATH",
+    "DELETE_PATH",
+    "VERIFICATION_READ_MARGIN",
+    "validate_verification_timeout",
+    "validate_max_concurrency",
+    "verification_params",
+    "upload_file_name",
+    "UPLOAD_FIELD",
+    "multipart_content_type",
+    "multipart_upload_body",
+    "list_files_params",
+    "report_params",
+    "RecordFileList",
+    "set_verification_email",
+    "parse_email_verification",
+    "parse_email_verification_record",
+    "parse_file_info",
+    "parse_file_info_record",
+    "parse_file_list",
+    "parse_report",
+]
+
+# limit can be found at https://developer.millionverifier.com/#operation/bulk-filelist
+PAGINATION_LIMIT = 50
+
+# single api:
+VERIFY_PATH = "/api/v3"
+CREDITS_PATH = "/api/v3/credits"
+# bulk api:
+UPLOAD_PATH = "/bulkapi/v2/upload"
+FILE_INFO_PATH = "/bulkapi/v2/fileinfo"
+FILE_LIST_PATH = "/bulkapi/v2/filelist"
+DOWNLOAD_PATH = "/bulkapi/v2/download"
+STOP_PATH = "/bulkapi/stop"
+DELETE_PATH = "/bulkapi/v2/delete"
+
+# the server may take as long as the requested verification
+# timeout, so we give it this many seconds extra:
+VERIFICATION_READ_MARGIN = 5
+
+
+def validate_verification_timeout(timeout: int) -> None:
+    assert (
+        2 <= timeout <= 60
+    ), f"Verification timeout must be between 2 and 60 (inclusive), but received {timeout}."
+
+
+def validate_max_concurrency(max_concurrency: int) -> None:
+    assert (
+        max_concurrency >= 1
+    ), f"max_concurrency must be at least 1, but received {max_concurrency}."
+
+
+def verification_params(api_key: str, email: str, timeout: int) -> JsonDict:
+    validate_verification_timeout(timeout=timeout)
+    return {
+        "api": api_key,
+        "email": email,
+        "timeout": timeout,
+    }
+
+
+def upload_file_name(file_path: str, file_name: Optional[str]) -> str:
+    file_type = file_path.split(".")[-1]
+    if file_type not in ("csv", "txt"):
+        raise ValueError(
+            f"Can only upload csv or txt files, {file_type} not supported."
+        )
+
+    if file_name is None:
+        file_name = file_path.split("/")[-1]
+
+    return file_name
+
+
+# name of the multipart field holding the uploaded file:
+UPLOAD_FIELD = "file_contents"
+
+
+def multipart_content_type(boundary: str) -> str:
+    return f"multipart/form-data; boundary={boundary}"
+
+
+def multipart_upload_body(
+    emails: Iterable[str | bytes] | IO,
+    file_name: str,
+    boundary: str,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Generate the multipart body of an upload, one chunk at a time, such that the emails never need to be held in
+    memory (or written to disk) in full.
+
+    :param emails: Either an iterable of email addresses (or lines), or a (text or binary) file-like object.
+    :param file_name: Name of the uploaded file.
+    :param boundary: Multipart boundary, which must not occur in the emails.
+    :param chunk_size: Approximate size (in bytes) of the chunks to generate.
+    :return: Iterator over the chunks of the body.
+    """
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{UPLOAD_FIELD}"; filename="{file_name}"\r\n'
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode()
+
+    if hasattr(emails, "read"):
+        while chunk := emails.read(chunk_size):
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+    else:
+        # join the lines into chunks, rather than
+        # sending every email as a chunk of its own:
+        buffer = bytearray()
+        for email in emails:
+            line = email.encode() if isinstance(email, str) else email
+            buffer += line
+            if not line.endswith(b"\n"):
+                buffer += b"\n"
+
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def list_files_params(
+    api_key: str,
+    offset: int = 0,
+    limit: int = PAGINATION_LIMIT,
+    file_id: Optional[int | List[int]] = None,
+    name: Optional[str] = None,
+    status: Optional[FileStatus | List[FileStatus]] = None,
+    updated_at_from: Optional[datetime] = None,
+    updated_at_to: Optional[datetime] = None,
+    create_date_from: Optional[datetime] = None,
+    create_date_to: Optional[datetime] = None,
+    percent_from: Optional[int] = None,
+    percent_to: Optional[int] = None,
+    has_error: Optional[bool] = None,
+) -> JsonDict:
+    # verify pagination:
+    assert offset >= 0, f"offset must be positive, but received {offset}"
+    assert (
+        0 <= limit <= PAGINATION_LIMIT
+    ), f"limit must be between 0 and {PAGINATION_LIMIT}, but received {limit}."
+
+    # if we pass in a non-integer for file_id, it doesn't work, so we enforce integer:
+
+    # verify time filters:
+    if updated_at_from is not None and updated_at_to is not None:
+        assert (
+            updated_at_from <= updated_at_to
+        ), f"updated_at_from ({updated_at_from}) must be before updated_at_to ({updated_at_to})."
+
+    if create_date_from is not None and create_date_to is not None:
+        assert (
+            create_date_from <= create_date_to
+        ), f"create_date_from ({create_date_from}) must be before create_date_to ({create_date_to})."
+
+    # verify percent filters:
+    for percent in (percent_from, percent_to):
+        if percent is not None:
+            assert (
+                0 <= percent <= 100
+            ), "percentage must be between 1 and 100 (inclusive)"
+
+    if percent_from is not None and percent_to is not None:
+        assert (
+            percent_from <= percent_to
+        ), f"percent_from ({percent_from}) cannot be greater than percent_to ({percent_to})"
+
+    # verify status:
+    if status is not None:
+        statuses = status if isinstance(status, list) else [status]
+        for state in statuses:
+            assert FileStatus.contains(
+                state
+            ), f"{state} is not a valid FileStatus. Valid options are: {FileStatus.all()}"
+
+    # there is an api bug where, if you set limit to 0, it
+    # acts as 50 (weird), so we handle that by making it 1:
+    limit_to_use = 1 if limit == 0 else limit
+    return {
+        "key": api_key,
+        "offset": offset,
+        "limit": limit_to_use,
+        "id": stringify(file_id),
+        "name": name,
+        "status": stringify(status),
+        "updated_at_from": datetime_to_str(updated_at_from),
+        "updated_at_to": datetime_to_str(updated_at_to),
+        "createdate_from": datetime_to_str(create_date_from),
+        "createdate_to": datetime_to_str(create_date_to),
+        "percent_from": percent_from,
+        "percent_to": percent_to,
+        "has_error": has_error,
+    }
+
+
+def report_params(
+    api_key: str,
+    file_id: int,
+    result_filter: ResultFilter = ResultFilter.ALL,
+    status: Optional[ReportStatus | List[ReportStatus]] = None,
+    include_free_domains: Optional[bool] = None,
+    include_role_emails: Optional[bool] = None,
+) -> JsonDict:
+    if result_filter != ResultFilter.CUSTOM:
+        assert status is None, "Must apply custom filter enum to filter statuses."
+        assert (
+            include_free_domains is None
+        ), "Must apply custom filter enum to filter free domains."
+        assert (
+            include_role_emails is None
+        ), "Must apply custom filter enum to filter role emails."
+
+    return {
+        "key": api_key,
+        "file_id": file_id,
+        "filter": result_filter,
+        "statuses": stringify(status),
+        "free": bool_to_int(include_free_domains),
+        "role": bool_to_int(include_role_emails),
+    }
+
+
+class RecordFileList(TypedDict):
+    """
+    FileList with the files as records, for decoding the file list straight into records.
+    """
+
+    files: List[FileInfoRecord]
+    total: int
+
+
+def set_verification_email(
+    verification: EmailVerification | EmailVerificationRecord, email: str
+) -> None:
+    if isinstance(verification, EmailVerificationRecord):
+        verification.email = email
+
+    else:
+        verification["email"] = email
+
+
+def parse_email_verification(response: dict) -> EmailVerification:
+    response["quality"] = Quality.from_value(response["quality"])
+    response["result"] = Result.from_value(response["result"])
+    response["subresult"] = SubResult.from_value(response["subresult"])
+    return response
+
+
+def parse_email_verification_record(
+    response: dict | EmailVerificationRecord,
+) -> EmailVerificationRecord:
+    if isinstance(response, EmailVerificationRecord):
+        # decoded straight into a record already (by msgspec):
+        return response
+
+    # built from the decoded JSON, converting the record's fields in place:
+    record = EmailVerificationRecord.from_dict(verification=response)
+    record.quality = Quality.from_value(record.quality)
+    record.result = Result.from_value(record.result)
+    record.subresult = SubResult.from_value(record.subresult)
+    return record
+
+
+def parse_file_info(response: dict) -> FileInfo:
+    # the response is freshly decoded JSON that nothing
+    # else holds on to, so it's converted in place:
+    info = response
+    info["file_id"] = int(info["file_id"])
+    info["status"] = FileStatus.from_value(info["status"])
+    info["updated_at"] = str_to_datetime(info["updated_at"])
+    info["createdate"] = str_to_datetime(info["createdate"])
+    return info
+
+
+def parse_file_info_record(response: dict | FileInfoRecord) -> FileInfoRecord:
+    if isinstance(response, FileInfoRecord):
+        # decoded straight into a record already (by msgspec):
+        return response
+
+    record = FileInfoRecord.from_dict(info=response)
+    record.file_id = int(record.file_id)
+    record.status = FileStatus.from_value(record.status)
+    record.updated_at = str_to_datetime(record.updated_at)
+    record.createdate = str_to_datetime(record.createdate)
+    return record
+
+
+def parse_file_list(response: dict, limit: int, as_records: bool = False) -> FileList:
+    # if the limit was 0, we don't return any files,
+    # else parse all the files and return em:
+    parse = parse_file_info_record if as_records else parse_file_info
+    files = [] if limit == 0 else [parse(raw_info) for raw_info in response["files"]]
+    return FileList(
+        files=files,
+        total=int(response["total"]),
+    )
+
+
+def parse_report(
+    lines: Iterable[str], as_records: bool = False
+) -> Iterator[ReportEntry | ReportEntryRecord]:
+    """
+    Parse the rows of a csv-report, one at a time.
+
+    :param lines: Lines of the csv-report, including the headings.
+    :param as_records: Whether to parse the rows into (compact) records rather than dicts.
+    :return: Iterator over the parsed rows.
+    """
+    if as_records:
+        yield from ReportDecoder.iter_records(lines=lines)
+
+    else:
+        yield from ReportDecoder.iter_report(lines=lines)
@@ -0,0 +1,740 @@
+import os
+import time
+import threading
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Iterable,
+    Iterator,
+    Callable,
+    BinaryIO,
+    TYPE_CHECKING,
+)
+
+from requests import RequestException
+
+from ._enums import FileStatus, ReportStatus, ResultFilter
+from ._formats import FileInfo, FileChange, ReportEntry, DownloadSummary
+from ._records import ReportEntryRecord
+from ._exceptions import APIException, InvalidAPIKey, BulkJobFailed
+from ._utils import normalise_email
+from ._api import PAGINATION_LIMIT
+
+if TYPE_CHECKING:
+    from ._client import MillionVerifierClient
+
+
+__all__ = [
+    "FileWatcher",
+    "BulkJob",
+    "ShardedBulkJob",
+    "BulkPoller",
+]
+
+
+# API errors that polling again won't fix:
+_PERMANENT_ERRORS = (FileNotFoundError, InvalidAPIKey)
+
+_TERMINAL_STATUSES = frozenset(
+    {
+        FileStatus.FINISHED,
+        FileStatus.ERROR,
+        FileStatus.CANCELED,
+    }
+)
+
+
+class FileWatcher:
+    """
+    Tracks the info of a set of uploaded files, refreshing all of them with as few file-list requests as possible
+    (one per PAGINATION_LIMIT files, rather than one per file), and emitting a FileChange whenever a file's status
+    or progress changes.
+    """
+
+    def __init__(
+        self,
+        client: "MillionVerifierClient",
+        file_ids: Optional[Iterable[int]] = None,
+        on_change: Optional[Callable[[FileChange], None]] = None,
+    ) -> None:
+        """
+        :param client: Client to refresh the files with.
+        :param file_ids: IDs of the files to watch.
+        :param on_change: Called with every change, from the thread refreshing the files.
+        """
+        self._client = client
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        # latest info per watched file, None until the file is first seen:
+        self._files: Dict[int, Optional[FileInfo]] = {}
+        for file_id in file_ids or []:
+            self.add(file_id=file_id)
+
+    @property
+    def file_ids(self) -> List[int]:
+        with self._lock:
+            return list(self._files)
+
+    def add(self, file_id: int, info: Optional[FileInfo] = None) -> None:
+        """
+        Start watching a file.
+
+        :param file_id: ID of the file.
+        :param info: Latest info for the file, if already known.
+        :return: Nothing.
+        """
+        with self._lock:
+            if info is not None or file_id not in self._files:
+                self._files[file_id] = info
+
+    def remove(self, file_id: int) -> None:
+        with self._lock:
+            self._files.pop(file_id, None)
+
+    def get(self, file_id: int) -> Optional[FileInfo]:
+        """
+        Get the latest info for a watched file.
+
+        :param file_id: ID of the file.
+        :return: Latest info, or None if the file hasn't been seen (yet).
+        """
+        with self._lock:
+            return self._files.get(file_id)
+
+    def refresh(self, file_ids: Optional[Iterable[int]] = None) -> List[FileChange]:
+        """
+        Refresh the info of the watched files. Files that no longer exist are no longer watched.
+
+        :param file_ids: IDs of the (watched) files to refresh, defaults to all watched files.
+        :return: Changes since the previous refresh, in the order the files were refreshed.
+        """
+        with self._lock:
+            file_ids = [
+                file_id
+                for file_id in (self._files if file_ids is None else file_ids)
+                if file_id in self._files
+            ]
+
+        changes = []
+        for start in range(0, len(file_ids), PAGINATION_LIMIT):
+            chunk = file_ids[start : start + PAGINATION_LIMIT]
+            file_list = self._client._list_files(file_id=chunk, limit=len(chunk))
+            refreshed = {info["file_id"]: info for info in file_list["files"]}
+            with self._lock:
+                for file_id in chunk:
+                    if file_id not in self._files:
+                        # removed while we were refreshing:
+                        continue
+
+                    previous = self._files[file_id]
+                    current = refreshed.get(file_id)
+                    if current is None:
+                        del self._files[file_id]
+
+                    else:
+                        self._files[file_id] = current
+
+                    if _has_changed(previous=previous, current=current):
+                        changes.append(
+                            FileChange(
+                                file_id=file_id, previous=previous, current=current
+                            )
+                        )
+
+        if self._on_change is not None:
+            for change in changes:
+                self._on_change(change)
+
+        return changes
+
+
+def _has_changed(previous: Optional[FileInfo], current: Optional[FileInfo]) -> bool:
+    if previous is None or current is None:
+        return previous is not current
+
+    return (
+        previous["status"] != current["status"]
+        or previous["percent"] != current["percent"]
+    )
+
+
+class BulkJob:
+    """
+    A file uploaded for bulk verification, tracked until it is done, after which its report can be fetched.
+    Its status is refreshed by a (shared) BulkPoller, which polls adaptively based on the file's progress.
+    """
+
+    def __init__(
+        self, client: "MillionVerifierClient", info: FileInfo, poller: "BulkPoller"
+    ) -> None:
+        """
+        :param client: Client the file was uploaded with.
+        :param info: Latest info for the file.
+        :param poller: Poller refreshing the file's info.
+        """
+        self._client = client
+        self._poller = poller
+        self._condition = threading.Condition()
+        self._info = info
+        self._error: Optional[BaseException] = None
+        # (time, percent) of the previous refresh, to extrapolate
+        # the remaining time if there is no estimate:
+        self._previous_progress: Optional[tuple] = None
+        self._observed_at = time.monotonic()
+
+    @property
+    def file_id(self) -> int:
+        return self._info["file_id"]
+
+    @property
+    def info(self) -> FileInfo:
+        with self._condition:
+            return self._info
+
+    @property
+    def status(self) -> FileStatus:
+        return self.info["status"]
+
+    @property
+    def done(self) -> bool:
+        with self._condition:
+            return self._is_done()
+
+    def _is_done(self) -> bool:
+        return self._error is not None or self._info["status"] in _TERMINAL_STATUSES
+
+    def wait(
+        self, timeout: Optional[float] = None, fail_on_pause: bool = False
+    ) -> FileInfo:
+        """
+        Wait for the file to finish verifying.
+
+        :param timeout: Maximum number of seconds to wait, waits indefinitely if None.
+        :param fail_on_pause: Whether to raise if the file is paused (e.g., because credits ran out), rather than
+            waiting for it to be resumed.
+        :return: Info for the finished file.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._error is not None:
+                    raise self._error
+
+                status = self._info["status"]
+                if status == FileStatus.FINISHED:
+                    return self._info
+
+                if status in (FileStatus.ERROR, FileStatus.CANCELED) or (
+                    fail_on_pause and status == FileStatus.PAUSED
+                ):
+                    raise BulkJobFailed(
+                        f"File {self.file_id} is {status}: {self._info.get('error')}",
+                        file_info=self._info,
+                    )
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"File {self.file_id} did not finish within {timeout} seconds, it is {status} "
+                        f"({self._info['percent']}%)."
+                    )
+
+                self._condition.wait(timeout=remaining)
+
+    def iter_report(
+        self,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        as_records: bool = False,
+    ) -> Iterator[ReportEntry | ReportEntryRecord]:
+        """
+        Wait for the file to finish verifying, then stream its report.
+
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param timeout: Maximum number of seconds to wait for the file to finish, waits indefinitely if None.
+        :param as_records: Whether to return the rows as (compact) ReportEntryRecords rather than dicts.
+        :return: Iterator over the rows of the csv-report.
+        """
+        self.wait(timeout=timeout)
+        yield from self._client.iter_report(
+            file_id=self.file_id,
+            result_filter=result_filter,
+            status=status,
+            include_free_domains=include_free_domains,
+            include_role_emails=include_role_emails,
+            as_records=as_records,
+        )
+
+    def download_report(
+        self,
+        destination: str | os.PathLike | BinaryIO,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        resume: bool = False,
+    ) -> DownloadSummary:
+        """
+        Wait for the file to finish verifying, then download its raw csv-report.
+
+        :param destination: Path to write the report to, or a writable binary stream.
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param timeout: Maximum number of seconds to wait for the file to finish, waits indefinitely if None.
+        :param resume: Whether to resume a partially downloaded report (only when destination is a path).
+        :return: Summary of the download.
+        """
+        self.wait(timeout=timeout)
+        return self._client.download_report(
+            file_id=self.file_id,
+            destination=destination,
+            result_filter=result_filter,
+            status=status,
+            include_free_domains=include_free_domains,
+            include_role_emails=include_role_emails,
+            resume=resume,
+        )
+
+    def stop(self) -> None:
+        """
+        Stop verifying the file, results for the already verified email addresses remain available.
+        Does nothing if the file is already done.
+        """
+        if self.done:
+            return
+
+        self._client.stop_a_file_in_progress(file_id=self.file_id)
+        self._poller.poll_soon(job=self)
+
+    def _update(
+        self,
+        info: Optional[FileInfo] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._condition:
+            if self._is_done():
+                # a done job is final, late refreshes (e.g., of
+                # a file that has since been deleted) are ignored:
+                return
+
+            if info is not None:
+                self._previous_progress = (self._observed_at, self._info["percent"])
+                self._observed_at = time.monotonic()
+                self._info = info
+
+            self._error = error
+            self._condition.notify_all()
+
+    def _next_poll_interval(self, min_interval: float, max_interval: float) -> float:
+        with self._condition:
+            info = self._info
+            status = info["status"]
+            estimated_time = float(info.get("estimated_time_sec") or 0)
+            if status == FileStatus.PAUSED:
+                # a paused file can sit there for a long
+                # time, so there's no point hurrying:
+                interval = max_interval
+
+            elif estimated_time > 0:
+                # aim halfway through the estimate, such that we
+                # poll more often as the file approaches the end:
+                interval = estimated_time / 2
+
+            elif (
+                self._previous_progress is not None
+                and info["percent"] > self._previous_progress[1]
+            ):
+                # no estimate, so extrapolate from the
+                # progress since the previous refresh:
+                previous_time, previous_percent = self._previous_progress
+                rate = (info["percent"] - previous_percent) / max(
+                    self._observed_at - previous_time, 1e-3
+                )
+                interval = (100 - info["percent"]) / rate / 2
+
+            else:
+                interval = min_interval
+
+        return min(max(interval, min_interval), max_interval)
+
+
+class ShardedBulkJob:
+    """
+    A list of email addresses that was split into shards, each uploaded (and verified) as a file of its own, but
+    tracked as a single job: it's done once every shard is done, and its report is the reports of the shards, in
+    order. Shards fail independently: a shard that failed to upload, or that ends in an error, is reported in
+    failed_shards, and can be skipped (with partial=True) rather than failing the whole list.
+    """
+
+    def __init__(self, jobs: List[BulkJob | BaseException]) -> None:
+        """
+        :param jobs: Jobs for the shards, in order, or the error for every shard that failed to upload.
+        """
+        self.shards = jobs
+
+    @property
+    def jobs(self) -> List[BulkJob]:
+        """
+        Jobs for the shards that were uploaded, in order.
+        """
+        return [job for job in self.shards if isinstance(job, BulkJob)]
+
+    @property
+    def file_ids(self) -> List[int]:
+        return [job.file_id for job in self.jobs]
+
+    @property
+    def done(self) -> bool:
+        return all(job.done for job in self.jobs)
+
+    @property
+    def failed_shards(self) -> Dict[int, BaseException]:
+        """
+        Errors of the shards that failed to upload or ended in an error (so far), by shard number (from 1).
+        """
+        failed = {}
+        for number, job in enumerate(self.shards, start=1):
+            if isinstance(job, BulkJob):
+                job = _job_error(job=job)
+
+            if job is not None:
+                failed[number] = job
+
+        return failed
+
+    @property
+    def percent(self) -> float:
+        """
+        Overall progress of the uploaded shards, weighing the shards by their number of rows.
+        """
+        infos = [job.info for job in self.jobs]
+        total_rows = sum(info["total_rows"] for info in infos)
+        if total_rows == 0:
+            return sum(info["percent"] for info in infos) / max(len(infos), 1)
+
+        return sum(info["percent"] * info["total_rows"] for info in infos) / total_rows
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        fail_on_pause: bool = False,
+        partial: bool = False,
+    ) -> List[FileInfo]:
+        """
+        Wait for every shard to finish verifying.
+
+        :param timeout: Maximum number of seconds to wait (in total), waits indefinitely if None.
+        :param fail_on_pause: Whether to raise if a shard is paused (e.g., because credits ran out), rather than
+            waiting for it to be resumed.
+        :param partial: Whether to skip the shards that failed (see failed_shards), rather than raising the error
+            of the first one.
+        :return: Info for the finished shards, in order.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        infos = []
+        for job in self._iter_jobs(partial=partial):
+            try:
+                infos.append(
+                    job.wait(
+                        timeout=_remaining(deadline=deadline),
+                        fail_on_pause=fail_on_pause,
+                    )
+                )
+
+            except TimeoutError:
+                raise
+
+            except Exception:
+                if not partial:
+                    raise
+
+        return infos
+
+    def iter_report(
+        self,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        as_records: bool = False,
+        partial: bool = False,
+    ) -> Iterator[ReportEntry | ReportEntryRecord]:
+        """
+        Stream the reports of the shards as a single report, in shard order. Each shard's report is streamed as
+        soon as that shard (and every shard before it) has finished.
+
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param timeout: Maximum number of seconds to wait (in total) for the shards to finish, waits indefinitely
+            if None.
+        :param as_records: Whether to return the rows as (compact) ReportEntryRecords rather than dicts.
+        :param partial: Whether to skip the shards that failed (see failed_shards), rather than raising the error
+            of the first one.
+        :return: Iterator over the rows of the merged csv-report.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in self._iter_jobs(partial=partial):
+            try:
+                job.wait(timeout=_remaining(deadline=deadline))
+
+            except TimeoutError:
+                raise
+
+            except Exception:
+                if not partial:
+                    raise
+
+                continue
+
+            yield from job.iter_report(
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+                timeout=_remaining(deadline=deadline),
+                as_records=as_records,
+            )
+
+    def stop(self) -> None:
+        """
+        Stop verifying every shard that is still in progress.
+        """
+        for job in self.jobs:
+            job.stop()
+
+    def _iter_jobs(self, partial: bool) -> Iterator[BulkJob]:
+        for job in self.shards:
+            if isinstance(job, BulkJob):
+                yield job
+
+            elif not partial:
+                raise job
+
+
+def _job_error(job: BulkJob) -> Optional[BaseException]:
+    if not job.done:
+        return None
+
+    try:
+        job.wait(timeout=0)
+
+    except Exception as error:
+        return error
+
+    return None
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+
+def iter_shards(
+    lines: Iterable[str | bytes],
+    shard_rows: Optional[int] = None,
+    shard_bytes: Optional[int] = None,
+    has_header: bool = False,
+    deduplicate: bool = True,
+) -> Iterator[bytes]:
+    """
+    Split lines of email addresses into shards, dropping duplicate email addresses (across all shards).
+
+    :param lines: Lines (or email addresses), where the email address is in the first column.
+    :param shard_rows: Maximum number of rows per shard.
+    :param shard_bytes: Maximum size (in bytes) of a shard.
+    :param has_header: Whether the first line is a header, which is then repeated at the start of every shard.
+    :param deduplicate: Whether to drop duplicate email addresses, for lines that haven't been deduplicated yet.
+    :return: Iterator over the contents of the shards.
+    """
+    assert (
+        shard_rows is not None or shard_bytes is not None
+    ), "Must limit the shards by shard_rows, shard_bytes or both."
+    assert (
+        shard_rows is None or shard_rows >= 1
+    ), f"shard_rows must be at least 1, but received {shard_rows}."
+    assert (
+        shard_bytes is None or shard_bytes >= 1
+    ), f"shard_bytes must be at least 1, but received {shard_bytes}."
+
+    header = b""
+    seen = set()
+    shard = bytearray()
+    rows = 0
+    for line in lines:
+        line = line.encode() if isinstance(line, str) else line
+        if not line.endswith(b"\n"):
+            line += b"\n"
+
+        if has_header and not header:
+            header = line
+            continue
+
+        if deduplicate:
+            email = normalise_email(
+                email=line.split(b",", 1)[0].decode(errors="replace")
+            )
+            if not email or email in seen:
+                continue
+
+            seen.add(email)
+
+        if rows and (
+            (shard_rows is not None and rows >= shard_rows)
+            or (
+                shard_bytes is not None
+                and len(header) + len(shard) + len(line) > shard_bytes
+            )
+        ):
+            yield header + bytes(shard)
+            shard.clear()
+            rows = 0
+
+        shard += line
+        rows += 1
+
+    if rows:
+        yield header + bytes(shard)
+
+
+class BulkPoller:
+    """
+    Refreshes the status of any number of bulk jobs from a single background thread, polling each job
+    adaptively (based on its estimated remaining time and progress) instead of on a fixed schedule.
+    Jobs that are due at the same time are refreshed together, by a FileWatcher, with as few requests as possible.
+    The thread is started when there are jobs to poll and stops when there are none left. Refreshes that fail
+    with a transient error are retried with exponential backoff, only permanent errors (e.g., an invalid API key)
+    fail the jobs.
+    """
+
+    def __init__(
+        self,
+        client: "MillionVerifierClient",
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+    ) -> None:
+        """
+        :param client: Client to poll with.
+        :param min_interval: Minimum number of seconds between refreshes of the same job.
+        :param max_interval: Maximum number of seconds between refreshes of the same job.
+        """
+        assert (
+            0 < min_interval <= max_interval
+        ), f"Need 0 < min_interval <= max_interval, but received {min_interval} and {max_interval}."
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._watcher = FileWatcher(client=client)
+        self._condition = threading.Condition()
+        # next time (monotonic) each job is due to be refreshed:
+        self._due: Dict[BulkJob, float] = {}
+        # consecutive failed refreshes per job, to back off:
+        self._failures: Dict[BulkJob, int] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, info: FileInfo) -> BulkJob:
+        """
+        Start tracking a file.
+
+        :param info: Latest info for the file.
+        :return: Job for the file.
+        """
+        job = BulkJob(client=self._client, info=info, poller=self)
+        if not job.done:
+            self._watcher.add(file_id=job.file_id, info=info)
+            self.poll_soon(job=job, delay=self.min_interval)
+
+        return job
+
+    def poll_soon(self, job: BulkJob, delay: float = 0.0) -> None:
+        with self._condition:
+            self._due[job] = time.monotonic() + delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="million-verifier-bulk-poller",
+                    daemon=True,
+                )
+                self._thread.start()
+
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._due:
+                    self._thread = None
+                    return
+
+                now = time.monotonic()
+                due_jobs = [job for job, due_at in self._due.items() if due_at <= now]
+                if not due_jobs:
+                    self._condition.wait(timeout=min(self._due.values()) - now)
+                    continue
+
+            refreshed = self._refresh(jobs=due_jobs)
+            with self._condition:
+                for job in due_jobs:
+                    if job.done:
+                        self._due.pop(job, None)
+                        self._failures.pop(job, None)
+                        self._watcher.remove(file_id=job.file_id)
+
+                    elif not refreshed:
+                        failures = self._failures[job] = self._failures.get(job, 0) + 1
+                        self._due[job] = time.monotonic() + min(
+                            self.min_interval * 2**failures, self.max_interval
+                        )
+
+                    else:
+                        self._failures.pop(job, None)
+                        self._due[job] = time.monotonic() + job._next_poll_interval(
+                            min_interval=self.min_interval,
+                            max_interval=self.max_interval,
+                        )
+
+    def _refresh(self, jobs: List[BulkJob]) -> bool:
+        """
+        Refresh the info of jobs, failing them if the refresh fails with a permanent error.
+
+        :param jobs: Jobs to refresh.
+        :return: Whether the jobs were refreshed (or failed), False if the refresh failed with a transient error
+            (which the client already retried), such that the jobs remain pending.
+        """
+        try:
+            self._watcher.refresh(file_ids=[job.file_id for job in jobs])
+
+        except Exception as error:
+            # transient errors (e.g., 5xx responses, rate-limiting or dropped
+            # connections) have already been retried by the client, but the
+            # file may well be fine, so its job is polled again later:
+            if isinstance(error, (APIException, RequestException)) and not isinstance(
+                error, _PERMANENT_ERRORS
+            ):
+                return False
+
+            for job in jobs:
+                job._update(error=error)
+
+            return True
+
+        for job in jobs:
+            info = self._watcher.get(file_id=job.file_id)
+            if info is None:
+                job._update(error=APIException(f"File {job.file_id} no longer exists."))
+
+            else:
+                job._update(info=info)
+
+        return True
@@ -0,0 +1,288 @@
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, TypedDict
+
+from ._enums import Result
+from ._formats import EmailVerification
+from ._utils import normalise_email
+from ._api import parse_email_verification
+
+
+__all__ = [
+    "DEFAULT_RESULT_TTLS",
+    "CacheStats",
+    "VerificationCache",
+    "MemoryVerificationCache",
+    "SQLiteVerificationCache",
+]
+
+
+_HOUR = 60 * 60
+_DAY = 24 * _HOUR
+
+# how long (in seconds) to cache each result for,
+# where 0 means that the result is not cached:
+DEFAULT_RESULT_TTLS: Dict[Result, float] = {
+    Result.OK: 30 * _DAY,
+    Result.CATCH_ALL: 7 * _DAY,
+    Result.INVALID: 30 * _DAY,
+    Result.DISPOSABLE: 30 * _DAY,
+    Result.UNKNOWN: _HOUR,
+    Result.REVERIFY: 0,
+}
+
+
+class CacheStats(TypedDict):
+    """
+    Counters for sizing a verification cache.
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+
+class VerificationCache(ABC):
+    """
+    Base class for caches of email verifications, keyed by the normalised (trimmed and lower-cased) email-address.
+    Subclasses implement the storage, via _load, _store, _size and clear.
+    """
+
+    def __init__(self, ttl: Optional[float | Dict[Result, float]] = None) -> None:
+        """
+        :param ttl: Seconds to cache verifications for, either for all results or per result (results that are
+            missing from the mapping are not cached). Defaults to DEFAULT_RESULT_TTLS.
+        """
+        if ttl is None:
+            ttl = DEFAULT_RESULT_TTLS
+
+        self._ttls = (
+            dict(ttl) if isinstance(ttl, dict) else {result: ttl for result in Result}
+        )
+        self._hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[EmailVerification]:
+        """
+        Get the cached verification of an email-address.
+
+        :param email: Email address.
+        :return: The cached verification, or None if there is no (unexpired) verification.
+        """
+        entry = self._load(key=normalise_email(email=email))
+        verification = None
+        if entry is not None:
+            cached, expires_at = entry
+            if expires_at > time.time():
+                verification = cached
+                # the cached verification may have been
+                # for a differently formatted address:
+                verification["email"] = email
+
+        with self._stats_lock:
+            if verification is None:
+                self._misses += 1
+
+            else:
+                self._hits += 1
+
+        return verification
+
+    def set(self, email: str, verification: EmailVerification) -> None:
+        """
+        Cache the verification of an email-address (unless its result shouldn't be cached).
+
+        :param email: Email address.
+        :param verification: Verification to cache.
+        :return: Nothing.
+        """
+        ttl = self._ttls.get(verification["result"], 0)
+        if ttl <= 0 or verification.get("error"):
+            return
+
+        self._store(
+            key=normalise_email(email=email),
+            verification=verification,
+            expires_at=time.time() + ttl,
+        )
+
+    def stats(self) -> CacheStats:
+        with self._stats_lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                size=self._size(),
+            )
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Delete all cached verifications.
+        """
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[EmailVerification, float]]:
+        """
+        :param key: Normalised email-address.
+        :return: The cached verification and when it expires (as a timestamp), or None if it isn't cached.
+        """
+
+    @abstractmethod
+    def _store(
+        self, key: str, verification: EmailVerification, expires_at: float
+    ) -> None:
+        """
+        :param key: Normalised email-address.
+        :param verification: Verification to cache.
+        :param expires_at: Timestamp after which the verification expires.
+        """
+
+    @abstractmethod
+    def _size(self) -> int:
+        """
+        :return: Number of cached verifications (including expired ones that weren't deleted yet).
+        """
+
+
+class MemoryVerificationCache(VerificationCache):
+    """
+    Thread-safe, in-memory cache of email verifications, evicting the least recently used verifications once full.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        ttl: Optional[float | Dict[Result, float]] = None,
+    ) -> None:
+        """
+        :param max_size: Maximum number of verifications to hold.
+        :param ttl: Seconds to cache verifications for, either for all results or per result (results that are
+            missing from the mapping are not cached). Defaults to DEFAULT_RESULT_TTLS.
+        """
+        assert max_size >= 1, f"max_size must be at least 1, but received {max_size}."
+        super().__init__(ttl=ttl)
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[EmailVerification, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key: str) -> Optional[Tuple[EmailVerification, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            verification, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        # copy, such that callers can't modify what is cached:
+        return verification.copy(), expires_at
+
+    def _store(
+        self, key: str, verification: EmailVerification, expires_at: float
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (verification.copy(), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteVerificationCache(VerificationCache):
+    """
+    Thread-safe, on-disk cache of email verifications, persisting between runs (and shareable between processes).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float | Dict[Result, float]] = None,
+    ) -> None:
+        """
+        :param path: Path to the SQLite database, created if it doesn't exist.
+        :param ttl: Seconds to cache verifications for, either for all results or per result (results that are
+            missing from the mapping are not cached). Defaults to DEFAULT_RESULT_TTLS.
+        """
+        super().__init__(ttl=ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS verifications ("
+                "email TEXT PRIMARY KEY, verification TEXT NOT NULL, expires_at REAL NOT NULL"
+                ")"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM verifications")
+
+    def purge_expired(self) -> int:
+        """
+        Delete all expired verifications (expired verifications are otherwise only deleted when they are looked up).
+
+        :return: Number of verifications deleted.
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM verifications WHERE expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def _load(self, key: str) -> Optional[Tuple[EmailVerification, float]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT verification, expires_at FROM verifications WHERE email = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            raw_verification, expires_at = row
+            if expires_at <= time.time():
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM verifications WHERE email = ?", (key,)
+                    )
+
+                return None
+
+        return (
+            parse_email_verification(response=json.loads(raw_verification)),
+            expires_at,
+        )
+
+    def _store(
+        self, key: str, verification: EmailVerification, expires_at: float
+    ) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO verifications (email, verification, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(verification), expires_at),
+            )
+
+    def _size(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM verifications"
+            ).fetchone()[0]
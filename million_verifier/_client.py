@@ -1,65 +1,289 @@
-import csv
-from io import StringIO
-from typing import List, Optional
+import io
+import os
+import uuid
+from typing import List, Optional, Iterable, Iterator, Dict, Tuple, BinaryIO, IO
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+from requests import Response
 
 from ._utils import (
-    MV_SINGLE_API_URL,
-    MV_BULK_API_URL,
-    stringify,
-    datetime_to_str,
-    str_to_datetime,
-    bool_to_int,
+    STREAM_CHUNK_SIZE,
+    normalise_email,
+    iter_lines,
 )
-from ._enums import FileStatus, ReportStatus, Result, Quality, SubResult, ResultFilter
+from ._enums import FileStatus, ReportStatus, ResultFilter
 from ._client_core import CoreClient
+from ._bulk import BulkJob, ShardedBulkJob, BulkPoller, iter_shards
+from ._preprocess import BatchFanOut, invalid_syntax_verification
+from ._columnar import ReportColumns
+from ._records import EmailVerificationRecord, FileInfoRecord, ReportEntryRecord
+from ._exceptions import InvalidAPIKey, InsufficientCredits
 from ._formats import (
     EmailVerification,
+    BatchVerification,
     FileInfo,
     ReportEntry,
+    DownloadSummary,
     CreditsSummary,
     FileList,
     ActionResponse,
 )
+from ._api import (
+    PAGINATION_LIMIT,
+    VERIFY_PATH,
+    CREDITS_PATH,
+    UPLOAD_PATH,
+    FILE_INFO_PATH,
+    FILE_LIST_PATH,
+    DOWNLOAD_PATH,
+    STOP_PATH,
+    DELETE_PATH,
+    VERIFICATION_READ_MARGIN,
+    validate_verification_timeout,
+    validate_max_concurrency,
+    verification_params,
+    upload_file_name,
+    UPLOAD_FIELD,
+    multipart_content_type,
+    multipart_upload_body,
+    list_files_params,
+    report_params,
+    RecordFileList,
+    set_verification_email,
+    parse_email_verification,
+    parse_email_verification_record,
+    parse_file_info,
+    parse_file_info_record,
+    parse_file_list,
+    parse_report,
+)
 
 
 __all__ = ["MillionVerifierClient"]
 
-# limit can be found at https://developer.millionverifier.com/#operation/bulk-filelist
-_PAGINATION_LIMIT = 50
-
 
 class MillionVerifierClient(CoreClient):
     """
     Client for interacting with Million Verifier API.
     """
 
-    def verify_email_address(self, email: str, timeout: int = 20) -> EmailVerification:
+    def verify_email_address(
+        self, email: str, timeout: int = 20, as_records: bool = False
+    ) -> EmailVerification | EmailVerificationRecord:
         """
         Verify an email-address in real-time and get results in a second.
-        Costs 1 credit.
+        Costs 1 credit, unless the client has a cache holding a verification of the address.
 
         DOCS: https://developer.millionverifier.com/#operation/single-verification
 
         :param email: Email address to verify.
         :param timeout: Timeout to terminate connection. Must be between 2 and 60 (inclusive).
+        :param as_records: Whether to return the verification as a (compact) EmailVerificationRecord rather than a
+            dict, built straight from the response.
         :return: JSON data containing the email verification.
         """
-        assert (
-            2 <= timeout <= 60
-        ), f"Verification timeout must be between 2 and 60 (inclusive), but received {timeout}."
-        response = self._get(
-            url=f"{MV_SINGLE_API_URL}/api/v3",
-            params={
-                "api": self._api_key,
-                "email": email,
-                "timeout": timeout,
-            },
+        query = email
+        if self._preprocessor is not None:
+            if self._preprocessor.is_rejected(email=email):
+                verification = invalid_syntax_verification(email=email)
+                return (
+                    EmailVerificationRecord.from_dict(verification=verification)
+                    if as_records
+                    else verification
+                )
+
+            query = self._preprocessor.key(email=email)
+
+        if self._cache is not None:
+            cached = self._cache.get(email=query)
+            if cached is not None:
+                cached["email"] = email
+                return (
+                    EmailVerificationRecord.from_dict(verification=cached)
+                    if as_records
+                    else cached
+                )
+
+        verification = self._coalesce(
+            key=(VERIFY_PATH, normalise_email(email=query), timeout, as_records),
+            fn=lambda: self._verify_email_address(
+                email=query, timeout=timeout, as_records=as_records
+            ),
         )
-        response["quality"] = Quality(response["quality"])
-        response["result"] = Result(response["result"])
-        response["subresult"] = SubResult(response["subresult"])
-        return response
+        # coalesced callers may have asked for a differently
+        # formatted address, but each holds its own copy:
+        set_verification_email(verification=verification, email=email)
+
+        return verification
+
+    def _verify_email_address(
+        self, email: str, timeout: int, as_records: bool = False
+    ) -> EmailVerification | EmailVerificationRecord:
+        self._refresh_credit_budget()
+        with self._spending_credits() as budget:
+            response = self._get(
+                url=f"{self._single_api_url}{VERIFY_PATH}",
+                params=verification_params(
+                    api_key=self._api_key,
+                    email=email,
+                    timeout=timeout,
+                ),
+                # verifications spend credits, so are only retried
+                # if they certainly never reached the server:
+                idempotent=False,
+                min_read_timeout=timeout + VERIFICATION_READ_MARGIN,
+                response_format=EmailVerificationRecord
+                if as_records
+                else EmailVerification,
+            )
+            verification = (
+                parse_email_verification_record(response=response)
+                if as_records
+                else parse_email_verification(response=response)
+            )
+            if budget is not None:
+                budget.observe_verification(verification=verification)
+
+        if self._cache is not None:
+            # the cache holds (and stores) dicts:
+            self._cache.set(
+                email=email,
+                verification=verification.to_dict() if as_records else verification,
+            )
+
+        return verification
+
+    def verify_email_addresses(
+        self,
+        emails: Iterable[str],
+        max_concurrency: int = 10,
+        timeout: int = 20,
+        as_records: bool = False,
+    ) -> Iterator[BatchVerification]:
+        """
+        Verify many email-addresses in real-time, with up to max_concurrency verifications in flight at once.
+        Results are yielded as they complete (i.e., not necessarily in input order), and are keyed back to
+        their input by index. Failures for individual addresses are reported in the result rather than
+        aborting the batch, with the exception of an invalid API key. Costs 1 credit per address.
+
+        If the client has a credit budget, the batch stops early once the budget runs out: the verifications in
+        flight are yielded, after which InsufficientCredits is raised, rather than trying the remaining addresses.
+        A credit is reserved for every address before it's submitted, so (unless the API key's credits are spent
+        elsewhere) the batch stops at the same address whatever the concurrency.
+
+        If the client has a preprocessor, rejected addresses are answered without verifying them, and duplicate
+        addresses are verified once, with the result fanned out to every duplicate.
+
+        DOCS: https://developer.millionverifier.com/#operation/single-verification
+
+        :param emails: Email addresses to verify, consumed lazily.
+        :param max_concurrency: Maximum number of verifications in flight at once.
+        :param timeout: Timeout to terminate connection. Must be between 2 and 60 (inclusive).
+        :param as_records: Whether to return the verifications as (compact) EmailVerificationRecords rather than
+            dicts.
+        :return: Iterator over the outcome of each verification.
+        """
+        validate_verification_timeout(timeout=timeout)
+        validate_max_concurrency(max_concurrency=max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        pending: Dict[Future, Tuple[int, str]] = {}
+        fan_out = (
+            None
+            if self._preprocessor is None
+            else BatchFanOut(preprocessor=self._preprocessor, as_records=as_records)
+        )
+        stopped_at = None
+        try:
+            for index, email in enumerate(emails):
+                if fan_out is not None:
+                    needs_verifying, results = fan_out.admit(index=index, email=email)
+                    yield from results
+                    if not needs_verifying:
+                        continue
+
+                # only pull from the input as quickly as we can
+                # verify, such that memory remains bounded:
+                if len(pending) >= 2 * max_concurrency:
+                    yield from self._collect_verifications(
+                        pending=pending, fan_out=fan_out
+                    )
+
+                reserved = self._reserve_batch_credit()
+                while not reserved and pending:
+                    # the budget is only settled once the verifications in
+                    # flight are done, which may leave credits to spare:
+                    yield from self._collect_verifications(
+                        pending=pending, fan_out=fan_out
+                    )
+                    reserved = self._reserve_batch_credit()
+
+                if not reserved:
+                    stopped_at = index
+                    break
+
+                future = executor.submit(
+                    self._verify_in_batch,
+                    email=email,
+                    timeout=timeout,
+                    as_records=as_records,
+                )
+                pending[future] = (index, email)
+
+            while pending:
+                yield from self._collect_verifications(pending=pending, fan_out=fan_out)
+
+            if stopped_at is not None:
+                raise InsufficientCredits(
+                    f"Ran out of credits, email addresses from index {stopped_at} on weren't verified."
+                )
+
+        finally:
+            # if the caller stops iterating early, don't spend
+            # credits on verifications that are yet to start:
+            for future in pending:
+                if future.cancel():
+                    self._release_batch_credit()
+
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _verify_in_batch(
+        self, email: str, timeout: int, as_records: bool
+    ) -> EmailVerification | EmailVerificationRecord:
+        # the credit is released before the future is done, such
+        # that the batch sees a settled budget once it collects it:
+        try:
+            with self._batch_reserved():
+                return self.verify_email_address(
+                    email=email, timeout=timeout, as_records=as_records
+                )
+
+        finally:
+            self._release_batch_credit()
+
+    @staticmethod
+    def _collect_verifications(
+        pending: Dict[Future, Tuple[int, str]],
+        fan_out: Optional[BatchFanOut] = None,
+    ) -> Iterator[BatchVerification]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, email = pending.pop(future)
+            error = future.exception()
+            if isinstance(error, InvalidAPIKey):
+                raise error
+
+            result = BatchVerification(
+                index=index,
+                email=email,
+                verification=None if error is not None else future.result(),
+                error=error,
+            )
+            if fan_out is None:
+                yield result
+
+            else:
+                yield from fan_out.complete(result=result)
 
     def upload_file(self, file_path: str, file_name: Optional[str] = None) -> FileInfo:
         """
@@ -71,51 +295,292 @@ class MillionVerifierClient(CoreClient):
         :param file_name: Name of the file, defaults to name of file specified in path.
         :return: JSON data confirming file upload and containing info regarding the file's status.
         """
-        file_type = file_path.split(".")[-1]
-        if file_type not in ("csv", "txt"):
-            raise ValueError(
-                f"Can only upload csv or txt files, {file_type} not supported."
+        file_name = upload_file_name(file_path=file_path, file_name=file_name)
+        with open(file_path, "rb") as file:
+            return self._upload(file=file, file_name=file_name)
+
+    def _upload(self, file: BinaryIO, file_name: str) -> FileInfo:
+        self._refresh_credit_budget()
+        with self._spending_credits(bulk=True) as budget:
+            response = self._post(
+                url=f"{self._bulk_api_url}{UPLOAD_PATH}",
+                params={
+                    "key": self._api_key,
+                },
+                files={
+                    UPLOAD_FIELD: (file_name, file, "text/plain"),
+                },
+                response_format=FileInfo,
             )
+            file_info = parse_file_info(response=response)
+            if budget is not None:
+                budget.track_file(file_info=file_info)
 
-        if file_name is None:
-            file_name = file_path.split("/")[-1]
+        return file_info
 
-        with open(file_path, "rb") as file:
+    def upload_emails(
+        self,
+        emails: Iterable[str | bytes] | IO,
+        file_name: str = "emails.txt",
+        has_header: bool = False,
+    ) -> FileInfo:
+        """
+        Upload email addresses for verification straight from an iterable (e.g., a generator or database cursor)
+        or a file-like object, without writing them to a file first. The request body is streamed (with chunked
+        transfer encoding), so the emails are never held in memory in full.
+
+        As the emails are consumed while sending them, a failed upload is not retried.
+
+        With a preprocessor, rejected and duplicate addresses are dropped before uploading (and the others are
+        replaced by their key), so the file has a row per unique address rather than per input row. Map its report
+        back to the input rows with the preprocessor's map_report.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-upload
+
+        :param emails: Either an iterable of email addresses (one per line), or a (text or binary) file-like object
+            with the contents of a csv or txt file.
+        :param file_name: Name of the file, must end in .csv or .txt.
+        :param has_header: Whether the first line is a (csv) header, which the preprocessor keeps as is.
+        :return: JSON data confirming file upload and containing info regarding the file's status.
+        """
+        file_name = upload_file_name(file_path=file_name, file_name=file_name)
+        if self._preprocessor is not None:
+            # file-like objects iterate over their lines as well:
+            emails = self._preprocessor.filter_lines(
+                lines=emails, has_header=has_header
+            )
+
+        boundary = uuid.uuid4().hex
+        self._refresh_credit_budget()
+        with self._spending_credits(bulk=True) as budget:
             response = self._post(
-                url=f"{MV_BULK_API_URL}/bulkapi/v2/upload",
+                url=f"{self._bulk_api_url}{UPLOAD_PATH}",
                 params={
                     "key": self._api_key,
                 },
-                files={
-                    "file_contents": (file_name, file, "text/plain"),
+                data=multipart_upload_body(
+                    emails=emails, file_name=file_name, boundary=boundary
+                ),
+                headers={
+                    "Content-Type": multipart_content_type(boundary=boundary),
                 },
+                response_format=FileInfo,
+            )
+            file_info = parse_file_info(response=response)
+            if budget is not None:
+                budget.track_file(file_info=file_info)
+
+        return file_info
+
+    def verify_file(self, file_path: str, file_name: Optional[str] = None) -> BulkJob:
+        """
+        Upload a file for bulk verification and track it until it's done.
+        All jobs of a client share a single poller, which polls adaptively based on each file's progress.
+
+        :param file_path: Path to the file.
+        :param file_name: Name of the file, defaults to name of file specified in path.
+        :return: Job for the file, to wait for and to stream the report from.
+        """
+        return self._get_bulk_poller().track(
+            info=self.upload_file(file_path=file_path, file_name=file_name)
+        )
+
+    def verify_file_sharded(
+        self,
+        source: str | Iterable[str | bytes],
+        file_name: Optional[str] = None,
+        shard_rows: Optional[int] = 100_000,
+        shard_bytes: Optional[int] = None,
+        has_header: bool = False,
+        max_workers: int = 4,
+    ) -> ShardedBulkJob:
+        """
+        Split a (large) list of email addresses into shards, dropping duplicates across shards, and upload the shards
+        concurrently, such that they are verified in parallel and one failing shard doesn't fail the whole list:
+        shards that fail to upload (or to verify) are reported in the job's failed_shards, while the others are kept
+        (only if no shard could be uploaded at all, the first shard's error is raised).
+        Only max_workers shards are held in memory at a time, so the list itself is never held in memory in full,
+        although deduplicating keeps every unique address (or a Bloom filter, see Preprocessor) in memory.
+
+        :param source: Path to a csv or txt file, or an iterable of email addresses (or lines, with the email
+            address in the first column).
+        :param file_name: Name of the file, to which the shard number is added, defaults to the name of the file
+            specified in path, or "emails.txt" for an iterable.
+        :param shard_rows: Maximum number of rows per shard, None to only limit the size.
+        :param shard_bytes: Maximum size (in bytes) of a shard, None to only limit the number of rows.
+        :param has_header: Whether the first line is a header, which is then repeated in every shard.
+        :param max_workers: Maximum number of shards to upload concurrently.
+        :return: Job tracking the shards, which yields their reports as a single, ordered report.
+        """
+        assert (
+            max_workers >= 1
+        ), f"max_workers must be at least 1, but received {max_workers}."
+        if isinstance(source, (str, os.PathLike)):
+            file_name = upload_file_name(file_path=str(source), file_name=file_name)
+            with open(source, "rb") as lines:
+                infos = self._upload_shards(
+                    shards=self._iter_shards(
+                        lines=lines,
+                        shard_rows=shard_rows,
+                        shard_bytes=shard_bytes,
+                        has_header=has_header,
+                    ),
+                    file_name=file_name,
+                    max_workers=max_workers,
+                )
+
+        else:
+            file_name = upload_file_name(
+                file_path=file_name or "emails.txt", file_name=file_name
+            )
+            infos = self._upload_shards(
+                shards=self._iter_shards(
+                    lines=source,
+                    shard_rows=shard_rows,
+                    shard_bytes=shard_bytes,
+                    has_header=has_header,
+                ),
+                file_name=file_name,
+                max_workers=max_workers,
+            )
+
+        poller = self._get_bulk_poller()
+        return ShardedBulkJob(
+            jobs=[
+                info if isinstance(info, BaseException) else poller.track(info=info)
+                for info in infos
+            ]
+        )
+
+    def _iter_shards(
+        self,
+        lines: Iterable[str | bytes],
+        shard_rows: Optional[int],
+        shard_bytes: Optional[int],
+        has_header: bool,
+    ) -> Iterator[bytes]:
+        if self._preprocessor is None:
+            return iter_shards(
+                lines,
+                shard_rows=shard_rows,
+                shard_bytes=shard_bytes,
+                has_header=has_header,
             )
 
-        return self._parse_file_info(response=response)
+        # the preprocessor deduplicates already (possibly in bounded memory):
+        return iter_shards(
+            self._preprocessor.filter_lines(lines=lines, has_header=has_header),
+            shard_rows=shard_rows,
+            shard_bytes=shard_bytes,
+            has_header=has_header,
+            deduplicate=False,
+        )
+
+    def _upload_shards(
+        self, shards: Iterator[bytes], file_name: str, max_workers: int
+    ) -> List[FileInfo | BaseException]:
+        stem, extension = os.path.splitext(file_name)
+        uploads: List[Future] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for number, shard in enumerate(shards, start=1):
+                    # don't read ahead (and hold in memory)
+                    # more shards than we can upload:
+                    pending = [upload for upload in uploads if not upload.done()]
+                    if len(pending) >= max_workers:
+                        wait(pending, return_when=FIRST_COMPLETED)
+
+                    uploads.append(
+                        executor.submit(
+                            self._upload,
+                            file=io.BytesIO(shard),
+                            file_name=f"{stem}-{number:04d}{extension}",
+                        )
+                    )
+
+                wait(uploads)
+
+            except BaseException:
+                # the list was only partly read, so remove the shards that did make it:
+                for upload in uploads:
+                    upload.cancel()
+
+                for upload in uploads:
+                    if not upload.cancelled() and upload.exception() is None:
+                        try:
+                            self.delete_file(file_id=upload.result()["file_id"])
+
+                        except Exception:
+                            pass
+
+                raise
 
-    def get_file_info(self, file_id: int) -> FileInfo:
+        # a failed upload only fails its own shard, unless there's nothing left:
+        results = [upload.exception() or upload.result() for upload in uploads]
+        if results and all(isinstance(result, BaseException) for result in results):
+            raise results[0]
+
+        return results
+
+    def bulk_job(self, file_id: int) -> BulkJob:
+        """
+        Track an already uploaded file until it's done.
+
+        :param file_id: ID of the file.
+        :return: Job for the file, to wait for and to stream the report from.
+        """
+        return self._get_bulk_poller().track(info=self.get_file_info(file_id=file_id))
+
+    def _get_bulk_poller(self) -> BulkPoller:
+        with self._bulk_poller_lock:
+            if self._bulk_poller is None:
+                self._bulk_poller = BulkPoller(client=self)
+
+            return self._bulk_poller
+
+    def get_file_info(
+        self, file_id: int, as_records: bool = False
+    ) -> FileInfo | FileInfoRecord:
         """
         Get info for an uploaded file.
 
         DOCS: https://developer.millionverifier.com/#operation/bulk-fileinfo
 
         :param file_id: ID of the file.
+        :param as_records: Whether to return the info as a (compact) FileInfoRecord rather than a dict, built
+            straight from the response.
         :return: JSON data containing file info.
         """
+        return self._coalesce(
+            key=(FILE_INFO_PATH, file_id, as_records),
+            fn=lambda: self._get_file_info(file_id=file_id, as_records=as_records),
+        )
+
+    def _get_file_info(
+        self, file_id: int, as_records: bool = False
+    ) -> FileInfo | FileInfoRecord:
         response = self._get(
-            url=f"{MV_BULK_API_URL}/bulkapi/v2/fileinfo",
+            url=f"{self._bulk_api_url}{FILE_INFO_PATH}",
             params={
                 "key": self._api_key,
                 "file_id": file_id,
             },
+            response_format=FileInfoRecord if as_records else FileInfo,
+        )
+        file_info = (
+            parse_file_info_record(response=response)
+            if as_records
+            else parse_file_info(response=response)
         )
-        # formatting:
-        return self._parse_file_info(response=response)
+        if self._credit_budget is not None:
+            self._credit_budget.observe_file(file_info=file_info)
+
+        return file_info
 
     def _list_files(
         self,
         offset: int = 0,
-        limit: int = _PAGINATION_LIMIT,
+        limit: int = PAGINATION_LIMIT,
         file_id: Optional[int | List[int]] = None,
         name: Optional[str] = None,
         status: Optional[FileStatus | List[FileStatus]] = None,
@@ -126,76 +591,35 @@ class MillionVerifierClient(CoreClient):
         percent_from: Optional[int] = None,
         percent_to: Optional[int] = None,
         has_error: Optional[bool] = None,
+        as_records: bool = False,
     ) -> FileList:
-        # verify pagination:
-        assert offset >= 0, f"offset must be positive, but received {offset}"
-        assert (
-            0 <= limit <= _PAGINATION_LIMIT
-        ), f"limit must be between 0 and {_PAGINATION_LIMIT}, but received {limit}."
-
-        # if we pass in a non-integer for file_id, it doesn't work, so we enforce integer:
-
-        # verify time filters:
-        if updated_at_from is not None and updated_at_to is not None:
-            assert (
-                updated_at_from <= updated_at_to
-            ), f"updated_at_from ({updated_at_from}) must be before updated_at_to ({updated_at_to})."
-
-        if create_date_from is not None and create_date_to is not None:
-            assert (
-                create_date_from <= create_date_to
-            ), f"create_date_from ({create_date_from}) must be before create_date_to ({create_date_to})."
-
-        # verify percent filters:
-        for percent in (percent_from, percent_to):
-            if percent is not None:
-                assert (
-                    0 <= percent <= 100
-                ), "percentage must be between 1 and 100 (inclusive)"
-
-        if percent_from is not None and percent_to is not None:
-            assert (
-                percent_from <= percent_to
-            ), f"percent_from ({percent_from}) cannot be greater than percent_to ({percent_to})"
-
-        # verify status:
-        if status is not None:
-            statuses = status if isinstance(status, list) else [status]
-            for state in statuses:
-                assert FileStatus.contains(
-                    state
-                ), f"{state} is not a valid FileStatus. Valid options are: {FileStatus.all()}"
-
-        # there is an api bug where, if you set limit to 0, it acts as 50 (weird), so we handle that by making it 1:
-        limit_to_use = 1 if limit == 0 else limit
         response = self._get(
-            url=f"{MV_BULK_API_URL}/bulkapi/v2/filelist",
-            params={
-                "key": self._api_key,
-                "offset": offset,
-                "limit": limit_to_use,
-                "id": stringify(file_id),
-                "name": name,
-                "status": stringify(status),
-                "updated_at_from": datetime_to_str(updated_at_from),
-                "updated_at_to": datetime_to_str(updated_at_to),
-                "createdate_from": datetime_to_str(create_date_from),
-                "createdate_to": datetime_to_str(create_date_to),
-                "percent_from": percent_from,
-                "percent_to": percent_to,
-                "has_error": has_error,
-            },
-        )
-        # if the limit was 0, we don't return any files, else parse all the files and return em:
-        files = (
-            []
-            if limit == 0
-            else [self._parse_file_info(raw_info) for raw_info in response["files"]]
+            url=f"{self._bulk_api_url}{FILE_LIST_PATH}",
+            params=list_files_params(
+                api_key=self._api_key,
+                offset=offset,
+                limit=limit,
+                file_id=file_id,
+                name=name,
+                status=status,
+                updated_at_from=updated_at_from,
+                updated_at_to=updated_at_to,
+                create_date_from=create_date_from,
+                create_date_to=create_date_to,
+                percent_from=percent_from,
+                percent_to=percent_to,
+                has_error=has_error,
+            ),
+            response_format=RecordFileList if as_records else FileList,
         )
-        return FileList(
-            files=files,
-            total=int(response["total"]),
+        file_list = parse_file_list(
+            response=response, limit=limit, as_records=as_records
         )
+        if self._credit_budget is not None:
+            for file_info in file_list["files"]:
+                self._credit_budget.observe_file(file_info=file_info)
+
+        return file_list
 
     def list_files(
         self,
@@ -211,6 +635,8 @@ class MillionVerifierClient(CoreClient):
         percent_from: Optional[int] = None,
         percent_to: Optional[int] = None,
         has_error: Optional[bool] = None,
+        max_workers: int = 1,
+        as_records: bool = False,
     ) -> FileList:
         """
         Get a list of files, according to the provided filters.
@@ -229,22 +655,136 @@ class MillionVerifierClient(CoreClient):
         :param percent_from: Filter for files that have a progress greater than this.
         :param percent_to: Filter for files that have a progress less than this.
         :param has_error: Filter for files that either do or don't have errors.
+        :param max_workers: Number of batches to fetch concurrently. If > 1, the remaining batches are fetched
+            concurrently once the first batch reveals the total number of files.
+        :param as_records: Whether to return the files as (compact) FileInfoRecords rather than dicts, built
+            straight from the responses.
         :return: List of files that meet the provided requirements.
         """
+        validate_max_concurrency(max_concurrency=max_workers)
         # set limit arbitrarily high if not specified:
         actual_limit = 1_000_000_000 if limit is None else limit
-        # initialise loop variables:
-        files_list = []
-        files_acquired = 0
+        filters = dict(
+            file_id=file_id,
+            name=name,
+            status=status,
+            updated_at_from=updated_at_from,
+            updated_at_to=updated_at_to,
+            create_date_from=create_date_from,
+            create_date_to=create_date_to,
+            percent_from=percent_from,
+            percent_to=percent_to,
+            has_error=has_error,
+            as_records=as_records,
+        )
+        # need to do at least one call (even if the limit
+        # is 0) to see what the total file number is:
+        limit_to_use = min(actual_limit, PAGINATION_LIMIT)
+        files = self._list_files(offset=offset, limit=limit_to_use, **filters)
+        total = files["total"]
+        pages = [files]
+        if max_workers > 1 and len(files["files"]) == limit_to_use:
+            # now that we know the total, we know which batches
+            # remain, so we can fetch them all at once:
+            end = offset + min(actual_limit, total - offset)
+            page_offsets = range(offset + limit_to_use, end, PAGINATION_LIMIT)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map preserves the order of the batches:
+                pages.extend(
+                    executor.map(
+                        lambda page_offset: self._list_files(
+                            offset=page_offset,
+                            limit=min(PAGINATION_LIMIT, end - page_offset),
+                            **filters,
+                        ),
+                        page_offsets,
+                    )
+                )
+
+            if page_offsets:
+                limit_to_use = min(PAGINATION_LIMIT, end - page_offsets[-1])
+
+        all_files, seen_ids, files_acquired = [], set(), 0
         while True:
+            for files in pages:
+                files_acquired += len(files["files"])
+                for file in files["files"]:
+                    # files can move between batches while we're
+                    # fetching, so we skip those we've seen already:
+                    file_id = file.file_id if as_records else file["file_id"]
+                    if file_id not in seen_ids:
+                        seen_ids.add(file_id)
+                        all_files.append(file)
+
+            # check exit conditions (if files were added while
+            # fetching concurrently, we pick up the rest here):
+            if len(pages[-1]["files"]) < limit_to_use or len(all_files) >= actual_limit:
+                break
+
             limit_to_use = min(
-                actual_limit - files_acquired,
-                _PAGINATION_LIMIT,
+                actual_limit - len(all_files),
+                PAGINATION_LIMIT,
             )
-            # need to do at least one call (even if limit_to_use = 0) to see what the total file number is:
-            files = self._list_files(
-                offset=offset + files_acquired,
-                limit=limit_to_use,
+            pages = [
+                self._list_files(
+                    offset=offset + files_acquired,
+                    limit=limit_to_use,
+                    **filters,
+                )
+            ]
+
+        return FileList(
+            files=all_files[:actual_limit],
+            total=total,
+        )
+
+    def iter_files(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        file_id: Optional[int | List[int]] = None,
+        name: Optional[str] = None,
+        status: Optional[FileStatus | List[FileStatus]] = None,
+        updated_at_from: Optional[datetime] = None,
+        updated_at_to: Optional[datetime] = None,
+        create_date_from: Optional[datetime] = None,
+        create_date_to: Optional[datetime] = None,
+        percent_from: Optional[int] = None,
+        percent_to: Optional[int] = None,
+        has_error: Optional[bool] = None,
+    ) -> Iterator[FileInfo]:
+        """
+        Lazily iterate over files, according to the provided filters. Files are fetched in batches of 50, where the
+        next batch is fetched in the background while the current batch is being consumed.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-filelist
+
+        :param offset: Pagination offset.
+        :param limit: Maximum number of files to iterate over.
+        :param file_id: Filter for file IDs.
+        :param name: Filter for file name.
+        :param status: Filter for status.
+        :param updated_at_from: Filter for files updated after this time.
+        :param updated_at_to: Filter for files updated before this time.
+        :param create_date_from: Filter for files created after this time.
+        :param create_date_to: Filter for files created before this time.
+        :param percent_from: Filter for files that have a progress greater than this.
+        :param percent_to: Filter for files that have a progress less than this.
+        :param has_error: Filter for files that either do or don't have errors.
+        :return: Iterator over the files that meet the provided requirements.
+        """
+        # set limit arbitrarily high if not specified:
+        actual_limit = 1_000_000_000 if limit is None else limit
+        if actual_limit <= 0:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        def fetch(page_offset: int, page_limit: int) -> Future:
+            return executor.submit(
+                self._list_files,
+                offset=page_offset,
+                limit=page_limit,
                 file_id=file_id,
                 name=name,
                 status=status,
@@ -256,22 +796,67 @@ class MillionVerifierClient(CoreClient):
                 percent_to=percent_to,
                 has_error=has_error,
             )
-            # append and update:
-            files_list.append(files)
-            files_acquired += len(files["files"])
-            # check exit conditions:
-            if len(files["files"]) < limit_to_use or files_acquired >= actual_limit:
-                break
 
-        # combine all:
-        all_files = []
-        for file_list in files_list:
-            all_files.extend(file_list["files"])
+        try:
+            files_acquired = 0
+            limit_to_use = min(actual_limit, PAGINATION_LIMIT)
+            future = fetch(page_offset=offset, page_limit=limit_to_use)
+            while future is not None:
+                files = future.result()["files"]
+                files_acquired += len(files)
+                # prefetch the next batch (if there is
+                # one) while the caller consumes this one:
+                future = None
+                if len(files) == limit_to_use and files_acquired < actual_limit:
+                    limit_to_use = min(actual_limit - files_acquired, PAGINATION_LIMIT)
+                    future = fetch(
+                        page_offset=offset + files_acquired,
+                        page_limit=limit_to_use,
+                    )
 
-        return FileList(
-            files=all_files,
-            total=files_list[0]["total"],
+                yield from files
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_report(
+        self,
+        file_id: int,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        as_records: bool = False,
+    ) -> Iterator[ReportEntry | ReportEntryRecord]:
+        """
+        Stream a report for the result of a file verification, parsing one row at a time,
+        such that memory usage does not grow with the size of the report.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-download
+
+        :param file_id: ID of the file of interest.
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param as_records: Whether to return the rows as (compact) ReportEntryRecords rather than dicts.
+        :return: Iterator over the rows of the csv-report.
+        """
+        stream = self._stream(
+            url=f"{self._bulk_api_url}{DOWNLOAD_PATH}",
+            params=report_params(
+                api_key=self._api_key,
+                file_id=file_id,
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+            ),
         )
+        with stream as (_, chunks):
+            yield from parse_report(
+                lines=iter_lines(chunks=chunks), as_records=as_records
+            )
 
     def get_report(
         self,
@@ -280,9 +865,11 @@ class MillionVerifierClient(CoreClient):
         status: Optional[ReportStatus | List[ReportStatus]] = None,
         include_free_domains: Optional[bool] = None,
         include_role_emails: Optional[bool] = None,
-    ) -> List[ReportEntry]:
+        as_records: bool = False,
+    ) -> List[ReportEntry | ReportEntryRecord]:
         """
         Get a report for the result of a file verification.
+        For large reports, consider iter_report, which does not hold the whole report in memory.
 
         DOCS: https://developer.millionverifier.com/#operation/bulk-download
 
@@ -291,64 +878,186 @@ class MillionVerifierClient(CoreClient):
         :param status: Statuses to include (only for custom filter).
         :param include_free_domains: Whether to include free domains (only for custom filter).
         :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param as_records: Whether to return the rows as (compact) ReportEntryRecords rather than dicts.
         :return: A csv-report (formatted as a list of dictionaries).
         """
-        if result_filter != ResultFilter.CUSTOM:
-            assert status is None, "Must apply custom filter enum to filter statuses."
-            assert (
-                include_free_domains is None
-            ), "Must apply custom filter enum to filter free domains."
-            assert (
-                include_role_emails is None
-            ), "Must apply custom filter enum to filter role emails."
+        return list(
+            self.iter_report(
+                file_id=file_id,
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+                as_records=as_records,
+            )
+        )
 
-        response = self._get(
-            url=f"{MV_BULK_API_URL}/bulkapi/v2/download",
-            params={
-                "key": self._api_key,
-                "file_id": file_id,
-                "filter": result_filter,
-                "statuses": stringify(status),
-                "free": bool_to_int(include_free_domains),
-                "role": bool_to_int(include_role_emails),
-            },
-            allow_text_return=True,
+    def get_report_columns(
+        self,
+        file_id: int,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+    ) -> ReportColumns:
+        """
+        Get a report for the result of a file verification, stored by column rather than as a dict per row, which
+        takes a fraction of the memory for large reports. Convert it with to_numpy, to_arrow or to_pandas.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-download
+
+        :param file_id: ID of the file of interest.
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :return: The columns of the csv-report.
+        """
+        stream = self._stream(
+            url=f"{self._bulk_api_url}{DOWNLOAD_PATH}",
+            params=report_params(
+                api_key=self._api_key,
+                file_id=file_id,
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+            ),
         )
+        with stream as (_, chunks):
+            return ReportColumns.from_lines(lines=iter_lines(chunks=chunks))
 
-        file = StringIO(response)
-        data, headings = [], []
-        for csv_row in csv.reader(file):
-            # if we are in the first row, and 'headings' is still an empty list, save the headings and then move on
-            if not headings:
-                headings = csv_row
-                continue
+    def download_report(
+        self,
+        file_id: int,
+        destination: str | os.PathLike | BinaryIO,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        resume: bool = False,
+    ) -> DownloadSummary:
+        """
+        Download the raw csv-report for a file verification straight to a file (or binary stream), in chunks,
+        without decoding or parsing it.
 
-            row = {}
-            for key, val in zip(headings, csv_row):
-                if key == "quality":
-                    row[key] = Quality(val)
+        When downloading to a path, the report's validator (its ETag or Last-Modified header) is kept next to it,
+        in "<destination>.validator". With resume, a partially downloaded report is then resumed where it left off,
+        using a range request that only applies if the report is unchanged (If-Range): if it changed (e.g., for a
+        different filter), the whole report is downloaded again. A report that was already downloaded in full is
+        left as is.
 
-                elif key == "result":
-                    row[key] = Result(val)
+        DOCS: https://developer.millionverifier.com/#operation/bulk-download
 
-                elif key in ("free", "role"):
-                    if val.lower() == "yes":
-                        row[key] = True
+        :param file_id: ID of the file of interest.
+        :param destination: Path to write the report to, or a writable binary stream.
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param chunk_size: Size (in bytes) of the chunks to read and write.
+        :param resume: Whether to resume a partially downloaded report (only when destination is a path).
+        :return: Summary of the bytes and rows written.
+        """
+        is_path = isinstance(destination, (str, os.PathLike))
+        validator_path = f"{os.fspath(destination)}.validator" if is_path else None
+        offset, validator = 0, None
+        if (
+            is_path
+            and resume
+            and os.path.exists(destination)
+            and os.path.exists(validator_path)
+        ):
+            offset = os.path.getsize(destination)
+            with open(validator_path) as file:
+                validator = file.read().strip()
 
-                    elif val.lower() == "no":
-                        row[key] = False
+        stream = self._stream(
+            url=f"{self._bulk_api_url}{DOWNLOAD_PATH}",
+            params=report_params(
+                api_key=self._api_key,
+                file_id=file_id,
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+            ),
+            # without a validator, we can't tell whether the
+            # partial report is of the same report, so we start over:
+            headers=(
+                {"Range": f"bytes={offset}-", "If-Range": validator}
+                if offset and validator
+                else None
+            ),
+            chunk_size=chunk_size,
+            accept_statuses=(416,),
+        )
+        with stream as (response, chunks):
+            if response.status_code == 416:
+                # the range starts at the end of the
+                # (unchanged) report, which is complete:
+                return DownloadSummary(bytes_written=0, rows_written=0, resumed=True)
 
-                    else:
-                        raise ValueError(f"Unrecognised {key}: {val}")
+            # if the server ignored the range (e.g., because the
+            # report changed), it sent the whole report:
+            resumed = offset > 0 and response.status_code == 206
+            if is_path:
+                self._save_validator(path=validator_path, response=response)
+                with open(destination, "ab" if resumed else "wb") as file:
+                    bytes_written, lines_written = self._write_chunks(
+                        chunks=chunks,
+                        file=file,
+                    )
 
-                else:
-                    row[key] = val
+            else:
+                bytes_written, lines_written = self._write_chunks(
+                    chunks=chunks,
+                    file=destination,
+                )
 
-            # for type-hinting:
-            data_row: ReportEntry = row
-            data.append(data_row)
+        return DownloadSummary(
+            bytes_written=bytes_written,
+            # the headings are only part of what we wrote if we didn't resume:
+            rows_written=max(lines_written - (0 if resumed else 1), 0),
+            resumed=resumed,
+        )
 
-        return data
+    @staticmethod
+    def _save_validator(path: str, response: Response) -> None:
+        # weak ETags can't be used for range requests:
+        etag = response.headers.get("ETag")
+        validator = (
+            etag
+            if etag and not etag.startswith("W/")
+            else response.headers.get("Last-Modified")
+        )
+        if validator is None:
+            if os.path.exists(path):
+                os.remove(path)
+
+            return
+
+        with open(path, "w") as file:
+            file.write(validator)
+
+    @staticmethod
+    def _write_chunks(chunks: Iterable[bytes], file: BinaryIO) -> Tuple[int, int]:
+        bytes_written, lines_written, last_byte = 0, 0, b"\n"
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            file.write(chunk)
+            bytes_written += len(chunk)
+            lines_written += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+
+        # count a trailing line that isn't terminated by a newline:
+        if last_byte != b"\n":
+            lines_written += 1
+
+        return bytes_written, lines_written
 
     def stop_a_file_in_progress(self, file_id: int) -> ActionResponse:
         """
@@ -361,11 +1070,12 @@ class MillionVerifierClient(CoreClient):
         :return: JSON dictionary indicating success.
         """
         response = self._get(
-            url=f"{MV_BULK_API_URL}/bulkapi/stop",
+            url=f"{self._bulk_api_url}{STOP_PATH}",
             params={
                 "key": self._api_key,
                 "file_id": file_id,
             },
+            idempotent=False,
         )
         return response
 
@@ -379,11 +1089,12 @@ class MillionVerifierClient(CoreClient):
         :return: JSON dictionary indicating success.
         """
         response = self._get(
-            url=f"{MV_BULK_API_URL}/bulkapi/v2/delete",
+            url=f"{self._bulk_api_url}{DELETE_PATH}",
             params={
                 "key": self._api_key,
                 "file_id": file_id,
             },
+            idempotent=False,
         )
         return response
 
@@ -395,19 +1106,28 @@ class MillionVerifierClient(CoreClient):
 
         :return: JSON dictionary detailing remaining credits.
         """
-        response = self._get(
-            url=f"{MV_SINGLE_API_URL}/api/v3/credits",
+        return self._coalesce(
+            key=(CREDITS_PATH,),
+            fn=self._check_credits,
+        )
+
+    def _check_credits(self) -> CreditsSummary:
+        summary = self._get(
+            url=f"{self._single_api_url}{CREDITS_PATH}",
             params={
                 "api": self._api_key,
             },
         )
-        return response
+        if self._credit_budget is not None:
+            self._credit_budget.update(summary=summary)
 
-    @staticmethod
-    def _parse_file_info(response: dict) -> FileInfo:
-        info = response.copy()
-        info["file_id"] = int(info["file_id"])
-        info["status"] = FileStatus(info["status"])
-        info["updated_at"] = str_to_datetime(info["updated_at"])
-        info["createdate"] = str_to_datetime(info["createdate"])
-        return info
+        return summary
+
+    def _refresh_credit_budget(self) -> None:
+        # the budget is only refreshed once it's stale, rather than on every request:
+        if self._credit_budget is not None and self._credit_budget.stale:
+            self.check_credits()
+
+    def _reserve_batch_credit(self) -> bool:
+        self._refresh_credit_budget()
+        return self._try_reserve_credit()
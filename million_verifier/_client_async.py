@@ -0,0 +1,580 @@
+import asyncio
+from io import StringIO, BytesIO
+from pathlib import Path
+from typing import List, Optional, Iterable, AsyncIterator, Dict, Tuple
+from datetime import datetime
+
+from ._utils import normalise_email
+from ._enums import FileStatus, ReportStatus, ResultFilter
+from ._client_core_async import AsyncCoreClient
+from ._preprocess import BatchFanOut, invalid_syntax_verification
+from ._records import EmailVerificationRecord, FileInfoRecord, ReportEntryRecord
+from ._exceptions import InvalidAPIKey, InsufficientCredits
+from ._formats import (
+    EmailVerification,
+    BatchVerification,
+    FileInfo,
+    ReportEntry,
+    CreditsSummary,
+    FileList,
+    ActionResponse,
+)
+from ._api import (
+    PAGINATION_LIMIT,
+    VERIFY_PATH,
+    CREDITS_PATH,
+    UPLOAD_PATH,
+    FILE_INFO_PATH,
+    FILE_LIST_PATH,
+    DOWNLOAD_PATH,
+    STOP_PATH,
+    DELETE_PATH,
+    VERIFICATION_READ_MARGIN,
+    validate_verification_timeout,
+    validate_max_concurrency,
+    verification_params,
+    upload_file_name,
+    UPLOAD_FIELD,
+    list_files_params,
+    report_params,
+    RecordFileList,
+    set_verification_email,
+    parse_email_verification,
+    parse_email_verification_record,
+    parse_file_info,
+    parse_file_info_record,
+    parse_file_list,
+    parse_report,
+)
+
+
+__all__ = ["AsyncMillionVerifierClient"]
+
+
+class AsyncMillionVerifierClient(AsyncCoreClient):
+    """
+    Asynchronous client for interacting with Million Verifier API.
+    Offers a subset of MillionVerifierClient's methods as coroutines: (batch) verifications, uploading files,
+    file info and lists, reports (loaded in full), stopping and deleting files, and checking credits.
+    """
+
+    async def verify_email_address(
+        self, email: str, timeout: int = 20, as_records: bool = False
+    ) -> EmailVerification | EmailVerificationRecord:
+        """
+        Verify an email-address in real-time and get results in a second.
+        Costs 1 credit, unless the client has a cache holding a verification of the address.
+
+        DOCS: https://developer.millionverifier.com/#operation/single-verification
+
+        :param email: Email address to verify.
+        :param timeout: Timeout to terminate connection. Must be between 2 and 60 (inclusive).
+        :param as_records: Whether to return the verification as a (compact) EmailVerificationRecord rather than a
+            dict, built straight from the response.
+        :return: JSON data containing the email verification.
+        """
+        query = email
+        if self._preprocessor is not None:
+            if self._preprocessor.is_rejected(email=email):
+                verification = invalid_syntax_verification(email=email)
+                return (
+                    EmailVerificationRecord.from_dict(verification=verification)
+                    if as_records
+                    else verification
+                )
+
+            query = self._preprocessor.key(email=email)
+
+        if self._cache is not None:
+            cached = self._cache.get(email=query)
+            if cached is not None:
+                cached["email"] = email
+                return (
+                    EmailVerificationRecord.from_dict(verification=cached)
+                    if as_records
+                    else cached
+                )
+
+        verification = await self._coalesce(
+            key=(VERIFY_PATH, normalise_email(email=query), timeout, as_records),
+            fn=lambda: self._verify_email_address(
+                email=query, timeout=timeout, as_records=as_records
+            ),
+        )
+        # coalesced callers may have asked for a differently
+        # formatted address, but each holds its own copy:
+        set_verification_email(verification=verification, email=email)
+
+        return verification
+
+    async def _verify_email_address(
+        self, email: str, timeout: int, as_records: bool = False
+    ) -> EmailVerification | EmailVerificationRecord:
+        await self._refresh_credit_budget()
+        with self._spending_credits() as budget:
+            response = await self._get(
+                url=f"{self._single_api_url}{VERIFY_PATH}",
+                params=verification_params(
+                    api_key=self._api_key,
+                    email=email,
+                    timeout=timeout,
+                ),
+                # verifications spend credits, so are only retried
+                # if they certainly never reached the server:
+                idempotent=False,
+                min_read_timeout=timeout + VERIFICATION_READ_MARGIN,
+                response_format=EmailVerificationRecord
+                if as_records
+                else EmailVerification,
+            )
+            verification = (
+                parse_email_verification_record(response=response)
+                if as_records
+                else parse_email_verification(response=response)
+            )
+            if budget is not None:
+                budget.observe_verification(verification=verification)
+
+        if self._cache is not None:
+            # the cache holds (and stores) dicts:
+            self._cache.set(
+                email=email,
+                verification=verification.to_dict() if as_records else verification,
+            )
+
+        return verification
+
+    async def verify_email_addresses(
+        self,
+        emails: Iterable[str],
+        max_concurrency: int = 10,
+        timeout: int = 20,
+        as_records: bool = False,
+    ) -> AsyncIterator[BatchVerification]:
+        """
+        Verify many email-addresses in real-time, with up to max_concurrency verifications in flight at once.
+        Results are yielded as they complete (i.e., not necessarily in input order), and are keyed back to
+        their input by index. Failures for individual addresses are reported in the result rather than
+        aborting the batch, with the exception of an invalid API key. Costs 1 credit per address.
+
+        If the client has a credit budget, the batch stops early once the budget runs out: the verifications in
+        flight are yielded, after which InsufficientCredits is raised, rather than trying the remaining addresses.
+        A credit is reserved for every address before it's submitted, so (unless the API key's credits are spent
+        elsewhere) the batch stops at the same address whatever the concurrency.
+
+        If the client has a preprocessor, rejected addresses are answered without verifying them, and duplicate
+        addresses are verified once, with the result fanned out to every duplicate.
+
+        DOCS: https://developer.millionverifier.com/#operation/single-verification
+
+        :param emails: Email addresses to verify, consumed lazily.
+        :param max_concurrency: Maximum number of verifications in flight at once.
+        :param timeout: Timeout to terminate connection. Must be between 2 and 60 (inclusive).
+        :param as_records: Whether to return the verifications as (compact) EmailVerificationRecords rather than
+            dicts.
+        :return: Async iterator over the outcome of each verification.
+        """
+        validate_verification_timeout(timeout=timeout)
+        validate_max_concurrency(max_concurrency=max_concurrency)
+        pending: Dict[asyncio.Task, Tuple[int, str]] = {}
+        fan_out = (
+            None
+            if self._preprocessor is None
+            else BatchFanOut(preprocessor=self._preprocessor, as_records=as_records)
+        )
+        stopped_at = None
+        try:
+            for index, email in enumerate(emails):
+                if fan_out is not None:
+                    needs_verifying, results = fan_out.admit(index=index, email=email)
+                    for result in results:
+                        yield result
+
+                    if not needs_verifying:
+                        continue
+
+                # only pull from the input as quickly as we can
+                # verify, such that memory remains bounded:
+                if len(pending) >= max_concurrency:
+                    for result in await self._collect_verifications(
+                        pending=pending, fan_out=fan_out
+                    ):
+                        yield result
+
+                reserved = await self._reserve_batch_credit()
+                while not reserved and pending:
+                    # the budget is only settled once the verifications in
+                    # flight are done, which may leave credits to spare:
+                    for result in await self._collect_verifications(
+                        pending=pending, fan_out=fan_out
+                    ):
+                        yield result
+
+                    reserved = await self._reserve_batch_credit()
+
+                if not reserved:
+                    stopped_at = index
+                    break
+
+                task = asyncio.create_task(
+                    self._verify_in_batch(
+                        email=email, timeout=timeout, as_records=as_records
+                    )
+                )
+                # called before the batch is woken up by the task being done,
+                # and also if the task is cancelled before it starts:
+                task.add_done_callback(self._release_batch_credit)
+                pending[task] = (index, email)
+
+            while pending:
+                for result in await self._collect_verifications(
+                    pending=pending, fan_out=fan_out
+                ):
+                    yield result
+
+            if stopped_at is not None:
+                raise InsufficientCredits(
+                    f"Ran out of credits, email addresses from index {stopped_at} on weren't verified."
+                )
+
+        finally:
+            # if the caller stops iterating early, don't spend
+            # credits on verifications that are yet to finish:
+            for task in pending:
+                task.cancel()
+
+    async def _verify_in_batch(
+        self, email: str, timeout: int, as_records: bool
+    ) -> EmailVerification | EmailVerificationRecord:
+        with self._batch_reserved():
+            return await self.verify_email_address(
+                email=email, timeout=timeout, as_records=as_records
+            )
+
+    @staticmethod
+    async def _collect_verifications(
+        pending: Dict[asyncio.Task, Tuple[int, str]],
+        fan_out: Optional[BatchFanOut] = None,
+    ) -> List[BatchVerification]:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        results = []
+        for task in done:
+            index, email = pending.pop(task)
+            error = task.exception()
+            if isinstance(error, InvalidAPIKey):
+                raise error
+
+            result = BatchVerification(
+                index=index,
+                email=email,
+                verification=None if error is not None else task.result(),
+                error=error,
+            )
+            if fan_out is None:
+                results.append(result)
+
+            else:
+                results.extend(fan_out.complete(result=result))
+
+        return results
+
+    async def upload_file(
+        self, file_path: str, file_name: Optional[str] = None
+    ) -> FileInfo:
+        """
+        Upload a file containing email addresses for verification. The file is read in a worker thread (such that
+        the event loop isn't blocked by the disk) and uploaded from memory.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-upload
+
+        :param file_path: Path to the file.
+        :param file_name: Name of the file, defaults to name of file specified in path.
+        :return: JSON data confirming file upload and containing info regarding the file's status.
+        """
+        file_name = upload_file_name(file_path=file_path, file_name=file_name)
+        # an in-memory file can still be rewound for a retry:
+        file = BytesIO(await asyncio.to_thread(Path(file_path).read_bytes))
+        await self._refresh_credit_budget()
+        with self._spending_credits(bulk=True) as budget:
+            response = await self._post(
+                url=f"{self._bulk_api_url}{UPLOAD_PATH}",
+                params={
+                    "key": self._api_key,
+                },
+                files={
+                    UPLOAD_FIELD: (file_name, file, "text/plain"),
+                },
+                response_format=FileInfo,
+            )
+            file_info = parse_file_info(response=response)
+            if budget is not None:
+                budget.track_file(file_info=file_info)
+
+        return file_info
+
+    async def get_file_info(
+        self, file_id: int, as_records: bool = False
+    ) -> FileInfo | FileInfoRecord:
+        """
+        Get info for an uploaded file.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-fileinfo
+
+        :param file_id: ID of the file.
+        :param as_records: Whether to return the info as a (compact) FileInfoRecord rather than a dict, built
+            straight from the response.
+        :return: JSON data containing file info.
+        """
+        return await self._coalesce(
+            key=(FILE_INFO_PATH, file_id, as_records),
+            fn=lambda: self._get_file_info(file_id=file_id, as_records=as_records),
+        )
+
+    async def _get_file_info(
+        self, file_id: int, as_records: bool = False
+    ) -> FileInfo | FileInfoRecord:
+        response = await self._get(
+            url=f"{self._bulk_api_url}{FILE_INFO_PATH}",
+            params={
+                "key": self._api_key,
+                "file_id": file_id,
+            },
+            response_format=FileInfoRecord if as_records else FileInfo,
+        )
+        file_info = (
+            parse_file_info_record(response=response)
+            if as_records
+            else parse_file_info(response=response)
+        )
+        if self._credit_budget is not None:
+            self._credit_budget.observe_file(file_info=file_info)
+
+        return file_info
+
+    async def _list_files(
+        self,
+        offset: int = 0,
+        limit: int = PAGINATION_LIMIT,
+        file_id: Optional[int | List[int]] = None,
+        name: Optional[str] = None,
+        status: Optional[FileStatus | List[FileStatus]] = None,
+        updated_at_from: Optional[datetime] = None,
+        updated_at_to: Optional[datetime] = None,
+        create_date_from: Optional[datetime] = None,
+        create_date_to: Optional[datetime] = None,
+        percent_from: Optional[int] = None,
+        percent_to: Optional[int] = None,
+        has_error: Optional[bool] = None,
+        as_records: bool = False,
+    ) -> FileList:
+        response = await self._get(
+            url=f"{self._bulk_api_url}{FILE_LIST_PATH}",
+            params=list_files_params(
+                api_key=self._api_key,
+                offset=offset,
+                limit=limit,
+                file_id=file_id,
+                name=name,
+                status=status,
+                updated_at_from=updated_at_from,
+                updated_at_to=updated_at_to,
+                create_date_from=create_date_from,
+                create_date_to=create_date_to,
+                percent_from=percent_from,
+                percent_to=percent_to,
+                has_error=has_error,
+            ),
+            response_format=RecordFileList if as_records else FileList,
+        )
+        file_list = parse_file_list(
+            response=response, limit=limit, as_records=as_records
+        )
+        if self._credit_budget is not None:
+            for file_info in file_list["files"]:
+                self._credit_budget.observe_file(file_info=file_info)
+
+        return file_list
+
+    async def list_files(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        file_id: Optional[int | List[int]] = None,
+        name: Optional[str] = None,
+        status: Optional[FileStatus | List[FileStatus]] = None,
+        updated_at_from: Optional[datetime] = None,
+        updated_at_to: Optional[datetime] = None,
+        create_date_from: Optional[datetime] = None,
+        create_date_to: Optional[datetime] = None,
+        percent_from: Optional[int] = None,
+        percent_to: Optional[int] = None,
+        has_error: Optional[bool] = None,
+        as_records: bool = False,
+    ) -> FileList:
+        """
+        Get a list of files, according to the provided filters.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-filelist
+
+        :param offset: Pagination offset.
+        :param limit: Pagination limit, if > 50 then will fetch in batches of 50.
+        :param file_id: Filter for file IDs.
+        :param name: Filter for file name.
+        :param status: Filter for status.
+        :param updated_at_from: Filter for files updated after this time.
+        :param updated_at_to: Filter for files updated before this time.
+        :param create_date_from: Filter for files created after this time.
+        :param create_date_to: Filter for files created before this time.
+        :param percent_from: Filter for files that have a progress greater than this.
+        :param percent_to: Filter for files that have a progress less than this.
+        :param has_error: Filter for files that either do or don't have errors.
+        :param as_records: Whether to return the files as (compact) FileInfoRecords rather than dicts, built
+            straight from the responses.
+        :return: List of files that meet the provided requirements.
+        """
+        # set limit arbitrarily high if not specified:
+        actual_limit = 1_000_000_000 if limit is None else limit
+        # initialise loop variables:
+        all_files, total = [], 0
+        while True:
+            limit_to_use = min(
+                actual_limit - len(all_files),
+                PAGINATION_LIMIT,
+            )
+            # need to do at least one call (even if limit_to_use = 0) to see what the total file number is:
+            files = await self._list_files(
+                offset=offset + len(all_files),
+                limit=limit_to_use,
+                file_id=file_id,
+                name=name,
+                status=status,
+                updated_at_from=updated_at_from,
+                updated_at_to=updated_at_to,
+                create_date_from=create_date_from,
+                create_date_to=create_date_to,
+                percent_from=percent_from,
+                percent_to=percent_to,
+                has_error=has_error,
+                as_records=as_records,
+            )
+            if not all_files:
+                total = files["total"]
+
+            all_files.extend(files["files"])
+            # check exit conditions:
+            if len(files["files"]) < limit_to_use or len(all_files) >= actual_limit:
+                break
+
+        return FileList(
+            files=all_files,
+            total=total,
+        )
+
+    async def get_report(
+        self,
+        file_id: int,
+        result_filter: ResultFilter = ResultFilter.ALL,
+        status: Optional[ReportStatus | List[ReportStatus]] = None,
+        include_free_domains: Optional[bool] = None,
+        include_role_emails: Optional[bool] = None,
+        as_records: bool = False,
+    ) -> List[ReportEntry | ReportEntryRecord]:
+        """
+        Get a report for the result of a file verification.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-download
+
+        :param file_id: ID of the file of interest.
+        :param result_filter: Filter to apply.
+        :param status: Statuses to include (only for custom filter).
+        :param include_free_domains: Whether to include free domains (only for custom filter).
+        :param include_role_emails: Whether to include role emails (only for custom filter).
+        :param as_records: Whether to return the rows as (compact) ReportEntryRecords rather than dicts.
+        :return: A csv-report (formatted as a list of dictionaries).
+        """
+        response = await self._get(
+            url=f"{self._bulk_api_url}{DOWNLOAD_PATH}",
+            params=report_params(
+                api_key=self._api_key,
+                file_id=file_id,
+                result_filter=result_filter,
+                status=status,
+                include_free_domains=include_free_domains,
+                include_role_emails=include_role_emails,
+            ),
+            allow_text_return=True,
+        )
+        return list(parse_report(lines=StringIO(response), as_records=as_records))
+
+    async def stop_a_file_in_progress(self, file_id: int) -> ActionResponse:
+        """
+        This will cancel a file that is currently in progress. The results for the already verified email
+        addresses will be available for download in a few seconds.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-stop
+
+        :param file_id: ID of the file to stop.
+        :return: JSON dictionary indicating success.
+        """
+        response = await self._get(
+            url=f"{self._bulk_api_url}{STOP_PATH}",
+            params={
+                "key": self._api_key,
+                "file_id": file_id,
+            },
+            idempotent=False,
+        )
+        return response
+
+    async def delete_file(self, file_id: int) -> ActionResponse:
+        """
+        Delete a file that has been uploaded to the bulk api.
+
+        DOCS: https://developer.millionverifier.com/#operation/bulk-delete
+
+        :param file_id: ID of the file to delete.
+        :return: JSON dictionary indicating success.
+        """
+        response = await self._get(
+            url=f"{self._bulk_api_url}{DELETE_PATH}",
+            params={
+                "key": self._api_key,
+                "file_id": file_id,
+            },
+            idempotent=False,
+        )
+        return response
+
+    async def check_credits(self) -> CreditsSummary:
+        """
+        Check the amount of available verification credits.
+
+        DOCS: https://developer.millionverifier.com/#operation/api-credits
+
+        :return: JSON dictionary detailing remaining credits.
+        """
+        return await self._coalesce(
+            key=(CREDITS_PATH,),
+            fn=self._check_credits,
+        )
+
+    async def _check_credits(self) -> CreditsSummary:
+        summary = await self._get(
+            url=f"{self._single_api_url}{CREDITS_PATH}",
+            params={
+                "api": self._api_key,
+            },
+        )
+        if self._credit_budget is not None:
+            self._credit_budget.update(summary=summary)
+
+        return summary
+
+    async def _refresh_credit_budget(self) -> None:
+        # the budget is only refreshed once it's stale, rather than on every request:
+        if self._credit_budget is not None and self._credit_budget.stale:
+            await self.check_credits()
+
+    async def _reserve_batch_credit(self) -> bool:
+        await self._refresh_credit_budget()
+        return self._try_reserve_credit()
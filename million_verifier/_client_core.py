@@ -1,13 +1,51 @@
 import re
+import time
+import threading
+import itertools
 from json import JSONDecodeError
-from typing import Optional, Dict, Literal, Tuple, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import copy
+from typing import (
+    Optional,
+    Dict,
+    Literal,
+    Tuple,
+    BinaryIO,
+    Iterator,
+    Iterable,
+    Hashable,
+    Callable,
+    TypeVar,
+    Any,
+)
 
-from requests import Request, Session, HTTPError
+from requests.adapters import HTTPAdapter
+from requests import (
+    Request,
+    Response,
+    Session,
+    HTTPError,
+    ConnectionError as RequestsConnectionError,
+    ConnectTimeout,
+    Timeout,
+)
 
-from ._utils import Json
+from ._utils import Json, STREAM_CHUNK_SIZE, MV_SINGLE_API_URL, MV_BULK_API_URL
+from ._retry import RetryPolicy, RetryEvent, connection_refused
+from ._rate_limit import RateLimiter
+from ._connection import ConnectionConfig
+from ._cache import VerificationCache
+from ._preprocess import Preprocessor
+from ._json import JsonDecoder
+from ._hooks import ClientHooks, RequestTimer
+from ._credits import CreditBudget
+from ._single_flight import SingleFlight
 from ._exceptions import (
     APIException,
     IPAddressBlocked,
+    InsufficientCredits,
     InvalidAPIKey,
     InvalidParameterValue,
 )
@@ -17,29 +55,344 @@ __all__ = [
     "CoreClient",
 ]
 
+T = TypeVar("T")
+# set while verifying an address in a batch, which
+# reserved the verification's credit when submitting it:
+_BATCH_RESERVED: ContextVar[bool] = ContextVar("batch_reserved", default=False)
+
 
-class CoreClient:
+class _BaseCoreClient:
     """
-    Base class for smartlead client.
+    Functionality shared by the synchronous and asynchronous core clients.
     """
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        cache: Optional[VerificationCache] = None,
+        coalesce_requests: bool = True,
+        preprocessor: Optional[Preprocessor] = None,
+        json_decoder: Optional[JsonDecoder] = None,
+        single_api_url: str = MV_SINGLE_API_URL,
+        bulk_api_url: str = MV_BULK_API_URL,
+        hooks: Optional[ClientHooks] = None,
+        credit_budget: Optional[CreditBudget] = None,
+    ) -> None:
         if not isinstance(api_key, str):
             raise ValueError(
                 f"API-key must be a string, can't be of type {type(api_key).__name__}."
             )
 
         self._api_key = api_key
+        self._retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self._rate_limiter = rate_limiter
+        self._connection_config = (
+            ConnectionConfig() if connection_config is None else connection_config
+        )
+        self._cache = cache
+        self._coalesce_requests = coalesce_requests
+        self._preprocessor = preprocessor
+        self._json_decoder = JsonDecoder() if json_decoder is None else json_decoder
+        self._single_api_url = single_api_url.rstrip("/")
+        self._bulk_api_url = bulk_api_url.rstrip("/")
+        self._hooks = hooks
+        self._credit_budget = credit_budget
+
+    @staticmethod
+    def _file_positions(
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]]
+    ) -> Optional[Dict[str, int]]:
+        """
+        Record the position of every file to upload, such that they can be rewound before a retry.
+
+        :param files: Files to upload.
+        :return: Position per file, or None if any of the files can't be rewound.
+        """
+        if not files:
+            return {}
+
+        try:
+            return {key: file.tell() for key, (_, file, _) in files.items()}
+
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def _rewind_files(
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]],
+        positions: Dict[str, int],
+    ) -> None:
+        for key, position in positions.items():
+            files[key][1].seek(position)
+
+    def _notify_retry(
+        self,
+        url: str,
+        attempt: int,
+        delay: float,
+        status_code: Optional[int] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self._retry_policy.notify(
+            url=url, attempt=attempt, delay=delay, status_code=status_code, error=error
+        )
+        if self._hooks is not None:
+            self._hooks.request_retried(
+                event=RetryEvent(
+                    url=url,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=status_code,
+                    error=error,
+                )
+            )
+
+    def _timer(self, method: str, url: str) -> Optional[RequestTimer]:
+        # without hooks, requests skip all of the bookkeeping:
+        return (
+            None
+            if self._hooks is None
+            else RequestTimer(hooks=self._hooks, method=method, url=url)
+        )
+
+    @contextmanager
+    def _spending_credits(self, bulk: bool = False) -> Iterator[Optional[CreditBudget]]:
+        """
+        Reserve a credit from the client's budget (if any) while making a request that spends credits, raising
+        InsufficientCredits before the request is made if the budget has run out.
+
+        :param bulk: Whether the request spends bulk credits, rather than credits for single verifications.
+        :return: Context manager yielding the budget, to update from the response.
+        """
+        budget = self._credit_budget
+        if budget is None:
+            yield None
+            return
+
+        # a batch's credits are reserved (and released) by the batch:
+        reserved = not bulk and _BATCH_RESERVED.get()
+        if not reserved:
+            budget.reserve(bulk=bulk)
+
+        try:
+            yield budget
+
+        except InsufficientCredits:
+            budget.exhausted(bulk=bulk)
+            raise
+
+        finally:
+            if not reserved:
+                budget.release(bulk=bulk)
+
+    def _try_reserve_credit(self) -> bool:
+        """
+        Reserve a credit for a verification in a batch before submitting it, such that the batch stops at the same
+        point however the verifications in flight interleave. The credit is released by _release_batch_credit once
+        the verification is done (or cancelled before it started).
+
+        :return: Whether a credit was reserved, False if the budget has run out.
+        """
+        if self._credit_budget is None:
+            return True
+
+        try:
+            self._credit_budget.reserve()
+
+        except InsufficientCredits:
+            return False
+
+        return True
+
+    def _release_batch_credit(self, *_) -> None:
+        # also used as a done callback:
+        if self._credit_budget is not None:
+            self._credit_budget.release()
+
+    @contextmanager
+    def _batch_reserved(self) -> Iterator[None]:
+        """
+        Mark the verification made within as one whose credit the batch already reserved.
+
+        :return: Context manager.
+        """
+        token = _BATCH_RESERVED.set(True)
+        try:
+            yield
+
+        finally:
+            _BATCH_RESERVED.reset(token)
+
+    @staticmethod
+    def _process_response(response: dict | str | Any) -> None:
+        """
+        Check that the response is not an erroneous response and if so, raise the appropriate error.
+
+        :param response: JSON response to process.
+        :return: Nothing, the response is simply validated in place.
+        """
+        # responses decoded straight into a record have an error field too:
+        error = (
+            response.get("error")
+            if isinstance(response, dict)
+            else getattr(response, "error", None)
+        )
+        # check that we got an error that is not just an empty string:
+        if isinstance(error, str) and error:
+            if error.lower() == "file_not_found":
+                raise FileNotFoundError(f"File ID not found. Response was: {response}")
+
+            if error.lower() == "apikey not found":
+                raise InvalidAPIKey(f"Invalid API key. Response was {response}")
+
+            if error.lower() == "ip address blocked":
+                raise IPAddressBlocked(f"IP address blocked. Response was {response}")
+
+            if error.lower() == "insufficient credits":
+                raise InsufficientCredits(
+                    f"Insufficient credits. Response was {response}"
+                )
+
+            if re.match(r"unsupported \w+ value", error):
+                raise InvalidParameterValue(
+                    f"Invalid parameter. Response was {response}"
+                )
+
+            raise APIException(
+                f"Unknown error from MV API: '{error}'. Response was {response}"
+            )
+
+
+class CoreClient(_BaseCoreClient):
+    """
+    Base class for smartlead client.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        cache: Optional[VerificationCache] = None,
+        coalesce_requests: bool = True,
+        preprocessor: Optional[Preprocessor] = None,
+        json_decoder: Optional[JsonDecoder] = None,
+        single_api_url: str = MV_SINGLE_API_URL,
+        bulk_api_url: str = MV_BULK_API_URL,
+        hooks: Optional[ClientHooks] = None,
+        credit_budget: Optional[CreditBudget] = None,
+    ) -> None:
+        """
+        :param api_key: Million Verifier API key.
+        :param retry_policy: Policy for retrying transient failures, defaults to RetryPolicy().
+        :param rate_limiter: Client-side rate limiter, requests are not limited if not provided.
+        :param connection_config: Connection pooling and timeout settings, defaults to ConnectionConfig().
+        :param cache: Cache for email verifications, verifications are not cached if not provided.
+        :param coalesce_requests: Whether concurrent identical requests (from different threads) share a single
+            request and its result, rather than each making their own.
+        :param preprocessor: Normalisation, syntax rejection and deduplication of email addresses before they are
+            verified, addresses are verified as given if not provided.
+        :param json_decoder: Decoder for JSON responses, defaults to JsonDecoder() (the fastest backend installed).
+        :param single_api_url: Base URL of the single (real-time) API, e.g. to point the client at a mock server.
+        :param bulk_api_url: Base URL of the bulk API.
+        :param hooks: Hooks into every request (e.g., PrometheusHooks or OpenTelemetryHooks), for timings and
+            metrics, requests are not instrumented if not provided.
+        :param credit_budget: Local account of the available credits, such that verifications stop before running
+            out of credits, credits are left to the API to enforce if not provided.
+        """
+        super().__init__(
+            api_key=api_key,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            connection_config=connection_config,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            preprocessor=preprocessor,
+            json_decoder=json_decoder,
+            single_api_url=single_api_url,
+            bulk_api_url=bulk_api_url,
+            hooks=hooks,
+            credit_budget=credit_budget,
+        )
+        self._single_flight = SingleFlight()
+        # shared by all bulk jobs of the client, created on first use:
+        self._bulk_poller = None
+        self._bulk_poller_lock = threading.Lock()
+        config = self._connection_config
         self._session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not config.keep_alive:
+            self._session.headers["Connection"] = "close"
 
-    def _make_request(
+    def warm_up(self, connections: int = 1) -> None:
+        """
+        Open connections to both API hosts ahead of time, such that the first requests don't pay for the
+        TCP and TLS handshakes.
+
+        :param connections: Number of connections to open per host (at most the pool size is kept).
+        :return: Nothing, the connections are kept in the pool.
+        """
+        assert (
+            connections >= 1
+        ), f"connections must be at least 1, but received {connections}."
+        urls = [self._single_api_url, self._bulk_api_url] * connections
+        # the connections need to be opened concurrently,
+        # otherwise the same connection is simply reused:
+        timeout = self._connection_config.timeout()
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            # sent like any other request, such that they
+            # end up in the same pool (rather than session.head's,
+            # which differs once environment settings are merged):
+            responses = executor.map(
+                lambda url: self._session.send(
+                    request=self._session.prepare_request(
+                        Request(method="HEAD", url=url)
+                    ),
+                    timeout=timeout,
+                ),
+                urls,
+            )
+            for response in responses:
+                response.close()
+
+    def _coalesce(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Make a call, sharing it with any concurrent calls that have the same key (if coalescing is enabled).
+
+        :param key: Key identifying identical calls, i.e. the method and its normalised parameters.
+        :param fn: Function making the call.
+        :return: Result of the call, a shallow copy of the shared result for each caller, such that callers
+            can't see each other's changes.
+        """
+        if not self._coalesce_requests:
+            return fn()
+
+        return copy(self._single_flight.do(key=key, fn=fn))
+
+    def _send(
         self,
         request_type: Literal["GET", "POST", "DELETE"],
         url: str,
         params: Optional[Dict[str, Json]] = None,
         files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
-        allow_text_return: bool = False,
-    ) -> dict | list | str:
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        data: Optional[Iterable[bytes]] = None,
+        timer: Optional[RequestTimer] = None,
+        accept_statuses: Tuple[int, ...] = (),
+    ) -> Response:
         # format parameters:
         parameters: dict = {} if params is None else params
         parameters = {key: val for key, val in parameters.items() if val is not None}
@@ -49,41 +402,220 @@ class CoreClient:
             url=url,
             params=parameters,
             files=files,
+            data=data,
+            headers=headers,
         )
-        response = self._session.send(
-            request=request.prepare(),
-        )
-        # check for errors:
+        policy = self._retry_policy
+        # a streamed body is consumed by sending it, so it can't be rewound for a retry:
+        positions = None if data is not None else self._file_positions(files=files)
+        attempt = 0
+        while True:
+            attempt += 1
+            # uploads can only be retried if we can
+            # rewind the files to where we started:
+            can_retry = policy.can_retry(attempt=attempt) and positions is not None
+            if attempt > 1:
+                self._rewind_files(files=files, positions=positions)
+
+            if self._rate_limiter is not None:
+                time.sleep(self._rate_limiter.reserve(url=url))
+
+            try:
+                response = self._session.send(
+                    # merging the session's settings (e.g., keep-alive):
+                    request=self._session.prepare_request(request),
+                    stream=stream,
+                    timeout=self._connection_config.timeout(
+                        min_read_timeout=min_read_timeout
+                    ),
+                )
+
+            except (RequestsConnectionError, Timeout) as error:
+                # only timed out and refused connections
+                # certainly never sent the request:
+                connected = not isinstance(
+                    error, ConnectTimeout
+                ) and not connection_refused(error=error)
+                if not can_retry or not policy.is_retryable_error(
+                    connected=connected,
+                    idempotent=idempotent,
+                ):
+                    raise
+
+                delay = policy.backoff(attempt=attempt)
+                self._notify_retry(url=url, attempt=attempt, delay=delay, error=error)
+                time.sleep(delay)
+                continue
+
+            if can_retry and policy.is_retryable_status(
+                status_code=response.status_code,
+                idempotent=idempotent,
+            ):
+                delay = policy.backoff(
+                    attempt=attempt,
+                    retry_after=response.headers.get("Retry-After"),
+                )
+                self._notify_retry(
+                    url=url,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=response.status_code,
+                )
+                response.close()
+                time.sleep(delay)
+                continue
+
+            break
+
+        if timer is not None:
+            timer.response_received(
+                status_code=response.status_code,
+                response_time=response.elapsed.total_seconds(),
+                request_headers=response.request.headers,
+            )
+
+        # check for errors (other than those the caller handles):
         try:
-            response.raise_for_status()
+            if response.status_code not in accept_statuses:
+                response.raise_for_status()
 
         except HTTPError:
             raise APIException(response.text)
 
+        return response
+
+    def _make_request(
+        self,
+        request_type: Literal["GET", "POST", "DELETE"],
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
+        allow_text_return: bool = False,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        response_format: Optional[type] = None,
+        data: Optional[Iterable[bytes]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> dict | list | str:
+        timer = self._timer(method=request_type, url=url)
         try:
-            result = response.json()
+            response = self._send(
+                request_type=request_type,
+                url=url,
+                params=params,
+                files=files,
+                headers=headers,
+                idempotent=idempotent,
+                min_read_timeout=min_read_timeout,
+                data=data,
+                timer=timer,
+            )
+            try:
+                result = self._json_decoder.decode(
+                    body=response.content, response_format=response_format
+                )
+
+            except JSONDecodeError:
+                if allow_text_return:
+                    result = response.text
+
+                else:
+                    raise
+
+            self._process_response(response=result)
 
-        except JSONDecodeError:
-            if allow_text_return:
-                result = response.text
+        except Exception as error:
+            if timer is not None:
+                timer.finished(error=error)
 
-            else:
-                raise
+            raise
+
+        if timer is not None:
+            timer.finished(response_bytes=len(response.content), result=result)
 
-        self._process_response(response=result)
         return result
 
+    @contextmanager
+    def _stream(
+        self,
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        accept_statuses: Tuple[int, ...] = (),
+    ) -> Iterator[Tuple[Response, Iterator[bytes]]]:
+        """
+        Stream the body of a GET request, rather than loading it into memory.
+
+        Endpoints that stream (i.e., the report download) still return errors as (small) JSON bodies, so the
+        first chunk is inspected and any error is raised before the body is handed over.
+
+        :param url: URL to request.
+        :param params: Query parameters.
+        :param headers: Extra request headers.
+        :param chunk_size: Size (in bytes) of the chunks to read.
+        :param accept_statuses: Error statuses that are returned rather than raised, for the caller to handle.
+        :return: Context manager yielding the response and an iterator over the chunks of its body.
+        """
+        timer = self._timer(method="GET", url=url)
+        response = None
+        error = None
+        try:
+            response = self._send(
+                request_type="GET",
+                url=url,
+                params=params,
+                headers=headers,
+                stream=True,
+                timer=timer,
+                accept_statuses=accept_statuses,
+            )
+            with response:
+                chunks = response.iter_content(chunk_size=chunk_size)
+                first_chunk = next(chunks, b"")
+                if first_chunk.lstrip().startswith(b"{"):
+                    # a JSON body is small, so we can afford to read it in full:
+                    first_chunk += b"".join(chunks)
+                    try:
+                        self._process_response(
+                            response=self._json_decoder.decode(body=first_chunk)
+                        )
+
+                    except JSONDecodeError:
+                        pass
+
+                yield response, itertools.chain([first_chunk], chunks)
+
+        except Exception as exc:
+            error = exc
+            raise
+
+        finally:
+            if timer is not None:
+                # the body is parsed by the consumer, while it's read:
+                timer.finished(
+                    response_bytes=None if response is None else response.raw.tell(),
+                    error=error,
+                    parsed=False,
+                )
+
     def _get(
         self,
         url: str,
         params: Optional[Dict[str, Json]] = None,
         allow_text_return: bool = False,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        response_format: Optional[type] = None,
     ) -> dict | str:
         return self._make_request(
             request_type="GET",
             url=url,
             params=params,
             allow_text_return=allow_text_return,
+            idempotent=idempotent,
+            min_read_timeout=min_read_timeout,
+            response_format=response_format,
         )
 
     def _post(
@@ -91,43 +623,18 @@ class CoreClient:
         url: str,
         params: Optional[Dict[str, Json]] = None,
         files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
+        idempotent: bool = False,
+        data: Optional[Iterable[bytes]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        response_format: Optional[type] = None,
     ) -> dict:
         return self._make_request(
             request_type="POST",
             url=url,
             params=params,
             files=files,
+            idempotent=idempotent,
+            data=data,
+            headers=headers,
+            response_format=response_format,
         )
-
-    @staticmethod
-    def _process_response(response: dict | str) -> None:
-        """
-        Check that the response is not an erroneous response and if so, raise the appropriate error.
-
-        :param response: JSON response to process.
-        :return: Nothing, the response is simply validated in place.
-        """
-        # check that we got an error that is not just an empty string:
-        if (
-            isinstance(response, dict)
-            and isinstance(response.get("error"), str)
-            and response["error"]
-        ):
-            error: str = response["error"]
-            if error.lower() == "file_not_found":
-                raise FileNotFoundError(f"File ID not found. Response was: {response}")
-
-            if error.lower() == "apikey not found":
-                raise InvalidAPIKey(f"Invalid API key. Response was {response}")
-
-            if error.lower() == "ip address blocked":
-                raise IPAddressBlocked(f"IP address blocked. Response was {response}")
-
-            if re.match(r"unsupported \w+ value", error):
-                raise InvalidParameterValue(
-                    f"Invalid parameter. Response was {response}"
-                )
-
-            raise APIException(
-                f"Unknown error from MV API: '{error}'. Response was {response}"
-            )
@@ -0,0 +1,355 @@
+import asyncio
+from json import JSONDecodeError
+from copy import copy
+from typing import (
+    Optional,
+    Dict,
+    Literal,
+    Tuple,
+    BinaryIO,
+    Hashable,
+    Callable,
+    Awaitable,
+    TypeVar,
+)
+
+try:
+    import httpx
+
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ._utils import Json, MV_SINGLE_API_URL, MV_BULK_API_URL
+from ._exceptions import APIException
+from ._client_core import _BaseCoreClient
+from ._retry import RetryPolicy, connection_refused
+from ._rate_limit import RateLimiter
+from ._connection import ConnectionConfig
+from ._cache import VerificationCache
+from ._preprocess import Preprocessor
+from ._json import JsonDecoder
+from ._hooks import ClientHooks, RequestTimer
+from ._credits import CreditBudget
+from ._single_flight import AsyncSingleFlight
+
+
+__all__ = [
+    "AsyncCoreClient",
+]
+
+T = TypeVar("T")
+
+
+class AsyncCoreClient(_BaseCoreClient):
+    """
+    Base class for the asynchronous client.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        cache: Optional[VerificationCache] = None,
+        coalesce_requests: bool = True,
+        preprocessor: Optional[Preprocessor] = None,
+        json_decoder: Optional[JsonDecoder] = None,
+        single_api_url: str = MV_SINGLE_API_URL,
+        bulk_api_url: str = MV_BULK_API_URL,
+        hooks: Optional[ClientHooks] = None,
+        credit_budget: Optional[CreditBudget] = None,
+    ) -> None:
+        """
+        :param api_key: Million Verifier API key.
+        :param retry_policy: Policy for retrying transient failures, defaults to RetryPolicy().
+        :param rate_limiter: Client-side rate limiter, requests are not limited if not provided.
+        :param connection_config: Connection pooling and timeout settings, defaults to ConnectionConfig().
+        :param cache: Cache for email verifications, verifications are not cached if not provided.
+        :param coalesce_requests: Whether concurrent identical requests (from different coroutines) share a single
+            request and its result, rather than each making their own.
+        :param preprocessor: Normalisation, syntax rejection and deduplication of email addresses before they are
+            verified, addresses are verified as given if not provided.
+        :param json_decoder: Decoder for JSON responses, defaults to JsonDecoder() (the fastest backend installed).
+        :param single_api_url: Base URL of the single (real-time) API, e.g. to point the client at a mock server.
+        :param bulk_api_url: Base URL of the bulk API.
+        :param hooks: Hooks into every request (e.g., PrometheusHooks or OpenTelemetryHooks), for timings and
+            metrics, requests are not instrumented if not provided.
+        :param credit_budget: Local account of the available credits, such that verifications stop before running
+            out of credits, credits are left to the API to enforce if not provided.
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for the asynchronous client, "
+                "install it with 'pip install million-verifier-client[async]'."
+            )
+
+        super().__init__(
+            api_key=api_key,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            connection_config=connection_config,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            preprocessor=preprocessor,
+            json_decoder=json_decoder,
+            single_api_url=single_api_url,
+            bulk_api_url=bulk_api_url,
+            hooks=hooks,
+            credit_budget=credit_budget,
+        )
+        self._single_flight = AsyncSingleFlight()
+        config = self._connection_config
+        self._session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                # httpx has a single pool, so we size it to
+                # hold pool_maxsize connections for every host:
+                max_connections=config.pool_connections * config.pool_maxsize,
+                max_keepalive_connections=(
+                    config.pool_connections * config.pool_maxsize
+                    if config.keep_alive
+                    else 0
+                ),
+            ),
+            timeout=self._httpx_timeout(),
+        )
+
+    def _httpx_timeout(
+        self, min_read_timeout: Optional[float] = None
+    ) -> "httpx.Timeout":
+        connect_timeout, read_timeout = self._connection_config.timeout(
+            min_read_timeout=min_read_timeout
+        )
+        return httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            # waiting for a connection from the pool counts as connecting:
+            pool=connect_timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncCoreClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying connection pool.
+        """
+        await self._session.aclose()
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """
+        Open connections to both API hosts ahead of time, such that the first requests don't pay for the
+        TCP and TLS handshakes.
+
+        :param connections: Number of connections to open per host (at most the pool size is kept).
+        :return: Nothing, the connections are kept in the pool.
+        """
+        assert (
+            connections >= 1
+        ), f"connections must be at least 1, but received {connections}."
+        await asyncio.gather(
+            *[
+                self._session.head(url)
+                for url in [self._single_api_url, self._bulk_api_url] * connections
+            ]
+        )
+
+    async def _coalesce(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make a call, sharing it with any concurrent calls that have the same key (if coalescing is enabled).
+
+        :param key: Key identifying identical calls, i.e. the method and its normalised parameters.
+        :param fn: Function returning the awaitable making the call.
+        :return: Result of the call, a shallow copy of the shared result for each caller, such that callers
+            can't see each other's changes.
+        """
+        if not self._coalesce_requests:
+            return await fn()
+
+        return copy(await self._single_flight.do(key=key, fn=fn))
+
+    async def _reserve_rate_limit(self, url: str) -> float:
+        # buckets that block (i.e., FileTokenBucket's
+        # file lock) are kept off the event loop:
+        if self._rate_limiter.blocking(url=url):
+            return await asyncio.to_thread(self._rate_limiter.reserve, url=url)
+
+        return self._rate_limiter.reserve(url=url)
+
+    async def _send(
+        self,
+        request_type: Literal["GET", "POST", "DELETE"],
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        timer: Optional[RequestTimer] = None,
+    ) -> "httpx.Response":
+        # format parameters:
+        parameters: dict = {} if params is None else params
+        parameters = {
+            key: str(val) for key, val in parameters.items() if val is not None
+        }
+
+        policy = self._retry_policy
+        positions = self._file_positions(files=files)
+        attempt = 0
+        while True:
+            attempt += 1
+            # uploads can only be retried if we can
+            # rewind the files to where we started:
+            can_retry = policy.can_retry(attempt=attempt) and positions is not None
+            if attempt > 1:
+                self._rewind_files(files=files, positions=positions)
+
+            if self._rate_limiter is not None:
+                await asyncio.sleep(await self._reserve_rate_limit(url=url))
+
+            try:
+                response = await self._session.request(
+                    method=request_type,
+                    url=url,
+                    params=parameters,
+                    files=files,
+                    timeout=self._httpx_timeout(min_read_timeout=min_read_timeout),
+                )
+
+            except httpx.TransportError as error:
+                # the same rule as the sync client: only timed out and
+                # refused connections certainly never sent the request:
+                connected = not isinstance(
+                    error, httpx.ConnectTimeout
+                ) and not connection_refused(error=error)
+                if not can_retry or not policy.is_retryable_error(
+                    connected=connected,
+                    idempotent=idempotent,
+                ):
+                    raise
+
+                delay = policy.backoff(attempt=attempt)
+                self._notify_retry(url=url, attempt=attempt, delay=delay, error=error)
+                await asyncio.sleep(delay)
+                continue
+
+            if can_retry and policy.is_retryable_status(
+                status_code=response.status_code,
+                idempotent=idempotent,
+            ):
+                delay = policy.backoff(
+                    attempt=attempt,
+                    retry_after=response.headers.get("Retry-After"),
+                )
+                self._notify_retry(
+                    url=url,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=response.status_code,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            break
+
+        if timer is not None:
+            timer.response_received(
+                status_code=response.status_code,
+                response_time=response.elapsed.total_seconds(),
+                request_headers=response.request.headers,
+            )
+
+        # check for errors:
+        try:
+            response.raise_for_status()
+
+        except httpx.HTTPStatusError:
+            raise APIException(response.text)
+
+        return response
+
+    async def _make_request(
+        self,
+        request_type: Literal["GET", "POST", "DELETE"],
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
+        allow_text_return: bool = False,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        response_format: Optional[type] = None,
+    ) -> dict | list | str:
+        timer = self._timer(method=request_type, url=url)
+        try:
+            response = await self._send(
+                request_type=request_type,
+                url=url,
+                params=params,
+                files=files,
+                idempotent=idempotent,
+                min_read_timeout=min_read_timeout,
+                timer=timer,
+            )
+            try:
+                result = self._json_decoder.decode(
+                    body=response.content, response_format=response_format
+                )
+
+            except JSONDecodeError:
+                if allow_text_return:
+                    result = response.text
+
+                else:
+                    raise
+
+            self._process_response(response=result)
+
+        except Exception as error:
+            if timer is not None:
+                timer.finished(error=error)
+
+            raise
+
+        if timer is not None:
+            timer.finished(response_bytes=len(response.content), result=result)
+
+        return result
+
+    async def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        allow_text_return: bool = False,
+        idempotent: bool = True,
+        min_read_timeout: Optional[float] = None,
+        response_format: Optional[type] = None,
+    ) -> dict | str:
+        return await self._make_request(
+            request_type="GET",
+            url=url,
+            params=params,
+            allow_text_return=allow_text_return,
+            idempotent=idempotent,
+            min_read_timeout=min_read_timeout,
+            response_format=response_format,
+        )
+
+    async def _post(
+        self,
+        url: str,
+        params: Optional[Dict[str, Json]] = None,
+        files: Optional[Dict[str, Tuple[str, BinaryIO, str]]] = None,
+        idempotent: bool = False,
+        response_format: Optional[type] = None,
+    ) -> dict:
+        return await self._make_request(
+            request_type="POST",
+            url=url,
+            params=params,
+            files=files,
+            idempotent=idempotent,
+            response_format=response_format,
+        )
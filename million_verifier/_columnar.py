@@ -0,0 +1,300 @@
+import csv
+import itertools
+from array import array
+from typing import Dict, List, Iterable, Type, Any
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+except ImportError:  # pragma: no cover
+    pa = None
+    pc = None
+
+try:
+    import pandas as pd
+
+except ImportError:  # pragma: no cover
+    pd = None
+
+from ._enums import _BaseEnum, Quality, Result, SubResult
+
+
+__all__ = [
+    "ReportColumns",
+]
+
+# columns holding an enum, stored as int16 codes
+# into the enum's values (-1 for missing values):
+CATEGORICAL_COLUMNS: Dict[str, Type[_BaseEnum]] = {
+    "quality": Quality,
+    "result": Result,
+    "subresult": SubResult,
+}
+# columns holding yes/no, stored as 1/0 (-1 for missing values):
+FLAG_COLUMNS = ("free", "role")
+_FLAGS = {"yes": 1, "no": 0, "": -1}
+# the most categories an int16 code can refer to:
+_MAX_CATEGORIES = 2**15 - 1
+
+# number of rows converted at a time:
+_BATCH_SIZE = 4096
+
+
+class _StringColumn:
+    """
+    Column of strings stored as their concatenated utf-8 bytes and the offsets between them (as Arrow does),
+    rather than as a Python object per cell.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def extend(self, cells: Iterable[str]) -> None:
+        encoded = [cell.encode() for cell in cells]
+        if not encoded:
+            return
+
+        self.offsets.extend(
+            itertools.accumulate(map(len, encoded), initial=self.offsets[-1])
+        )
+        # accumulate starts with the initial offset, which we already have:
+        del self.offsets[-len(encoded) - 1]
+        self.data += b"".join(encoded)
+
+    def to_list(self) -> List[str]:
+        data = self.data
+        offsets = self.offsets
+        return [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+
+def _require(module: Any, name: str, extra: str) -> None:
+    if module is None:
+        raise ImportError(
+            f"{name} is required for this output format, "
+            f"install it with 'pip install million-verifier-client[{extra}]'."
+        )
+
+
+class ReportColumns:
+    """
+    A csv-report stored by column rather than as a dict per row: enum columns (quality, result and subresult) as
+    int16 codes into their categories, yes/no columns as bytes, and any other column as utf-8 bytes and offsets.
+    Missing values of enum and yes/no columns are kept as missing (null), rather than as a value.
+    Rows are converted straight from the csv stream, without building a dict per row, and the columns convert
+    to NumPy arrays, a pyarrow Table or a pandas DataFrame (each an optional dependency).
+    """
+
+    def __init__(self, headings: List[str]) -> None:
+        """
+        :param headings: Headings of the csv-report (i.e., its first row).
+        """
+        self.headings = headings
+        # values per code, per enum column (starting with the
+        # enum's values, extended with any unknown sub-results):
+        self.categories: Dict[str, List[str]] = {
+            key: [member.value for member in CATEGORICAL_COLUMNS[key]]
+            for key in headings
+            if key in CATEGORICAL_COLUMNS
+        }
+        self._codes: Dict[str, Dict[str, int]] = {
+            key: {value: code for code, value in enumerate(values)}
+            for key, values in self.categories.items()
+        }
+        self._columns: Dict[str, _StringColumn | array] = {
+            key: array("h")
+            if key in self.categories
+            else array("b")
+            if key in FLAG_COLUMNS
+            else _StringColumn()
+            for key in headings
+        }
+        self._rows = 0
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ReportColumns":
+        """
+        Build the columns from the lines of a csv-report.
+
+        :param lines: Lines of the csv-report, including the headings.
+        :return: The columns of the report.
+        """
+        rows = csv.reader(lines)
+        columns = cls(headings=next(rows, []))
+        columns.append_rows(rows=rows)
+        return columns
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append_rows(self, rows: Iterable[List[str]]) -> None:
+        """
+        Append rows to the columns.
+
+        :param rows: Rows of the csv-report (excluding the headings).
+        :return: Nothing, the rows are appended in place.
+        """
+        width = len(self.headings)
+        rows = iter(rows)
+        while batch := list(itertools.islice(rows, _BATCH_SIZE)):
+            # pad short rows, such that every row has a cell per column:
+            batch = [
+                row if len(row) == width else (row + [""] * width)[:width]
+                for row in batch
+            ]
+            for key, cells in zip(self.headings, zip(*batch)):
+                column = self._columns[key]
+                if key in self._codes:
+                    column.extend(self._encode_categories(key=key, cells=cells))
+
+                elif key in FLAG_COLUMNS:
+                    column.extend(self._encode_flags(key=key, cells=cells))
+
+                else:
+                    column.extend(cells)
+
+            self._rows += len(batch)
+
+    def _encode_categories(self, key: str, cells: Iterable[str]) -> List[int]:
+        codes = self._codes[key]
+        try:
+            return list(map(codes.__getitem__, cells))
+
+        except KeyError:
+            pass
+
+        # only reached for batches with values that aren't known as they are:
+        encoded = []
+        for cell in cells:
+            code = codes.get(cell)
+            if code is None:
+                code = codes.get(cell.lower())
+
+            if code is None:
+                if not cell:
+                    code = -1
+
+                elif key == "subresult":
+                    # the API may add sub-results before we do,
+                    # so we extend the categories with them:
+                    if len(self.categories[key]) >= _MAX_CATEGORIES:
+                        raise ValueError(
+                            f"Too many distinct {key} values, "
+                            f"at most {_MAX_CATEGORIES} are supported."
+                        )
+
+                    code = codes[cell] = len(self.categories[key])
+                    self.categories[key].append(cell)
+
+                else:
+                    raise ValueError(f"Unrecognised {key}: {cell}")
+
+            encoded.append(code)
+
+        return encoded
+
+    @staticmethod
+    def _encode_flags(key: str, cells: Iterable[str]) -> List[int]:
+        try:
+            return list(map(_FLAGS.__getitem__, cells))
+
+        except KeyError:
+            pass
+
+        encoded = []
+        for cell in cells:
+            flag = _FLAGS.get(cell.lower())
+            if flag is None:
+                raise ValueError(f"Unrecognised {key}: {cell}")
+
+            encoded.append(flag)
+
+        return encoded
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """
+        :return: NumPy array per column: int16 codes for enum columns (see categories, -1 for missing values),
+            masked boolean arrays for yes/no columns (masking missing values), and objects (strings) for any other
+            column.
+        """
+        _require(module=np, name="numpy", extra="numpy")
+        arrays = {}
+        for key, column in self._columns.items():
+            if key in self.categories:
+                arrays[key] = np.frombuffer(column, dtype=np.int16).copy()
+
+            elif key in FLAG_COLUMNS:
+                flags = np.frombuffer(column, dtype=np.int8)
+                arrays[key] = np.ma.MaskedArray(flags == 1, mask=flags == -1)
+
+            else:
+                arrays[key] = np.array(column.to_list(), dtype=object)
+
+        return arrays
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        :return: pyarrow Table, with dictionary-encoded enum columns and boolean yes/no columns (where missing
+            values are null).
+        """
+        _require(module=pa, name="pyarrow", extra="arrow")
+        arrays = []
+        for key, column in self._columns.items():
+            if key in self.categories:
+                codes = pa.array(column, type=pa.int16())
+                # missing values are null rather than -1:
+                codes = pc.if_else(pc.equal(codes, -1), None, codes)
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(
+                        indices=codes, dictionary=pa.array(self.categories[key])
+                    )
+                )
+
+            elif key in FLAG_COLUMNS:
+                flags = pa.array(column, type=pa.int8())
+                arrays.append(
+                    pc.if_else(pc.equal(flags, -1), None, flags).cast(pa.bool_())
+                )
+
+            else:
+                strings = pa.LargeStringArray.from_buffers(
+                    len(column),
+                    value_offsets=pa.py_buffer(column.offsets),
+                    data=pa.py_buffer(column.data),
+                )
+                arrays.append(strings.cast(pa.string()))
+
+        return pa.Table.from_arrays(arrays, names=list(self._columns))
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """
+        :return: pandas DataFrame, with categorical enum columns and (nullable) boolean yes/no columns.
+        """
+        _require(module=pd, name="pandas", extra="pandas")
+        _require(module=np, name="numpy", extra="pandas")
+        data = {}
+        for key, values in self.to_numpy().items():
+            if key in self.categories:
+                data[key] = pd.Categorical.from_codes(
+                    values, categories=self.categories[key]
+                )
+
+            elif key in FLAG_COLUMNS:
+                data[key] = pd.arrays.BooleanArray(
+                    values.filled(False), mask=np.ma.getmaskarray(values)
+                )
+
+            else:
+                data[key] = values
+
+        return pd.DataFrame(data, columns=list(self._columns))
@@ -0,0 +1,62 @@
+from typing import Optional, Tuple
+
+
+__all__ = [
+    "ConnectionConfig",
+]
+
+
+class ConnectionConfig:
+    """
+    HTTP connection settings: connection pooling, keep-alive and timeouts.
+
+    When making requests from many threads (or coroutines) at once, pool_maxsize should be at least the number
+    of concurrent requests, otherwise connections are discarded and TLS handshakes are repeated.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 90.0,
+        keep_alive: bool = True,
+    ) -> None:
+        """
+        :param pool_connections: Number of hosts to keep a connection pool for.
+        :param pool_maxsize: Maximum number of connections kept open per host.
+        :param pool_block: Whether to wait for a free connection when the pool is exhausted (rather than opening
+            a connection that is discarded afterwards).
+        :param connect_timeout: Seconds to wait for a connection to be established, None to wait forever.
+        :param read_timeout: Seconds to wait for the server to send data, None to wait forever.
+        :param keep_alive: Whether to keep connections open between requests.
+        """
+        assert (
+            pool_connections >= 1
+        ), f"pool_connections must be at least 1, but received {pool_connections}."
+        assert (
+            pool_maxsize >= 1
+        ), f"pool_maxsize must be at least 1, but received {pool_maxsize}."
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+
+    def timeout(
+        self, min_read_timeout: Optional[float] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Get the (connect, read) timeout for a request.
+
+        :param min_read_timeout: Minimum read timeout needed by the request, e.g. for verifications, where the
+            server may legitimately take as long as the requested verification timeout.
+        :return: Tuple of connect and read timeouts.
+        """
+        read_timeout = self.read_timeout
+        if read_timeout is not None and min_read_timeout is not None:
+            read_timeout = max(read_timeout, min_read_timeout)
+
+        return self.connect_timeout, read_timeout
@@ -0,0 +1,229 @@
+import time
+import threading
+from typing import Optional, Dict
+
+from ._enums import FileStatus
+from ._formats import EmailVerification, FileInfo, CreditsSummary
+from ._records import EmailVerificationRecord, FileInfoRecord
+from ._exceptions import InsufficientCredits
+
+
+__all__ = ["CreditBudget"]
+
+
+# files in these states no longer spend credits:
+_DONE_STATUSES = frozenset({FileStatus.FINISHED, FileStatus.CANCELED, FileStatus.ERROR})
+
+
+class CreditBudget:
+    """
+    Thread-safe, local account of the credits available to a client, such that it stops before running out of
+    credits rather than making requests that are bound to fail.
+
+    The budget is seeded from check_credits(), which the client calls again once the budget is older than
+    refresh_interval, rather than on every request. In between, it's kept up to date from the responses: single
+    verifications report the credits remaining, and bulk files report the credits they spent. Credits are reserved
+    for every request in flight, such that concurrent requests can't overspend.
+    """
+
+    def __init__(
+        self, refresh_interval: float = 600.0, minimum: int = 0, bulk_minimum: int = 0
+    ) -> None:
+        """
+        :param refresh_interval: Seconds after which the budget is refreshed with check_credits().
+        :param minimum: Credits (for single verifications) to leave unspent, e.g. for other users of the API key.
+        :param bulk_minimum: Bulk credits to leave unspent.
+        """
+        assert (
+            refresh_interval > 0
+        ), f"refresh_interval must be positive, but received {refresh_interval}."
+        assert (
+            minimum >= 0 and bulk_minimum >= 0
+        ), "minimum and bulk_minimum can't be negative."
+        self.refresh_interval = refresh_interval
+        self.minimum = minimum
+        self.bulk_minimum = bulk_minimum
+        self._credits: Optional[int] = None
+        self._bulk_credits: Optional[int] = None
+        self._reserved = 0
+        self._bulk_reserved = 0
+        self._updated: Optional[float] = None
+        # credits spent so far by the files uploaded
+        # since the budget was seeded, by file ID:
+        self._files: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def credits(self) -> Optional[int]:
+        """
+        Credits available for single verifications (excluding reserved credits and the minimum), None until the
+        budget is seeded.
+        """
+        with self._lock:
+            return self._available(bulk=False)
+
+    @property
+    def bulk_credits(self) -> Optional[int]:
+        """
+        Credits available for bulk verifications (excluding reserved credits and the minimum), None until the
+        budget is seeded.
+        """
+        with self._lock:
+            return self._available(bulk=True)
+
+    @property
+    def stale(self) -> bool:
+        """
+        Whether the budget needs to be (re)seeded from check_credits().
+        """
+        return (
+            self._updated is None
+            or time.monotonic() - self._updated >= self.refresh_interval
+        )
+
+    def update(self, summary: CreditsSummary) -> None:
+        """
+        Seed the budget with the credits reported by the API.
+
+        :param summary: Response of check_credits().
+        """
+        with self._lock:
+            self._credits = int(summary["credits"])
+            self._bulk_credits = int(summary["bulk_credits"])
+            self._updated = time.monotonic()
+
+    def reserve(self, credits: int = 1, bulk: bool = False) -> None:
+        """
+        Reserve credits for a request that's about to be made, which must be released once it's done.
+
+        :param credits: Number of credits to reserve.
+        :param bulk: Whether to reserve bulk credits, rather than credits for single verifications.
+        :return: Nothing, InsufficientCredits is raised if the budget doesn't have enough credits.
+        """
+        with self._lock:
+            available = self._available(bulk=bulk)
+            # a budget that isn't seeded yet doesn't
+            # know better than to let the API decide:
+            if available is not None and available < credits:
+                raise InsufficientCredits(
+                    f"Not enough {'bulk ' if bulk else ''}credits: {credits} needed, but {available} available."
+                )
+
+            if bulk:
+                self._bulk_reserved += credits
+
+            else:
+                self._reserved += credits
+
+    def release(self, credits: int = 1, bulk: bool = False) -> None:
+        """
+        Release credits reserved for a request, whether or not it succeeded.
+
+        :param credits: Number of credits to release.
+        :param bulk: Whether to release bulk credits, rather than credits for single verifications.
+        """
+        with self._lock:
+            if bulk:
+                self._bulk_reserved = max(self._bulk_reserved - credits, 0)
+
+            else:
+                self._reserved = max(self._reserved - credits, 0)
+
+    def exhausted(self, bulk: bool = False) -> None:
+        """
+        Record that the API rejected a request for a lack of credits.
+
+        :param bulk: Whether the bulk credits ran out, rather than the credits for single verifications.
+        """
+        with self._lock:
+            if bulk:
+                self._bulk_credits = 0
+
+            else:
+                self._credits = 0
+
+    def observe_verification(
+        self, verification: EmailVerification | EmailVerificationRecord
+    ) -> None:
+        """
+        Update the budget from the credits remaining after a single verification.
+
+        :param verification: Verification returned by the API.
+        """
+        remaining = (
+            verification.credits
+            if isinstance(verification, EmailVerificationRecord)
+            else verification.get("credits")
+        )
+        if remaining is None:
+            return
+
+        with self._lock:
+            # responses to concurrent requests can arrive out
+            # of order, so the lowest count is the latest:
+            self._credits = (
+                int(remaining)
+                if self._credits is None
+                else min(self._credits, int(remaining))
+            )
+
+    def track_file(self, file_info: FileInfo) -> None:
+        """
+        Start tracking the credits spent by an uploaded file, deducting what it has spent so far.
+
+        :param file_info: Info of the uploaded file.
+        """
+        with self._lock:
+            self._files[file_info["file_id"]] = 0
+
+        self.observe_file(file_info=file_info)
+
+    def observe_file(self, file_info: FileInfo | FileInfoRecord) -> None:
+        """
+        Deduct the credits that a tracked file spent since it was last seen, files that aren't tracked (e.g.,
+        uploaded before the budget was seeded) are already accounted for.
+
+        :param file_info: Info of the file.
+        """
+        if isinstance(file_info, FileInfoRecord):
+            file_id, credit, status = (
+                file_info.file_id,
+                file_info.credit,
+                file_info.status,
+            )
+
+        else:
+            file_id, credit, status = (
+                file_info["file_id"],
+                file_info["credit"],
+                file_info["status"],
+            )
+
+        with self._lock:
+            spent = self._files.get(file_id)
+            if spent is None:
+                return
+
+            credit = int(credit or 0)
+            if credit > spent and self._bulk_credits is not None:
+                self._bulk_credits -= credit - spent
+
+            if status in _DONE_STATUSES:
+                del self._files[file_id]
+
+            else:
+                self._files[file_id] = max(credit, spent)
+
+    def _available(self, bulk: bool) -> Optional[int]:
+        # must be called while holding the lock:
+        if bulk:
+            credits, reserved, minimum = (
+                self._bulk_credits,
+                self._bulk_reserved,
+                self.bulk_minimum,
+            )
+
+        else:
+            credits, reserved, minimum = self._credits, self._reserved, self.minimum
+
+        return None if credits is None else max(credits - reserved - minimum, 0)
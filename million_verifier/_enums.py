@@ -15,31 +15,46 @@ __all__ = [
 class _BaseEnum(str, Enum):
     """
     Base class for enums
+
+    Members are strings (equal to their value), so comparisons and hashes use the str implementations directly,
+    and lookups by value go through the value map that Enum maintains, rather than scanning the members.
     """
 
     @classmethod
     def all(cls: Type["T"]) -> List["T"]:
-        return [cls(item) for item in cls]
+        return list(cls)
 
     @classmethod
     def contains(cls, obj: Any) -> bool:
-        for item in cls:
-            if str(obj) == str(item):
-                return True
+        return str(obj) in cls._value2member_map_
+
+    @classmethod
+    def from_value(cls: Type["T"], value: str) -> "T":
+        """
+        Get the member for a value, which is faster than calling the enum (i.e., cls(value)).
+
+        :param value: Value (or member) to look up.
+        :return: The member.
+        """
+        try:
+            return cls._value2member_map_[value]
 
-        return False
+        except (KeyError, TypeError):
+            # let Enum raise the appropriate error (or
+            # resolve the value any other way it knows):
+            return cls(value)
 
     def __str__(self) -> str:
-        return self.value
+        return self._value_
 
     def __repr__(self) -> str:
-        return str(self)
+        return self._value_
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, (_BaseEnum, str)) and str(self) == str(other)
+        return isinstance(other, str) and str.__eq__(self, other)
 
-    def __hash__(self) -> int:
-        return hash(str(self))
+    # str caches its hash, so this is computed once per member:
+    __hash__ = str.__hash__
 
 
 T = TypeVar("T", bound=_BaseEnum)
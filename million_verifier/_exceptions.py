@@ -3,6 +3,8 @@ __all__ = [
     "InvalidAPIKey",
     "IPAddressBlocked",
     "InvalidParameterValue",
+    "InsufficientCredits",
+    "BulkJobFailed",
 ]
 
 
@@ -28,3 +30,21 @@ class InvalidParameterValue(APIException):
     """
     Raised when providing the API with an invalid parameter value (i.e., an enum that doesn't exist)
     """
+
+
+class InsufficientCredits(APIException):
+    """
+    Raised when there aren't enough credits for a verification, either according to the API or the client's
+    credit budget (before making the request).
+    """
+
+
+class BulkJobFailed(APIException):
+    """
+    Raised when a file uploaded for bulk verification ends in an error, is canceled, or is paused while waiting
+    for it with fail_on_pause.
+    """
+
+    def __init__(self, message: str, file_info: dict) -> None:
+        super().__init__(message)
+        self.file_info = file_info
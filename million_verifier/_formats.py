@@ -1,15 +1,18 @@
 from datetime import datetime
-from typing import TypedDict, List
+from typing import TypedDict, List, Optional
 
 from ._enums import Result, Quality, FileStatus, SubResult
 
 
 __all__ = [
     "EmailVerification",
+    "BatchVerification",
     "FileInfo",
     "ReportEntry",
+    "DownloadSummary",
     "CreditsSummary",
     "FileList",
+    "FileChange",
     "ActionResponse",
 ]
 
@@ -33,6 +36,17 @@ class EmailVerification(TypedDict):
     livemode: bool
 
 
+class BatchVerification(TypedDict):
+    """
+    Outcome of verifying a single email-address as part of a batch.
+    """
+
+    index: int
+    email: str
+    verification: Optional[EmailVerification]
+    error: Optional[Exception]
+
+
 class FileInfo(TypedDict):
     """
     Million Verifier file-info format
@@ -70,6 +84,16 @@ class ReportEntry(TypedDict):
     role: bool
 
 
+class DownloadSummary(TypedDict):
+    """
+    Summary of a report downloaded to disk (or a binary stream).
+    """
+
+    bytes_written: int
+    rows_written: int
+    resumed: bool
+
+
 class CreditsSummary(TypedDict):
     """
     Million Verifier credits summary.
@@ -90,6 +114,17 @@ class FileList(TypedDict):
     total: int
 
 
+class FileChange(TypedDict):
+    """
+    Change to a watched file's status or progress, where previous is None when the file is first seen, and current
+    is None when the file no longer exists.
+    """
+
+    file_id: int
+    previous: Optional[FileInfo]
+    current: Optional[FileInfo]
+
+
 class ActionResponse(TypedDict):
     """
     Result for action-call to Million Verifier API.
@@ -0,0 +1,368 @@
+import time
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+from typing import Optional, Iterable, Mapping, TypedDict, Any
+
+try:
+    import prometheus_client
+
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+try:
+    from opentelemetry import trace, context as otel_context
+
+except ImportError:  # pragma: no cover
+    trace = None
+    otel_context = None
+
+from ._retry import RetryEvent
+
+
+__all__ = [
+    "ClientHooks",
+    "CombinedHooks",
+    "PrometheusHooks",
+    "OpenTelemetryHooks",
+    "RequestStarted",
+    "RequestFinished",
+]
+
+
+class RequestStarted(TypedDict):
+    """
+    Details of a request that is about to be made (including any retries).
+    """
+
+    method: str
+    # without the query string, which holds the API key:
+    url: str
+    started_at: float
+
+
+class RequestFinished(TypedDict):
+    """
+    Details of a finished request, successful or not. Durations are in seconds:
+
+    - duration: from the start of the request (including retries and rate limiting) until its body was parsed.
+    - response_time: until the response's headers arrived, i.e. connecting, TLS and the server's time.
+    - parse_time: decoding and validating the body, None for streamed bodies (which are parsed as they're read).
+    - execution_time: the time the API reports it took to verify an email address (single verifications only).
+    """
+
+    method: str
+    url: str
+    started_at: float
+    status_code: Optional[int]
+    duration: float
+    response_time: Optional[float]
+    parse_time: Optional[float]
+    request_bytes: Optional[int]
+    response_bytes: Optional[int]
+    execution_time: Optional[float]
+    error: Optional[Exception]
+
+
+class ClientHooks:
+    """
+    Hooks into the requests that a client makes, e.g. for logging, metrics or tracing. Override the hooks of
+    interest, the others do nothing. Hooks are called from the thread (or event loop) making the request, so should
+    be quick. Clients without hooks skip all of the bookkeeping.
+    """
+
+    def request_started(self, event: RequestStarted) -> None:
+        pass
+
+    def request_finished(self, event: RequestFinished) -> None:
+        pass
+
+    def request_retried(self, event: RetryEvent) -> None:
+        pass
+
+
+class CombinedHooks(ClientHooks):
+    """
+    Hooks that call several other hooks, in order, e.g. both metrics and tracing.
+    """
+
+    def __init__(self, hooks: Iterable[ClientHooks]) -> None:
+        """
+        :param hooks: Hooks to call.
+        """
+        self.hooks = list(hooks)
+
+    def request_started(self, event: RequestStarted) -> None:
+        for hooks in self.hooks:
+            hooks.request_started(event=event)
+
+    def request_finished(self, event: RequestFinished) -> None:
+        for hooks in self.hooks:
+            hooks.request_finished(event=event)
+
+    def request_retried(self, event: RetryEvent) -> None:
+        for hooks in self.hooks:
+            hooks.request_retried(event=event)
+
+
+class RequestTimer:
+    """
+    Collects the details of a single request for the client's hooks.
+    """
+
+    __slots__ = (
+        "hooks",
+        "method",
+        "url",
+        "started_at",
+        "started",
+        "received",
+        "status_code",
+        "response_time",
+        "request_bytes",
+    )
+
+    def __init__(self, hooks: ClientHooks, method: str, url: str) -> None:
+        self.hooks = hooks
+        self.method = method
+        self.url = url
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.received: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.response_time: Optional[float] = None
+        self.request_bytes: Optional[int] = None
+        hooks.request_started(
+            event=RequestStarted(method=method, url=url, started_at=self.started_at)
+        )
+
+    def response_received(
+        self,
+        status_code: int,
+        response_time: Optional[float],
+        request_headers: Mapping[str, str],
+    ) -> None:
+        self.received = time.perf_counter()
+        self.status_code = status_code
+        self.response_time = response_time
+        # streamed (chunked) bodies don't know their size:
+        if "Transfer-Encoding" not in request_headers:
+            self.request_bytes = int(request_headers.get("Content-Length", 0))
+
+    def finished(
+        self,
+        response_bytes: Optional[int] = None,
+        result: Any = None,
+        error: Optional[Exception] = None,
+        parsed: bool = True,
+    ) -> None:
+        now = time.perf_counter()
+        execution_time = (
+            result.get("executiontime")
+            if isinstance(result, dict)
+            else getattr(result, "executiontime", None)
+        )
+        self.hooks.request_finished(
+            event=RequestFinished(
+                method=self.method,
+                url=self.url,
+                started_at=self.started_at,
+                status_code=self.status_code,
+                duration=now - self.started,
+                response_time=self.response_time,
+                parse_time=now - self.received
+                if parsed and self.received is not None
+                else None,
+                request_bytes=self.request_bytes,
+                response_bytes=response_bytes,
+                execution_time=None
+                if execution_time is None
+                else float(execution_time),
+                error=error,
+            )
+        )
+
+
+def _require(module: Any, name: str, extra: str) -> None:
+    if module is None:
+        raise ImportError(
+            f"{name} is required for these hooks, "
+            f"install it with 'pip install million-verifier-client[{extra}]'."
+        )
+
+
+def _path(url: str) -> str:
+    # the path identifies the endpoint, while
+    # keeping the number of label values bounded:
+    return urlsplit(url).path or "/"
+
+
+class PrometheusHooks(ClientHooks):
+    """
+    Hooks that record Prometheus metrics (with prometheus_client): counters of requests (by endpoint and status),
+    bytes and retries, and histograms of request, response, parse and verification execution times.
+    """
+
+    def __init__(
+        self, namespace: str = "million_verifier", registry: Optional[Any] = None
+    ) -> None:
+        """
+        :param namespace: Prefix of the metric names.
+        :param registry: Registry to register the metrics with, defaults to prometheus_client's global registry
+            (which only allows a single instance with the same namespace).
+        """
+        _require(module=prometheus_client, name="prometheus_client", extra="prometheus")
+        options = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+
+        self.requests = prometheus_client.Counter(
+            "requests",
+            "Requests made, by endpoint and status.",
+            ["method", "path", "status"],
+            **options,
+        )
+        self.request_duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Duration of requests, including retries.",
+            ["method", "path"],
+            **options,
+        )
+        self.response_time = prometheus_client.Histogram(
+            "response_time_seconds",
+            "Time until the response's headers arrived.",
+            ["method", "path"],
+            **options,
+        )
+        self.parse_duration = prometheus_client.Histogram(
+            "parse_duration_seconds",
+            "Time spent decoding responses.",
+            ["method", "path"],
+            **options,
+        )
+        self.request_bytes = prometheus_client.Counter(
+            "request_bytes",
+            "Bytes sent in request bodies.",
+            ["method", "path"],
+            **options,
+        )
+        self.response_bytes = prometheus_client.Counter(
+            "response_bytes",
+            "Bytes received in response bodies.",
+            ["method", "path"],
+            **options,
+        )
+        self.retries = prometheus_client.Counter(
+            "retries",
+            "Retried requests, by the status (or error) that caused them.",
+            ["path", "reason"],
+            **options,
+        )
+        self.execution_time = prometheus_client.Histogram(
+            "verification_execution_seconds",
+            "Verification time reported by the API.",
+            **options,
+        )
+
+    def request_finished(self, event: RequestFinished) -> None:
+        labels = (event["method"], _path(url=event["url"]))
+        status = event["status_code"]
+        if status is None:
+            status = "error" if event["error"] is not None else "unknown"
+
+        self.requests.labels(*labels, str(status)).inc()
+        self.request_duration.labels(*labels).observe(event["duration"])
+        if event["response_time"] is not None:
+            self.response_time.labels(*labels).observe(event["response_time"])
+
+        if event["parse_time"] is not None:
+            self.parse_duration.labels(*labels).observe(event["parse_time"])
+
+        if event["request_bytes"]:
+            self.request_bytes.labels(*labels).inc(event["request_bytes"])
+
+        if event["response_bytes"]:
+            self.response_bytes.labels(*labels).inc(event["response_bytes"])
+
+        if event["execution_time"] is not None:
+            self.execution_time.observe(event["execution_time"])
+
+    def request_retried(self, event: RetryEvent) -> None:
+        reason = (
+            event["status_code"]
+            if event["error"] is None
+            else type(event["error"]).__name__
+        )
+        self.retries.labels(_path(url=event["url"]), str(reason)).inc()
+
+
+class OpenTelemetryHooks(ClientHooks):
+    """
+    Hooks that record an OpenTelemetry span per request (with opentelemetry-api), as a child of the current span.
+    The span is active while the request runs, and retries are added to it as events.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None) -> None:
+        """
+        :param tracer: Tracer to record spans with, defaults to the global tracer provider's.
+        """
+        _require(module=trace, name="opentelemetry-api", extra="opentelemetry")
+        self.tracer = trace.get_tracer("million_verifier") if tracer is None else tracer
+        # (span, context token) of the request running in the current thread
+        # or task, as a request starts and finishes in the same context:
+        self._request: ContextVar[Optional[tuple]] = ContextVar(
+            "million_verifier_request_span", default=None
+        )
+
+    def request_started(self, event: RequestStarted) -> None:
+        span = self.tracer.start_span(
+            name=f"{event['method']} {_path(url=event['url'])}",
+            kind=trace.SpanKind.CLIENT,
+            start_time=int(event["started_at"] * 1e9),
+        )
+        span.set_attribute("http.request.method", event["method"])
+        span.set_attribute("url.full", event["url"])
+        token = otel_context.attach(trace.set_span_in_context(span))
+        self._request.set((span, token))
+
+    def request_finished(self, event: RequestFinished) -> None:
+        request = self._request.get()
+        if request is None:
+            return
+
+        span, token = request
+        self._request.set(None)
+        otel_context.detach(token)
+        for attribute, key in (
+            ("http.response.status_code", "status_code"),
+            ("http.request.body.size", "request_bytes"),
+            ("http.response.body.size", "response_bytes"),
+            ("million_verifier.response_time", "response_time"),
+            ("million_verifier.parse_time", "parse_time"),
+            ("million_verifier.execution_time", "execution_time"),
+        ):
+            if event[key] is not None:
+                span.set_attribute(attribute, event[key])
+
+        if event["error"] is not None:
+            span.record_exception(event["error"])
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(event["error"])))
+
+        # ending at the measured duration, such that the
+        # span matches the times the request actually took:
+        span.end(end_time=int(event["started_at"] * 1e9) + int(event["duration"] * 1e9))
+
+    def request_retried(self, event: RetryEvent) -> None:
+        attributes = {
+            "url.full": event["url"],
+            "attempt": event["attempt"],
+            "delay": event["delay"],
+        }
+        if event["status_code"] is not None:
+            attributes["http.response.status_code"] = event["status_code"]
+
+        if event["error"] is not None:
+            attributes["error.type"] = type(event["error"]).__name__
+
+        request = self._request.get()
+        span = trace.get_current_span() if request is None else request[0]
+        span.add_event("million_verifier.retry", attributes=attributes)
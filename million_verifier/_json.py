@@ -0,0 +1,114 @@
+import json
+from json import JSONDecodeError
+from typing import Optional, Literal, Dict, Any, is_typeddict
+
+try:
+    import orjson
+
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+from ._utils import Json
+
+
+__all__ = [
+    "JsonDecoder",
+]
+
+JsonBackend = Literal["orjson", "msgspec", "json"]
+
+# backends in order of preference, with the extra that installs them:
+_BACKENDS: Dict[str, Optional[str]] = {
+    "orjson": "orjson",
+    "msgspec": "msgspec",
+    "json": None,
+}
+
+
+def _is_installed(backend: JsonBackend) -> bool:
+    return {"orjson": orjson, "msgspec": msgspec, "json": json}[backend] is not None
+
+
+class JsonDecoder:
+    """
+    Decoder for the JSON bodies of API responses, using orjson or msgspec when installed and the standard library
+    otherwise. Every backend raises json.JSONDecodeError for bodies that aren't JSON.
+
+    With msgspec, responses of a record format (e.g., FileInfoRecord) are decoded straight into that record,
+    converting enums and datetimes while decoding. Responses of a TypedDict format (e.g., FileInfo) are decoded as
+    plain JSON, as with the other backends, since decoding into a TypedDict drops the fields it doesn't declare
+    (e.g., ones the API adds). Bodies that don't fit the format (e.g., errors) are decoded as plain JSON too.
+    """
+
+    def __init__(self, backend: Optional[JsonBackend] = None) -> None:
+        """
+        :param backend: Backend to decode with, defaults to the fastest one installed (orjson, msgspec or json).
+        """
+        if backend is None:
+            backend = next(name for name in _BACKENDS if _is_installed(backend=name))
+
+        assert (
+            backend in _BACKENDS
+        ), f"{backend} is not a JSON backend. Valid options are: {list(_BACKENDS)}"
+        if not _is_installed(backend=backend):
+            raise ImportError(
+                f"{backend} is required for this JSON backend, "
+                f"install it with 'pip install million-verifier-client[{_BACKENDS[backend]}]'."
+            )
+
+        self.backend = backend
+        # typed msgspec decoders, per response format:
+        self._decoders: Dict[type, Any] = {}
+
+    def decode(self, body: bytes | str, response_format: Optional[type] = None) -> Json:
+        """
+        Decode the body of a response.
+
+        :param body: Body of the response.
+        :param response_format: Format (record or TypedDict) that the body is expected to be in, only used by
+            msgspec (to decode straight into records).
+        :return: The decoded body.
+        """
+        if self.backend == "orjson":
+            # orjson's errors are JSONDecodeErrors already:
+            return orjson.loads(body)
+
+        if self.backend == "json":
+            return json.loads(body)
+
+        # records hold only their own fields, whereas dicts keep any field:
+        if response_format is not None and not is_typeddict(response_format):
+            try:
+                return self._decoder(response_format=response_format).decode(body)
+
+            except msgspec.ValidationError:
+                # e.g., an error response, or a value we don't know (yet):
+                pass
+
+            except msgspec.DecodeError:
+                # not JSON at all, which is reported below:
+                pass
+
+        try:
+            return msgspec.json.decode(body)
+
+        except msgspec.DecodeError as error:
+            text = body.decode(errors="replace") if isinstance(body, bytes) else body
+            raise JSONDecodeError(str(error), text, 0) from error
+
+    def _decoder(self, response_format: type) -> "msgspec.json.Decoder":
+        decoder = self._decoders.get(response_format)
+        if decoder is None:
+            # the API isn't strict about its types either
+            # (e.g., it returns some integers as strings):
+            decoder = self._decoders[response_format] = msgspec.json.Decoder(
+                type=response_format, strict=False
+            )
+
+        return decoder
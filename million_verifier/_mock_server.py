@@ -0,0 +1,772 @@
+import csv
+import io
+import json
+import math
+import time
+import zlib
+import random
+import itertools
+import threading
+from collections import Counter
+from datetime import datetime
+from email.parser import BytesParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from typing import Optional, Dict, List, Tuple, Literal, Callable, Any
+
+from ._utils import datetime_to_str, normalise_email
+from ._enums import FileStatus, Result, Quality, SubResult, ReportStatus, ResultFilter
+from ._formats import EmailVerification, FileInfo, CreditsSummary
+from ._preprocess import is_valid_syntax
+from ._api import (
+    VERIFY_PATH,
+    CREDITS_PATH,
+    UPLOAD_PATH,
+    FILE_INFO_PATH,
+    FILE_LIST_PATH,
+    DOWNLOAD_PATH,
+    STOP_PATH,
+    DELETE_PATH,
+    UPLOAD_FIELD,
+)
+
+
+__all__ = [
+    "MockMillionVerifierServer",
+]
+
+MockError = Literal[
+    "rate_limited",
+    "server_error",
+    "ip_address_blocked",
+    "file_not_found",
+    "apikey_not_found",
+]
+
+# status, JSON body and headers of every error that can be injected:
+_ERRORS: Dict[str, Tuple[int, Optional[dict], Dict[str, str]]] = {
+    "rate_limited": (429, None, {"Retry-After": "0"}),
+    "server_error": (503, None, {}),
+    "ip_address_blocked": (200, {"error": "ip address blocked"}, {}),
+    "file_not_found": (200, {"error": "file_not_found"}, {}),
+    "apikey_not_found": (200, {"error": "apikey not found"}, {}),
+}
+
+# result code, quality and sub-result per result:
+_OUTCOMES: Dict[Result, Tuple[int, Quality, SubResult]] = {
+    Result.OK: (1, Quality.GOOD, SubResult.OK),
+    Result.CATCH_ALL: (2, Quality.RISKY, SubResult.OK),
+    Result.UNKNOWN: (3, Quality.RISKY, SubResult.GREYLISTED),
+    Result.REVERIFY: (3, Quality.RISKY, SubResult.MAILBOX_FULL),
+    Result.DISPOSABLE: (5, Quality.BAD, SubResult.OK),
+    Result.INVALID: (6, Quality.BAD, SubResult.NO_MAILBOX),
+}
+# share (in percent) of every result among addresses that
+# don't ask for one, roughly that of a typical list:
+_DISTRIBUTION: List[Tuple[int, Result]] = [
+    (60, Result.OK),
+    (75, Result.CATCH_ALL),
+    (85, Result.UNKNOWN),
+    (97, Result.INVALID),
+    (100, Result.DISPOSABLE),
+]
+_FREE_DOMAINS = frozenset(
+    {
+        "gmail.com",
+        "googlemail.com",
+        "yahoo.com",
+        "hotmail.com",
+        "outlook.com",
+        "live.com",
+        "aol.com",
+        "icloud.com",
+    }
+)
+_ROLE_ACCOUNTS = frozenset(
+    {
+        "admin",
+        "billing",
+        "contact",
+        "hello",
+        "info",
+        "noreply",
+        "office",
+        "sales",
+        "support",
+    }
+)
+# filters of the file list that need the files' info,
+# as (parameter, key, whether to keep the value):
+_FILE_LIST_FILTERS: List[Tuple[str, str, Callable[[Any, str], bool]]] = [
+    ("status", "status", lambda status, statuses: status in statuses.split(",")),
+    ("percent_from", "percent", lambda percent, bound: percent >= int(bound)),
+    ("percent_to", "percent", lambda percent, bound: percent <= int(bound)),
+    (
+        "has_error",
+        "error",
+        lambda error, has_error: bool(error) == (has_error == "True"),
+    ),
+    # dates are formatted such that they sort as strings:
+    ("updated_at_from", "updated_at", str.__ge__),
+    ("updated_at_to", "updated_at", str.__le__),
+    ("createdate_from", "createdate", str.__ge__),
+    ("createdate_to", "createdate", str.__le__),
+]
+# columns that the report adds to the uploaded file:
+_REPORT_COLUMNS = ["quality", "result", "subresult", "free", "role"]
+
+
+class _Verification:
+    """
+    Outcome of verifying a single address.
+    """
+
+    __slots__ = ("result", "resultcode", "quality", "subresult", "free", "role")
+
+    def __init__(self, email: str) -> None:
+        email = normalise_email(email=email)
+        local, _, domain = email.rpartition("@")
+        if is_valid_syntax(email=email):
+            self.result = _result(email=email, local=local)
+            self.resultcode, self.quality, self.subresult = _OUTCOMES[self.result]
+
+        else:
+            self.result = Result.INVALID
+            self.resultcode, self.quality, _ = _OUTCOMES[self.result]
+            self.subresult = SubResult.INVALID_SYNTAX
+
+        self.free = domain in _FREE_DOMAINS
+        self.role = local.split("+", 1)[0] in _ROLE_ACCOUNTS
+
+
+def _result(email: str, local: str) -> Result:
+    # addresses can ask for a result, e.g.
+    # invalid@example.com or catch_all.jane@example.com:
+    requested = local.split(".", 1)[0].split("+", 1)[0]
+    if Result.contains(requested):
+        return Result.from_value(requested)
+
+    # everything else gets a result that's random, but the same for every request:
+    share = zlib.crc32(email.encode()) % 100
+    return next(result for limit, result in _DISTRIBUTION if share < limit)
+
+
+class _MockFile:
+    """
+    File uploaded to the mock server, which is verified at a fixed number of rows per second.
+    """
+
+    def __init__(
+        self,
+        file_id: int,
+        file_name: str,
+        contents: str,
+        rows_per_second: float,
+        queue_time: float,
+    ) -> None:
+        rows = [
+            row
+            for row in csv.reader(io.StringIO(contents))
+            if any(cell.strip() for cell in row)
+        ]
+        # the first row is a header, unless it has an address in it:
+        if rows and not any("@" in cell for cell in rows[0]):
+            self.headings, rows = rows[0], rows[1:]
+
+        else:
+            self.headings = ["email"]
+
+        lowered = [heading.strip().lower() for heading in self.headings]
+        if "email" in lowered:
+            column = lowered.index("email")
+
+        else:
+            column = next(
+                (
+                    index
+                    for index, cell in enumerate(rows[0] if rows else [])
+                    if "@" in cell
+                ),
+                0,
+            )
+
+        self.file_id = file_id
+        self.file_name = file_name
+        self.rows = rows
+        self.emails = [row[column] if column < len(row) else "" for row in rows]
+        self.verifications = [_Verification(email=email) for email in self.emails]
+        self.unique_emails = len(
+            {normalise_email(email=email) for email in self.emails}
+        )
+        self.rows_per_second = rows_per_second
+        self.uploaded_at = time.time()
+        self.started_at = self.uploaded_at + queue_time
+        # set once the file is stopped:
+        self.stopped_at: Optional[float] = None
+
+    def verified(self, now: float) -> int:
+        if self.stopped_at is not None:
+            now = self.stopped_at
+
+        return min(
+            len(self.rows), max(int((now - self.started_at) * self.rows_per_second), 0)
+        )
+
+    def status(self, now: float) -> FileStatus:
+        if self.stopped_at is not None:
+            return FileStatus.CANCELED
+
+        if now < self.started_at:
+            return FileStatus.IN_QUEUE_TO_START
+
+        if self.verified(now=now) < len(self.rows):
+            return FileStatus.IN_PROGRESS
+
+        return FileStatus.FINISHED
+
+    def info(self, now: float) -> FileInfo:
+        total = len(self.rows)
+        verified = self.verified(now=now)
+        status = self.status(now=now)
+        counts = Counter(
+            verification.result for verification in self.verifications[:verified]
+        )
+        if status == FileStatus.IN_PROGRESS or status == FileStatus.IN_QUEUE_TO_START:
+            updated_at = now
+
+        elif status == FileStatus.CANCELED:
+            updated_at = self.stopped_at
+
+        else:
+            updated_at = self.started_at + total / self.rows_per_second
+
+        return FileInfo(
+            file_id=self.file_id,
+            file_name=self.file_name,
+            status=status.value,
+            unique_emails=self.unique_emails,
+            updated_at=datetime_to_str(datetime.fromtimestamp(updated_at)),
+            createdate=datetime_to_str(datetime.fromtimestamp(self.uploaded_at)),
+            percent=100 if total == 0 else verified * 100 // total,
+            total_rows=total,
+            verified=verified,
+            unverified=total - verified,
+            ok=counts[Result.OK],
+            catch_all=counts[Result.CATCH_ALL],
+            disposable=counts[Result.DISPOSABLE],
+            invalid=counts[Result.INVALID],
+            unknown=counts[Result.UNKNOWN],
+            reverify=counts[Result.REVERIFY],
+            credit=self.unique_emails,
+            estimated_time_sec=(
+                math.ceil((total - verified) / self.rows_per_second)
+                if status == FileStatus.IN_PROGRESS
+                or status == FileStatus.IN_QUEUE_TO_START
+                else 0
+            ),
+            error="",
+        )
+
+    def report(self, now: float, params: Dict[str, str]) -> bytes:
+        result_filter = ResultFilter.from_value(
+            params.get("filter", ResultFilter.ALL.value)
+        )
+        if result_filter == ResultFilter.CUSTOM and params.get("statuses"):
+            allowed = {
+                result
+                for status in params["statuses"].split(",")
+                for result in ReportStatus.from_value(status).allowed_results()
+            }
+
+        else:
+            allowed = set(result_filter.allowed_results())
+
+        # free and role are either 1 (include) or 0
+        # (exclude), and only apply to the custom filter:
+        include_free = (
+            result_filter != ResultFilter.CUSTOM or params.get("free", "1") == "1"
+        )
+        include_role = (
+            result_filter != ResultFilter.CUSTOM or params.get("role", "1") == "1"
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.headings + _REPORT_COLUMNS)
+        verified = self.verified(now=now)
+        for row, verification in zip(self.rows[:verified], self.verifications):
+            if (
+                verification.result not in allowed
+                or (verification.free and not include_free)
+                or (verification.role and not include_role)
+            ):
+                continue
+
+            writer.writerow(
+                # pad short rows, such that the added columns line up:
+                (row + [""] * len(self.headings))[: len(self.headings)]
+                + [
+                    verification.quality.value,
+                    verification.result.value,
+                    verification.subresult.value,
+                    "yes" if verification.free else "no",
+                    "yes" if verification.role else "no",
+                ]
+            )
+
+        return buffer.getvalue().encode()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # keep connections alive, as the API does:
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, which Nagle's
+    # algorithm would delay on kept-alive connections:
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def do_HEAD(self) -> None:
+        # e.g., warming up connections:
+        self._read_body()
+        if self.server.mock.latency:
+            time.sleep(self.server.mock.latency)
+
+        self._respond(status=200, body=b"")
+
+    def _handle(self) -> None:
+        url = urlsplit(self.path)
+        params = {
+            key: values[-1]
+            for key, values in parse_qs(url.query, keep_blank_values=True).items()
+        }
+        body = self._read_body()
+        status, payload, headers = self.server.mock._dispatch(
+            method=self.command,
+            path=url.path,
+            params=params,
+            headers=dict(self.headers.items()),
+            body=body,
+        )
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        self._respond(status=status, body=payload, headers=headers)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            # streamed uploads don't know their length up front:
+            chunks = []
+            while size := int(
+                self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16
+            ):
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+
+            # skip any trailers, up to the empty line that ends the body:
+            while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                pass
+
+            return b"".join(chunks)
+
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _respond(
+        self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.send_response(status)
+        for key, val in (headers or {}).items():
+            self.send_header(key, val)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockMillionVerifierServer"
+
+
+class MockMillionVerifierServer:
+    """
+    Local stand-in for the Million Verifier API (both the single and the bulk API), for offline tests, load tests
+    and benchmarks. It serves realistic responses on a local port, using only the standard library:
+
+    - Verifications are deterministic: an address whose local part starts with a result (e.g., invalid@example.com
+      or catch_all.jane@example.com) gets that result, other addresses get a result based on their hash.
+    - Uploaded files are verified at rows_per_second (after queue_time), so their progress and reports grow
+      over time, and they can be stopped, listed, downloaded (with range requests, validated by an ETag) and deleted.
+    - Every response can be delayed by latency, and errors can be injected with inject_error (or at random with
+      error_rate).
+
+    Point a client at it with its URL as both base URLs:
+
+        with MockMillionVerifierServer() as server:
+            client = MillionVerifierClient(api_key="key", single_api_url=server.url, bulk_api_url=server.url)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rows_per_second: float = 1000.0,
+        queue_time: float = 0.0,
+        credits: int = 1_000_000,
+        bulk_credits: int = 1_000_000,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param api_key: API key that requests must use, any key is accepted if not provided.
+        :param host: Host to listen on.
+        :param port: Port to listen on, defaults to any free port (see url).
+        :param latency: Delay (in seconds) before every response.
+        :param error_rate: Probability that a request is rate-limited (i.e., gets a 429) at random.
+        :param rows_per_second: Speed at which uploaded files are verified.
+        :param queue_time: Time (in seconds) that uploaded files are queued before their verification starts.
+        :param credits: Credits available for single verifications.
+        :param bulk_credits: Credits available for bulk verifications.
+        :param seed: Seed for the random errors.
+        """
+        assert latency >= 0, f"latency can't be negative, but received {latency}."
+        assert (
+            0 <= error_rate <= 1
+        ), f"error_rate must be between 0 and 1, but received {error_rate}."
+        assert (
+            rows_per_second > 0
+        ), f"rows_per_second must be positive, but received {rows_per_second}."
+        self.api_key = api_key
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rows_per_second = rows_per_second
+        self.queue_time = queue_time
+        self.credits = credits
+        self.bulk_credits = bulk_credits
+        # number of requests per path:
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._files: Dict[int, _MockFile] = {}
+        self._file_ids = itertools.count(1)
+        # errors still to inject, as [error, path, remaining]:
+        self._errors: List[list] = []
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the server, for both the single and the bulk API.
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockMillionVerifierServer":
+        """
+        Start serving in a background thread.
+
+        :return: The server itself (with its port resolved).
+        """
+        assert self._server is None, "The server is running already."
+        self._server = _Server((self.host, self.port), _RequestHandler)
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            # how often shutdown is checked for:
+            kwargs={"poll_interval": 0.05},
+            name="mock-million-verifier",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the socket.
+        """
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MockMillionVerifierServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def inject_error(
+        self, error: MockError, times: int = 1, path: Optional[str] = None
+    ) -> None:
+        """
+        Make the next request(s) fail.
+
+        :param error: Error to respond with: rate_limited (429), server_error (503), or the API's JSON errors for
+            ip_address_blocked, file_not_found and apikey_not_found.
+        :param times: Number of requests to fail.
+        :param path: Only fail requests for this path (e.g., VERIFY_PATH), fails requests for any path if not provided.
+        """
+        assert (
+            error in _ERRORS
+        ), f"{error} is not an error. Valid options are: {list(_ERRORS)}"
+        with self._lock:
+            self._errors.append([error, path, times])
+
+    def add_file(self, contents: str, file_name: str = "emails.csv") -> FileInfo:
+        """
+        Add a file, as if it was uploaded.
+
+        :param contents: Contents of the csv or txt file.
+        :param file_name: Name of the file.
+        :return: Info of the file (in the API's JSON format).
+        """
+        with self._lock:
+            file = self._new_file(contents=contents, file_name=file_name)
+            self._files[file.file_id] = file
+            return file.info(now=time.time())
+
+    def _new_file(self, contents: str, file_name: str) -> _MockFile:
+        return _MockFile(
+            file_id=next(self._file_ids),
+            file_name=file_name,
+            contents=contents,
+            rows_per_second=self.rows_per_second,
+            queue_time=self.queue_time,
+        )
+
+    def _dispatch(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> Tuple[int, dict | list | bytes, Dict[str, str]]:
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests[path] += 1
+            error = self._next_error(path=path)
+
+        if error is not None:
+            status, payload, error_headers = _ERRORS[error]
+            return status, payload or {"error": error}, dict(error_headers)
+
+        routes = {
+            VERIFY_PATH: self._verify,
+            CREDITS_PATH: self._credits,
+            UPLOAD_PATH: self._upload,
+            FILE_INFO_PATH: self._file_info,
+            FILE_LIST_PATH: self._file_list,
+            DOWNLOAD_PATH: self._download,
+            STOP_PATH: self._stop,
+            DELETE_PATH: self._delete,
+        }
+        route = routes.get(path)
+        if route is None:
+            return 404, {"error": f"{method} {path} not found"}, {}
+
+        # the single API takes the key as api, the bulk API as key:
+        if (
+            self.api_key is not None
+            and params.get("api", params.get("key")) != self.api_key
+        ):
+            return 200, {"error": "apikey not found"}, {}
+
+        with self._lock:
+            return route(params=params, headers=headers, body=body)
+
+    def _next_error(self, path: str) -> Optional[str]:
+        for injected in self._errors:
+            error, error_path, remaining = injected
+            if error_path is None or error_path == path:
+                injected[2] -= 1
+                if injected[2] <= 0:
+                    self._errors.remove(injected)
+
+                return error
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return "rate_limited"
+
+        return None
+
+    def _verify(self, params: Dict[str, str], **_) -> Tuple[int, dict, dict]:
+        email = params.get("email", "")
+        if self.credits <= 0:
+            return 200, {"error": "insufficient credits"}, {}
+
+        self.credits -= 1
+        verification = _Verification(email=email)
+        return (
+            200,
+            EmailVerification(
+                email=email,
+                quality=verification.quality.value,
+                result=verification.result.value,
+                resultcode=verification.resultcode,
+                subresult=verification.subresult.value,
+                free=verification.free,
+                role=verification.role,
+                didyoumean="",
+                credits=self.credits,
+                executiontime=round(self.latency),
+                error="",
+                livemode=True,
+            ),
+            {},
+        )
+
+    def _credits(self, **_) -> Tuple[int, dict, dict]:
+        return (
+            200,
+            CreditsSummary(
+                credits=self.credits,
+                bulk_credits=self.bulk_credits,
+                renewing_credits=0,
+                plan=0,
+            ),
+            {},
+        )
+
+    def _upload(
+        self, headers: Dict[str, str], body: bytes, **_
+    ) -> Tuple[int, dict, dict]:
+        message = BytesParser().parsebytes(
+            f"Content-Type: {headers.get('Content-Type', '')}\r\n\r\n".encode() + body
+        )
+        parts = [
+            part
+            for part in (message.get_payload() if message.is_multipart() else [])
+            if part.get_param("name", header="content-disposition") == UPLOAD_FIELD
+        ]
+        if not parts:
+            return 200, {"error": f"{UPLOAD_FIELD} is required"}, {}
+
+        file = self._new_file(
+            contents=parts[0].get_payload(decode=True).decode(errors="replace"),
+            file_name=parts[0].get_filename() or "emails.txt",
+        )
+        if file.unique_emails > self.bulk_credits:
+            return 200, {"error": "insufficient credits"}, {}
+
+        self.bulk_credits -= file.unique_emails
+        self._files[file.file_id] = file
+        return 200, file.info(now=time.time()), {}
+
+    def _file(self, params: Dict[str, str]) -> Optional[_MockFile]:
+        try:
+            return self._files.get(int(params.get("file_id", "")))
+
+        except ValueError:
+            return None
+
+    def _file_info(self, params: Dict[str, str], **_) -> Tuple[int, dict, dict]:
+        file = self._file(params=params)
+        if file is None:
+            return 200, {"error": "file_not_found"}, {}
+
+        return 200, file.info(now=time.time()), {}
+
+    def _file_list(self, params: Dict[str, str], **_) -> Tuple[int, dict, dict]:
+        now = time.time()
+        # newest first, as the API lists them:
+        files = list(reversed(self._files.values()))
+        if params.get("id"):
+            file_ids = {int(file_id) for file_id in params["id"].split(",")}
+            files = [file for file in files if file.file_id in file_ids]
+
+        if params.get("name"):
+            files = [file for file in files if params["name"] in file.file_name]
+
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 50)
+        filters = [
+            (param, key, keep)
+            for param, key, keep in _FILE_LIST_FILTERS
+            if params.get(param)
+        ]
+        if not filters:
+            # only the files on the page need their info,
+            # which keeps paginating over many files cheap:
+            infos = [file.info(now=now) for file in files[offset : offset + limit]]
+            return 200, {"files": infos, "total": len(files)}, {}
+
+        infos = [file.info(now=now) for file in files]
+        for param, key, keep in filters:
+            infos = [info for info in infos if keep(info[key], params[param])]
+
+        return 200, {"files": infos[offset : offset + limit], "total": len(infos)}, {}
+
+    def _download(
+        self, params: Dict[str, str], headers: Dict[str, str], **_
+    ) -> Tuple[int, dict | bytes, dict]:
+        file = self._file(params=params)
+        if file is None:
+            return 200, {"error": "file_not_found"}, {}
+
+        now = time.time()
+        if file.status(now=now) not in (FileStatus.FINISHED, FileStatus.CANCELED):
+            return 200, {"error": "file is not finished yet"}, {}
+
+        report = file.report(now=now, params=params)
+        etag = f'"{zlib.crc32(report):08x}"'
+        response_headers = {"Content-Type": "text/csv", "ETag": etag}
+        requested = headers.get("Range", "")
+        # a range only applies to the report it was made for:
+        if headers.get("If-Range", etag) != etag:
+            requested = ""
+
+        if requested.startswith("bytes=") and requested.endswith("-"):
+            start = int(requested[len("bytes=") : -1])
+            if start >= len(report):
+                # as per HTTP, a range starting past the end is unsatisfiable:
+                return 416, b"", {"Content-Range": f"bytes */{len(report)}"}
+
+            response_headers[
+                "Content-Range"
+            ] = f"bytes {start}-{len(report) - 1}/{len(report)}"
+            return 206, report[start:], response_headers
+
+        return 200, report, response_headers
+
+    def _stop(self, params: Dict[str, str], **_) -> Tuple[int, dict, dict]:
+        file = self._file(params=params)
+        if file is None:
+            return 200, {"error": "file_not_found"}, {}
+
+        now = time.time()
+        if file.status(now=now) in (
+            FileStatus.IN_PROGRESS,
+            FileStatus.IN_QUEUE_TO_START,
+        ):
+            file.stopped_at = now
+
+        return 200, {"result": "ok"}, {}
+
+    def _delete(self, params: Dict[str, str], **_) -> Tuple[int, dict, dict]:
+        file = self._file(params=params)
+        if file is None:
+            return 200, {"error": "file_not_found"}, {}
+
+        del self._files[file.file_id]
+        return 200, {"result": "ok"}, {}
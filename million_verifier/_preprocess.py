@@ -0,0 +1,377 @@
+import re
+import math
+import hashlib
+import warnings
+from copy import copy
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple, Iterable, Iterator, Set
+
+from ._enums import Quality, Result, SubResult
+from ._formats import EmailVerification, BatchVerification, ReportEntry
+from ._records import EmailVerificationRecord, ReportEntryRecord
+from ._utils import normalise_email
+
+
+__all__ = [
+    "BloomFilter",
+    "Preprocessor",
+    "canonicalise_email",
+    "is_valid_syntax",
+    "invalid_syntax_verification",
+]
+
+
+# domains that are aliases of the same mailbox provider:
+_PROVIDER_ALIASES = {
+    "googlemail.com": "gmail.com",
+    "hotmail.com": "outlook.com",
+    "live.com": "outlook.com",
+    "msn.com": "outlook.com",
+    "me.com": "icloud.com",
+    "mac.com": "icloud.com",
+    "protonmail.com": "proton.me",
+    "pm.me": "proton.me",
+}
+# providers that ignore dots in the local part:
+_DOTLESS_PROVIDERS = frozenset({"gmail.com"})
+# providers that deliver local+tag to local:
+_TAGGED_PROVIDERS = frozenset(
+    {"gmail.com", "outlook.com", "icloud.com", "proton.me", "fastmail.com"}
+)
+
+# deliberately lenient: only rejects addresses that can't
+# possibly be delivered to, leaving the rest to the API:
+_EMAIL_SYNTAX = re.compile(
+    r"(?!\.)(?!.*\.@)(?!.*\.\.)[^\s@\"(),:;<>\[\]\\]{1,64}"
+    r"@(?:[^\s@\"(),:;<>\[\]\\.\-_][^\s@\"(),:;<>\[\]\\._]*\.)+[^\s@\"(),:;<>\[\]\\.\-_0-9][^\s@\"(),:;<>\[\]\\.]+"
+)
+_MAX_EMAIL_LENGTH = 254
+
+
+def canonicalise_email(email: str) -> str:
+    """
+    Canonicalise a (normalised) email-address for the major mailbox providers, such that addresses that are
+    delivered to the same mailbox are equal, e.g., "j.doe+news@googlemail.com" becomes "jdoe@gmail.com".
+
+    :param email: Normalised (trimmed and lower-cased) email address.
+    :return: Canonical email address.
+    """
+    local, at, domain = email.rpartition("@")
+    if not at:
+        return email
+
+    domain = _PROVIDER_ALIASES.get(domain, domain)
+    if domain in _TAGGED_PROVIDERS:
+        local = local.split("+", 1)[0]
+
+    if domain in _DOTLESS_PROVIDERS:
+        local = local.replace(".", "")
+
+    return f"{local}@{domain}"
+
+
+def is_valid_syntax(email: str) -> bool:
+    """
+    Check whether an email-address is syntactically valid, without any network calls.
+
+    :param email: Normalised (trimmed and lower-cased) email address.
+    :return: False if the address can't possibly be valid, True otherwise.
+    """
+    return (
+        len(email) <= _MAX_EMAIL_LENGTH and _EMAIL_SYNTAX.fullmatch(email) is not None
+    )
+
+
+def invalid_syntax_verification(email: str) -> EmailVerification:
+    """
+    Verification for an email-address that was rejected for its syntax, without spending a credit.
+
+    :param email: Rejected email address.
+    :return: Verification in the format of the API.
+    """
+    return EmailVerification(
+        email=email,
+        quality=Quality.BAD,
+        result=Result.INVALID,
+        resultcode=6,
+        subresult=SubResult.INVALID_SYNTAX,
+        free=False,
+        role=False,
+        didyoumean="",
+        credits=0,
+        executiontime=0,
+        error="",
+        livemode=False,
+    )
+
+
+class BloomFilter:
+    """
+    Set-like membership test in a fixed amount of memory, for deduplicating inputs too large to hold in a set.
+    There are no false negatives, but a fraction (error_rate) of unseen items is reported as seen.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        :param capacity: Expected number of (unique) items.
+        :param error_rate: Acceptable fraction of false positives at capacity.
+        """
+        assert capacity >= 1, f"capacity must be at least 1, but received {capacity}."
+        assert (
+            0 < error_rate < 1
+        ), f"error_rate must be between 0 and 1, but received {error_rate}."
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hashes = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # double hashing: k positions from two independent 64-bit hashes:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = (
+            int.from_bytes(digest[:8], "little"),
+            int.from_bytes(digest[8:], "little") | 1,
+        )
+        for index in range(self._hashes):
+            yield (first + index * second) % self._size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item=item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item=item)
+        )
+
+
+class Preprocessor:
+    """
+    Client-side preparation of email addresses before spending credits on them: normalising (trimming and
+    lower-casing), optionally canonicalising per mailbox provider, rejecting hopeless syntax, and deduplicating.
+    """
+
+    def __init__(
+        self,
+        canonicalise_providers: bool = False,
+        reject_invalid_syntax: bool = True,
+        bloom_filter_capacity: Optional[int] = None,
+        bloom_filter_error_rate: float = 0.001,
+        dedupe_window: int = 100_000,
+    ) -> None:
+        """
+        :param canonicalise_providers: Whether to canonicalise addresses of the major mailbox providers (e.g.,
+            dropping dots and +tags for Gmail), such that aliases of the same mailbox are deduplicated.
+        :param reject_invalid_syntax: Whether to reject syntactically invalid addresses without verifying them.
+        :param bloom_filter_capacity: If set, uploads are deduplicated with a Bloom filter of this capacity rather
+            than a set, such that memory remains bounded, at the cost of silently dropping a fraction of unique
+            addresses from uploads (which warns). Batches of verifications never use the Bloom filter.
+        :param bloom_filter_error_rate: Acceptable fraction of unique addresses the Bloom filter drops.
+        :param dedupe_window: Number of the most recent verifications that a batch of verifications keeps to answer
+            duplicates with, such that memory remains bounded for (streamed) batches of any size. Duplicates
+            further apart than the window are verified again.
+        """
+        assert (
+            dedupe_window >= 1
+        ), f"dedupe_window must be at least 1, but received {dedupe_window}."
+        if bloom_filter_capacity is not None:
+            warnings.warn(
+                f"Uploads deduplicated with a Bloom filter drop about {bloom_filter_error_rate:.2%} of the unique "
+                f"addresses (once it holds {bloom_filter_capacity} addresses) without verifying them.",
+                stacklevel=2,
+            )
+
+        self.canonicalise_providers = canonicalise_providers
+        self.reject_invalid_syntax = reject_invalid_syntax
+        self.bloom_filter_capacity = bloom_filter_capacity
+        self.bloom_filter_error_rate = bloom_filter_error_rate
+        self.dedupe_window = dedupe_window
+
+    def key(self, email: str) -> str:
+        """
+        :param email: Email address.
+        :return: The address as it is verified and deduplicated.
+        """
+        email = normalise_email(email=email)
+        return canonicalise_email(email=email) if self.canonicalise_providers else email
+
+    def is_rejected(self, email: str) -> bool:
+        """
+        :param email: Email address.
+        :return: Whether the address is rejected without verifying it.
+        """
+        return self.reject_invalid_syntax and not is_valid_syntax(
+            email=normalise_email(email=email)
+        )
+
+    def filter_lines(
+        self, lines: Iterable[str | bytes], has_header: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Prepare the lines of a file to upload: rejected and duplicate addresses are dropped, and the remaining
+        addresses are replaced by their key. Memory is bounded when deduplicating with a Bloom filter.
+
+        :param lines: Lines, with the email address in the first column.
+        :param has_header: Whether the first line is a header, which is kept as is.
+        :return: Iterator over the prepared lines.
+        """
+        seen = self._new_seen()
+        for line in lines:
+            line = line.encode() if isinstance(line, str) else line
+            if has_header:
+                has_header = False
+                yield line
+                continue
+
+            email, comma, rest = line.partition(b",")
+            email = email.decode(errors="replace")
+            if not email.strip() or self.is_rejected(email=email):
+                continue
+
+            key = self.key(email=email)
+            if key in seen:
+                continue
+
+            seen.add(key)
+            rest = rest if comma else (b"\n" if line.endswith(b"\n") else b"")
+            yield key.encode() + comma + rest
+
+    def map_report(
+        self,
+        lines: Iterable[str | bytes],
+        report: Iterable[ReportEntry | ReportEntryRecord],
+        has_header: bool = False,
+    ) -> Iterator[Tuple[str, Optional[ReportEntry | ReportEntryRecord]]]:
+        """
+        Map the report of an upload that was prepared with filter_lines back to the input rows, such that every
+        duplicate gets the entry of the address it was deduplicated with. The report is indexed by key, so it's
+        held in memory (in full), whereas the lines are consumed lazily.
+
+        :param lines: Lines that were uploaded (again), with the email address in the first column.
+        :param report: Report of the uploaded file, as dicts or records.
+        :param has_header: Whether the first line is a header, which is skipped.
+        :return: Iterator over the email address of every input row and its entry, in input order, where the
+            entry is None for rejected addresses (or addresses that are missing from the report).
+        """
+        entries = {
+            self.key(
+                email=entry.email
+                if isinstance(entry, ReportEntryRecord)
+                else entry["email"]
+            ): entry
+            for entry in report
+        }
+        for line in lines:
+            line = line.decode(errors="replace") if isinstance(line, bytes) else line
+            if has_header:
+                has_header = False
+                continue
+
+            email = line.partition(",")[0].rstrip("\r\n")
+            if not email.strip():
+                continue
+
+            entry = (
+                None
+                if self.is_rejected(email=email)
+                else entries.get(self.key(email=email))
+            )
+            yield email, entry
+
+    def _new_seen(self) -> Set[str] | BloomFilter:
+        if self.bloom_filter_capacity is None:
+            return set()
+
+        return BloomFilter(
+            capacity=self.bloom_filter_capacity, error_rate=self.bloom_filter_error_rate
+        )
+
+
+class BatchFanOut:
+    """
+    Deduplicates a batch of verifications: rejected addresses are answered right away, each unique address is
+    verified once, and its result is fanned out to every input with the same key (within the preprocessor's
+    dedupe_window of the most recently verified addresses).
+    """
+
+    def __init__(self, preprocessor: Preprocessor, as_records: bool = False) -> None:
+        """
+        :param preprocessor: Preprocessor to reject and deduplicate with.
+        :param as_records: Whether the verifications are EmailVerificationRecords rather than dicts.
+        """
+        self._preprocessor = preprocessor
+        self._as_records = as_records
+        # inputs waiting for the verification of their key, which is in flight:
+        self._waiting: Dict[str, List[Tuple[int, str]]] = {}
+        # the most recent verifications (least recent first), for later duplicates:
+        self._done: OrderedDict[str, BatchVerification] = OrderedDict()
+
+    def admit(self, index: int, email: str) -> Tuple[bool, List[BatchVerification]]:
+        """
+        :param index: Index of the input.
+        :param email: Email address of the input.
+        :return: Whether the address needs verifying, and results that are available right away.
+        """
+        if self._preprocessor.is_rejected(email=email):
+            verification = invalid_syntax_verification(email=email)
+            return False, [
+                BatchVerification(
+                    index=index,
+                    email=email,
+                    verification=EmailVerificationRecord.from_dict(
+                        verification=verification
+                    )
+                    if self._as_records
+                    else verification,
+                    error=None,
+                )
+            ]
+
+        key = self._preprocessor.key(email=email)
+        if key in self._done:
+            self._done.move_to_end(key)
+            return False, [
+                _fanned_out(result=self._done[key], index=index, email=email)
+            ]
+
+        if key in self._waiting:
+            self._waiting[key].append((index, email))
+            return False, []
+
+        self._waiting[key] = []
+        return True, []
+
+    def complete(self, result: BatchVerification) -> List[BatchVerification]:
+        """
+        :param result: Result of a verification.
+        :return: The result, and its copies for every duplicate input that was waiting for it.
+        """
+        key = self._preprocessor.key(email=result["email"])
+        self._done[key] = result
+        if len(self._done) > self._preprocessor.dedupe_window:
+            self._done.popitem(last=False)
+
+        return [result] + [
+            _fanned_out(result=result, index=index, email=email)
+            for index, email in self._waiting.pop(key, [])
+        ]
+
+
+def _fanned_out(result: BatchVerification, index: int, email: str) -> BatchVerification:
+    verification = result["verification"]
+    if isinstance(verification, EmailVerificationRecord):
+        verification = copy(verification)
+        verification.email = email
+
+    elif verification is not None:
+        verification = verification.copy()
+        verification["email"] = email
+
+    return BatchVerification(
+        index=index,
+        email=email,
+        verification=verification,
+        error=result["error"],
+    )
@@ -0,0 +1,174 @@
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+from typing import Optional, Dict, Tuple
+
+try:
+    import fcntl
+
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+__all__ = [
+    "TokenBucket",
+    "FileTokenBucket",
+    "RateLimiter",
+]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, allowing bursts of up to capacity requests and rate requests per second thereafter.
+
+    Tokens are reserved rather than waited for: reserving returns how long the caller must wait before its token
+    is available, such that waiting happens outside the lock and works for both threads and coroutines.
+    """
+
+    # whether reserving may block (for longer than a
+    # thread lock), such that async clients reserve in a thread:
+    blocking = False
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens (i.e., burst size), defaults to one second's worth of tokens.
+        """
+        capacity = rate if capacity is None else capacity
+        assert rate > 0, f"rate must be positive, but received {rate}."
+        assert capacity >= 1, f"capacity must be at least 1, but received {capacity}."
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Reserve tokens.
+
+        :param tokens: Number of tokens to reserve.
+        :return: Time (in seconds) to wait before the tokens may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, self._updated = _take(
+                tokens=self._tokens,
+                updated=self._updated,
+                now=now,
+                rate=self.rate,
+                capacity=self.capacity,
+                requested=tokens,
+            )
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a (locked) file, such that it is shared by every process on the host using
+    the same path, e.g. a fleet of workers sharing an API key. Only available on POSIX systems.
+    """
+
+    # the file lock may be held by other processes:
+    blocking = True
+
+    def __init__(
+        self, path: str, rate: float, capacity: Optional[float] = None
+    ) -> None:
+        """
+        :param path: Path to the file holding the bucket's state, created if it doesn't exist.
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens (i.e., burst size), defaults to one second's worth of tokens.
+        """
+        if fcntl is None:
+            raise OSError(
+                "FileTokenBucket requires fcntl, which is not available on this platform."
+            )
+
+        super().__init__(rate=rate, capacity=capacity)
+        self.path = path
+
+    def reserve(self, tokens: float = 1) -> float:
+        # every call opens its own file description, so
+        # the lock excludes threads as well as processes:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            state = os.read(fd, 64).split()
+            # the state is shared between processes, so we
+            # need wall-clock rather than monotonic time:
+            now = time.time()
+            if len(state) == 2:
+                current, updated = float(state[0]), float(state[1])
+
+            else:
+                current, updated = self.capacity, now
+
+            current, updated = _take(
+                tokens=current,
+                updated=updated,
+                now=now,
+                rate=self.rate,
+                capacity=self.capacity,
+                requested=tokens,
+            )
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{current!r} {updated!r}".encode())
+            return max(-current / self.rate, 0.0)
+
+        finally:
+            # closing the file releases the lock:
+            os.close(fd)
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter, with a token bucket per API host.
+    Requests to hosts without a bucket are not limited.
+    """
+
+    def __init__(self, buckets: Dict[str, TokenBucket]) -> None:
+        """
+        :param buckets: Token bucket per host, keyed by either the host or its base URL (e.g., MV_SINGLE_API_URL).
+        """
+        self._buckets = {_host(url=key): bucket for key, bucket in buckets.items()}
+
+    def blocking(self, url: str) -> bool:
+        """
+        Check whether reserving a token for a request may block, e.g. on a FileTokenBucket's file lock.
+
+        :param url: URL of the request.
+        :return: Whether reserving may block.
+        """
+        bucket = self._buckets.get(_host(url=url))
+        return bucket is not None and bucket.blocking
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve a token for a request.
+
+        :param url: URL of the request.
+        :return: Time (in seconds) to wait before sending the request.
+        """
+        bucket = self._buckets.get(_host(url=url))
+        return 0.0 if bucket is None else bucket.reserve()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+def _take(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    requested: float,
+) -> Tuple[float, float]:
+    # refill for the time that has passed, then take (possibly
+    # going into debt, which later callers wait out):
+    tokens = min(capacity, tokens + max(now - updated, 0.0) * rate)
+    return tokens - requested, now
@@ -0,0 +1,133 @@
+from datetime import datetime
+from dataclasses import dataclass, fields
+from typing import Optional, Dict, Tuple
+
+from ._enums import Quality, Result, SubResult, FileStatus
+from ._formats import EmailVerification, FileInfo, ReportEntry
+
+
+__all__ = [
+    "EmailVerificationRecord",
+    "FileInfoRecord",
+    "ReportEntryRecord",
+]
+
+
+# Compact (slotted) alternatives to the TypedDict formats, for holding
+# many results in memory: a record has no per-instance dict (or hash
+# table), so it takes a fraction of the memory of the equivalent dict.
+
+
+@dataclass(slots=True)
+class EmailVerificationRecord:
+    """
+    Email verification record, with the fields of EmailVerification.
+    """
+
+    email: str
+    quality: Quality
+    result: Result
+    resultcode: int
+    subresult: SubResult
+    free: bool
+    role: bool
+    didyoumean: str
+    credits: int
+    executiontime: int
+    error: str
+    livemode: bool
+
+    @classmethod
+    def from_dict(cls, verification: EmailVerification) -> "EmailVerificationRecord":
+        return cls(*map(verification.__getitem__, _VERIFICATION_FIELDS))
+
+    def to_dict(self) -> EmailVerification:
+        return {name: getattr(self, name) for name in _VERIFICATION_FIELDS}
+
+
+@dataclass(slots=True)
+class FileInfoRecord:
+    """
+    File-info record, with the fields of FileInfo.
+    """
+
+    file_id: int
+    file_name: str
+    status: FileStatus
+    unique_emails: int
+    updated_at: datetime
+    createdate: datetime
+    percent: int
+    total_rows: int
+    verified: int
+    unverified: int
+    ok: int
+    catch_all: int
+    disposable: int
+    invalid: int
+    unknown: int
+    reverify: int
+    credit: int
+    estimated_time_sec: int
+    error: str
+
+    @classmethod
+    def from_dict(cls, info: FileInfo) -> "FileInfoRecord":
+        return cls(*map(info.__getitem__, _FILE_INFO_FIELDS))
+
+    def to_dict(self) -> FileInfo:
+        return {name: getattr(self, name) for name in _FILE_INFO_FIELDS}
+
+
+@dataclass(slots=True)
+class ReportEntryRecord:
+    """
+    Record for a single line in a csv-report. Columns of the uploaded file (other than the email address) are
+    kept as extra_columns and extra_values, where the columns are shared by all records of a report.
+    """
+
+    email: str
+    quality: Quality
+    result: Result
+    free: bool
+    role: bool
+    subresult: Optional[SubResult | str] = None
+    didyoumean: Optional[str] = None
+    extra_columns: Tuple[str, ...] = ()
+    extra_values: Tuple[str, ...] = ()
+
+    @property
+    def extra(self) -> Dict[str, str]:
+        return dict(zip(self.extra_columns, self.extra_values))
+
+    @classmethod
+    def from_dict(cls, entry: ReportEntry) -> "ReportEntryRecord":
+        extra_columns = tuple(key for key in entry if key not in REPORT_ENTRY_COLUMNS)
+        return cls(
+            *(entry.get(name) for name in REPORT_ENTRY_COLUMNS),
+            extra_columns=extra_columns,
+            extra_values=tuple(entry[key] for key in extra_columns),
+        )
+
+    def to_dict(self) -> ReportEntry:
+        entry = {
+            name: val
+            for name in REPORT_ENTRY_COLUMNS
+            if (val := getattr(self, name)) is not None
+        }
+        entry.update(zip(self.extra_columns, self.extra_values))
+        return entry
+
+
+_VERIFICATION_FIELDS: Tuple[str, ...] = tuple(
+    field.name for field in fields(EmailVerificationRecord)
+)
+_FILE_INFO_FIELDS: Tuple[str, ...] = tuple(
+    field.name for field in fields(FileInfoRecord)
+)
+# columns of a csv-report with a field of their own, in the order of the fields:
+REPORT_ENTRY_COLUMNS: Tuple[str, ...] = tuple(
+    field.name
+    for field in fields(ReportEntryRecord)
+    if not field.name.startswith("extra_")
+)
@@ -0,0 +1,214 @@
+import csv
+import itertools
+from typing import Dict, List, Iterable, Iterator, Tuple, Sequence, Optional
+
+from ._enums import Quality, Result, SubResult
+from ._formats import ReportEntry
+from ._records import ReportEntryRecord, REPORT_ENTRY_COLUMNS
+
+
+__all__ = [
+    "ReportDecoder",
+]
+
+# decoding a report is a hot loop (millions of rows), so every cell is converted with a
+# single dict lookup, rather than by constructing the enum (or lower-casing the value):
+_QUALITIES: Dict[str, Quality] = {member.value: member for member in Quality}
+_RESULTS: Dict[str, Result] = {member.value: member for member in Result}
+_SUB_RESULTS: Dict[str, SubResult] = {member.value: member for member in SubResult}
+_FLAGS: Dict[str, bool] = {
+    spelling: flag
+    for value, flag in (("yes", True), ("no", False))
+    for spelling in (value, value.upper(), value.capitalize())
+}
+
+# number of rows decoded at a time when streaming:
+_BATCH_SIZE = 1024
+
+
+# columns to convert, with their lookup tables
+# and whether unrecognised values are an error:
+_CONVERSIONS: Tuple[Tuple[str, Dict[str, object], bool], ...] = (
+    ("quality", _QUALITIES, True),
+    ("result", _RESULTS, True),
+    # the API may add sub-results before we do, so
+    # unrecognised sub-results are kept as they are:
+    ("subresult", _SUB_RESULTS, False),
+    ("free", _FLAGS, True),
+    ("role", _FLAGS, True),
+)
+
+
+def _convert_column(
+    key: str, cells: Sequence[Optional[str]], table: Dict[str, object], strict: bool
+) -> List[object]:
+    try:
+        return list(map(table.__getitem__, cells))
+
+    except KeyError:
+        return [
+            None
+            if val is None
+            else _convert_slowly(key=key, val=val, table=table, strict=strict)
+            for val in cells
+        ]
+
+
+def _convert_slowly(
+    key: str, val: str, table: Dict[str, object], strict: bool
+) -> object:
+    # only reached for values that aren't in the
+    # table as they are, e.g. in an unexpected case:
+    converted = table.get(val)
+    if converted is None:
+        converted = table.get(val.lower())
+
+    if converted is not None:
+        return converted
+
+    if strict:
+        raise ValueError(f"Unrecognised {key}: {val}")
+
+    return val
+
+
+class ReportDecoder:
+    """
+    Decoder for the rows of a csv-report. The columns to convert are resolved once, from the headings, after
+    which every row is decoded with a dict per row and a dict lookup per converted cell.
+    """
+
+    def __init__(self, headings: List[str]) -> None:
+        """
+        :param headings: Headings of the csv-report (i.e., its first row).
+        """
+        self.headings = headings
+        self._conversions = [
+            (key, table, strict)
+            for key, table, strict in _CONVERSIONS
+            if key in headings
+        ]
+
+    def decode(self, row: List[str]) -> ReportEntry:
+        """
+        Decode a single row.
+
+        :param row: Cells of the row.
+        :return: The decoded row.
+        """
+        return self.decode_many(rows=[row])[0]
+
+    def decode_many(self, rows: Iterable[List[str]]) -> List[ReportEntry]:
+        """
+        Decode rows in bulk.
+
+        :param rows: Rows to decode.
+        :return: The decoded rows.
+        """
+        headings = self.headings
+        conversions = self._conversions
+        entries = [dict(zip(headings, row)) for row in rows]
+        # convert column by column, such that the lookups per column are bound once:
+        for key, table, strict in conversions:
+            get = table.get
+            for entry in entries:
+                # rows may be shorter than the headings:
+                if key in entry:
+                    val = entry[key]
+                    converted = get(val)
+                    if converted is None:
+                        converted = _convert_slowly(
+                            key=key, val=val, table=table, strict=strict
+                        )
+
+                    entry[key] = converted
+
+        return entries
+
+    def decode_records(self, rows: Iterable[List[str]]) -> List[ReportEntryRecord]:
+        """
+        Decode rows in bulk, straight into (compact) records rather than dicts.
+
+        :param rows: Rows to decode.
+        :return: The decoded rows.
+        """
+        headings = self.headings
+        width = len(headings)
+        # pad short rows (with None, for missing), such
+        # that the rows can be transposed into columns:
+        rows = [
+            row if len(row) == width else (row + [None] * width)[:width] for row in rows
+        ]
+        if not rows:
+            return []
+
+        columns = dict(zip(headings, zip(*rows)))
+        conversions = {key: (table, strict) for key, table, strict in self._conversions}
+        values = []
+        for name in REPORT_ENTRY_COLUMNS:
+            if name not in columns:
+                values.append(itertools.repeat(None, len(rows)))
+
+            elif name in conversions:
+                table, strict = conversions[name]
+                values.append(
+                    _convert_column(
+                        key=name, cells=columns[name], table=table, strict=strict
+                    )
+                )
+
+            else:
+                values.append(columns[name])
+
+        # the extra columns are shared by all records:
+        extra_columns = tuple(
+            heading for heading in headings if heading not in REPORT_ENTRY_COLUMNS
+        )
+        if extra_columns:
+            extra_values = zip(*(columns[key] for key in extra_columns))
+
+        else:
+            extra_values = itertools.repeat((), len(rows))
+
+        return list(
+            map(
+                ReportEntryRecord,
+                *values,
+                itertools.repeat(extra_columns, len(rows)),
+                extra_values,
+            )
+        )
+
+    @classmethod
+    def iter_records(cls, lines: Iterable[str]) -> Iterator[ReportEntryRecord]:
+        """
+        Decode the rows of a csv-report into records, one batch of rows at a time.
+
+        :param lines: Lines of the csv-report, including the headings.
+        :return: Iterator over the decoded rows.
+        """
+        rows = csv.reader(lines)
+        headings = next(rows, None)
+        if headings is None:
+            return
+
+        decoder = cls(headings=headings)
+        while batch := list(itertools.islice(rows, _BATCH_SIZE)):
+            yield from decoder.decode_records(rows=batch)
+
+    @classmethod
+    def iter_report(cls, lines: Iterable[str]) -> Iterator[ReportEntry]:
+        """
+        Decode the rows of a csv-report, one batch of rows at a time.
+
+        :param lines: Lines of the csv-report, including the headings.
+        :return: Iterator over the decoded rows.
+        """
+        rows = csv.reader(lines)
+        headings = next(rows, None)
+        if headings is None:
+            return
+
+        decoder = cls(headings=headings)
+        while batch := list(itertools.islice(rows, _BATCH_SIZE)):
+            yield from decoder.decode_many(rows=batch)
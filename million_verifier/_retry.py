@@ -0,0 +1,167 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable, Iterable, TypedDict
+
+
+__all__ = [
+    "RetryPolicy",
+    "RetryEvent",
+]
+
+
+# statuses that guarantee the request was rejected before
+# being processed (so retrying can't double-spend):
+_REJECTED_STATUSES = frozenset({429})
+
+
+class RetryEvent(TypedDict):
+    """
+    Details of a request that is about to be retried.
+    """
+
+    url: str
+    attempt: int
+    delay: float
+    status_code: Optional[int]
+    error: Optional[Exception]
+
+
+class RetryPolicy:
+    """
+    Policy for retrying failed requests, using exponential backoff with (full) jitter.
+
+    Requests are flagged as idempotent (i.e., safe to repeat) by the client. Idempotent requests are retried
+    on any retryable status and on connection errors, whereas requests that aren't (e.g., verifications, which
+    spend credits, and uploads) are only retried when the request was certainly never processed: rate-limited
+    responses and failures to connect.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        on_retry: Optional[Callable[[RetryEvent], None]] = None,
+    ) -> None:
+        """
+        :param max_attempts: Maximum number of attempts per request (including the first), 1 disables retries.
+        :param backoff_factor: Base delay (in seconds), doubled for every subsequent attempt.
+        :param max_backoff: Maximum delay (in seconds) between attempts, unless the server asks for longer.
+        :param retry_statuses: HTTP statuses that are considered transient.
+        :param respect_retry_after: Whether to wait at least as long as the server's Retry-After header asks.
+        :param on_retry: Callback invoked before every retry, e.g. for logging or metrics.
+        """
+        assert (
+            max_attempts >= 1
+        ), f"max_attempts must be at least 1, but received {max_attempts}."
+        assert (
+            backoff_factor >= 0
+        ), f"backoff_factor can't be negative, but received {backoff_factor}."
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.on_retry = on_retry
+
+    def can_retry(self, attempt: int) -> bool:
+        return attempt < self.max_attempts
+
+    def is_retryable_status(self, status_code: int, idempotent: bool) -> bool:
+        if status_code not in self.retry_statuses:
+            return False
+
+        return idempotent or status_code in _REJECTED_STATUSES
+
+    @staticmethod
+    def is_retryable_error(connected: bool, idempotent: bool) -> bool:
+        # if we never connected, the request was
+        # never sent, so it's always safe to retry:
+        return idempotent or not connected
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        :param attempt: Number of the attempt that just failed (starting at 1).
+        :param retry_after: Value of the Retry-After header of the failed response, if any.
+        :return: Delay in seconds.
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        )
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, _parse_retry_after(retry_after))
+
+        return delay
+
+    def notify(
+        self,
+        url: str,
+        attempt: int,
+        delay: float,
+        status_code: Optional[int] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        if self.on_retry is not None:
+            self.on_retry(
+                RetryEvent(
+                    url=url,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=status_code,
+                    error=error,
+                )
+            )
+
+
+def connection_refused(error: BaseException) -> bool:
+    """
+    Check whether a request failed because the connection was refused, in which case the request was certainly
+    never sent. Other connection errors (e.g., a reset connection) may happen after the request was sent.
+
+    :param error: Error raised by requests or httpx.
+    :return: Whether the connection was refused.
+    """
+    # the socket's error is wrapped by the HTTP library (requests
+    # wraps urllib3's error, which wraps the socket's):
+    pending = [error]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+
+        seen.add(id(current))
+        if isinstance(current, ConnectionRefusedError):
+            return True
+
+        pending.extend(
+            [current.__cause__, current.__context__, getattr(current, "reason", None)]
+        )
+        pending.extend(arg for arg in current.args if isinstance(arg, BaseException))
+
+    return False
+
+
+def _parse_retry_after(retry_after: str) -> float:
+    # Retry-After is either a number of seconds or an HTTP-date:
+    try:
+        return max(float(retry_after), 0.0)
+
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+
+    except (TypeError, ValueError):
+        return 0.0
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
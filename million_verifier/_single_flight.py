@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from typing import Dict, Hashable, Callable, Awaitable, TypeVar, Optional, Generic
+
+
+__all__ = [
+    "SingleFlight",
+    "AsyncSingleFlight",
+]
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls from different threads: while a call for a key is in flight, other
+    callers with the same key wait for it and receive its result (or exception), rather than making their own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Call fn, unless a call with the same key is already in flight, in which case wait for that one instead.
+
+        :param key: Key identifying identical calls.
+        :param fn: Function making the call.
+        :return: Result of the (shared) call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+
+        except BaseException as error:
+            call.error = error
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent identical calls from different coroutines (on the same event loop): while a call for a
+    key is in flight, other callers with the same key await it and receive its result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn, unless a call with the same key is already in flight, in which case await that one instead.
+
+        :param key: Key identifying identical calls.
+        :param fn: Function returning the awaitable making the call.
+        :return: Result of the (shared) call.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._forget(key=key, task=task))
+
+        # shielded, such that one caller being cancelled
+        # doesn't cancel the call for everyone else:
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
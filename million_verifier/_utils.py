@@ -1,15 +1,19 @@
+import codecs
 from datetime import datetime
-from typing import TypeAlias, Dict, TypeVar, List, Optional
+from typing import TypeAlias, Dict, TypeVar, List, Optional, Iterable, Iterator
 
 __all__ = [
     "MV_SINGLE_API_URL",
     "MV_BULK_API_URL",
+    "STREAM_CHUNK_SIZE",
     "Json",
     "JsonDict",
     "stringify",
     "datetime_to_str",
     "str_to_datetime",
     "bool_to_int",
+    "normalise_email",
+    "iter_lines",
 ]
 
 T = TypeVar("T")
@@ -17,6 +21,8 @@ T = TypeVar("T")
 MV_SINGLE_API_URL = "https://api.millionverifier.com"
 MV_BULK_API_URL = "https://bulkapi.millionverifier.com"
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 Json: TypeAlias = dict | list | str | int | bool
 JsonDict: TypeAlias = Dict[str, Json]
@@ -42,11 +48,18 @@ def datetime_to_str(dt: Optional[datetime]) -> Optional[str]:
     return dt.strftime(_DATETIME_FORMAT)
 
 
-def str_to_datetime(s: Optional[str]) -> Optional[datetime]:
-    if s is None:
-        return
+def str_to_datetime(s: Optional[str | datetime]) -> Optional[datetime]:
+    # the value may have been converted while decoding the response already:
+    if s is None or isinstance(s, datetime):
+        return s
 
-    return datetime.strptime(s, _DATETIME_FORMAT)
+    try:
+        # much faster than strptime, and parses the
+        # API's format as long as it's zero-padded:
+        return datetime.fromisoformat(s)
+
+    except ValueError:
+        return datetime.strptime(s, _DATETIME_FORMAT)
 
 
 def bool_to_int(b: Optional[bool]) -> Optional[int]:
@@ -54,3 +67,26 @@ def bool_to_int(b: Optional[bool]) -> Optional[int]:
         return
 
     return int(b)
+
+
+def normalise_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Decode a stream of byte-chunks into lines, keeping line endings (as expected by csv.reader).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    buffer = ""
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        # the last piece may not be a complete line yet,
+        # so hold it back until the next chunk arrives:
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
@@ -0,0 +1 @@
+from ._mock_server import *
@@ -0,0 +1,44 @@
+from typing import Iterator, Callable, Any
+
+import pytest
+
+from million_verifier import MillionVerifierClient, RetryPolicy
+from million_verifier.testing import MockMillionVerifierServer
+
+
+@pytest.fixture
+def server(request: pytest.FixtureRequest) -> Iterator[MockMillionVerifierServer]:
+    """
+    Mock server, whose options can be overridden by parametrising the fixture indirectly, e.g.:
+    @pytest.mark.parametrize("server", [{"credits": 5}], indirect=True)
+    """
+    options = {"api_key": "key", "rows_per_second": 100_000}
+    options.update(getattr(request, "param", {}))
+    with MockMillionVerifierServer(**options) as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(
+    server: MockMillionVerifierServer,
+) -> Callable[..., MillionVerifierClient]:
+    """
+    Factory of clients pointing at the mock server, taking the client's options (e.g., hooks or credit_budget).
+    """
+
+    def make(**options: Any) -> MillionVerifierClient:
+        options = {
+            "api_key": "key",
+            "retry_policy": RetryPolicy(backoff_factor=0),
+            **options,
+        }
+        return MillionVerifierClient(
+            single_api_url=server.url, bulk_api_url=server.url, **options
+        )
+
+    return make
+
+
+@pytest.fixture
+def client(make_client: Callable[..., MillionVerifierClient]) -> MillionVerifierClient:
+    return make_client()
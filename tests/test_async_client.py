@@ -0,0 +1,60 @@
+import asyncio
+import os
+
+from million_verifier import (
+    AsyncMillionVerifierClient,
+    EmailVerification,
+    CreditsSummary,
+    FileList,
+    FileInfo,
+)
+
+from tests.utils import assert_typed_dict
+
+
+def test_async_verify_email_address() -> None:
+    addresses = [
+        "matthew@gmail.com",
+        "mark@outlook.com",
+        "luke@hotmail.com",
+        "john@yahoo.com",
+        "howdy",
+    ]
+
+    async def verify_all() -> list:
+        async with AsyncMillionVerifierClient(api_key="API_KEY_FOR_TEST") as client:
+            return await asyncio.gather(
+                *[client.verify_email_address(email=address) for address in addresses]
+            )
+
+    verifications = asyncio.run(verify_all())
+    for address, verification in zip(addresses, verifications):
+        assert_typed_dict(
+            obj=verification,
+            desired_type=EmailVerification,
+        )
+        assert verification["email"] == address
+
+
+def test_async_check_credits_and_list_files() -> None:
+    async def fetch() -> tuple:
+        async with AsyncMillionVerifierClient(
+            api_key=os.getenv("MILLION_VERIFIER_API_KEY")
+        ) as client:
+            return await client.check_credits(), await client.list_files(limit=10)
+
+    mv_credits, files = asyncio.run(fetch())
+    assert_typed_dict(
+        obj=mv_credits,
+        desired_type=CreditsSummary,
+    )
+    assert_typed_dict(
+        obj=files,
+        desired_type=FileList,
+        check_types=False,
+    )
+    for file in files["files"]:
+        assert_typed_dict(
+            obj=file,
+            desired_type=FileInfo,
+        )
@@ -0,0 +1,321 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Iterator, Tuple
+
+import pytest
+
+from million_verifier import (
+    FileWatcher,
+    BulkPoller,
+    BulkJob,
+    ShardedBulkJob,
+    BulkJobFailed,
+    FileStatus,
+    InvalidAPIKey,
+    APIException,
+    MillionVerifierClient,
+    RetryPolicy,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import FILE_LIST_PATH, UPLOAD_PATH
+from million_verifier._bulk import iter_shards
+
+
+class _FakeClient:
+    """
+    Stands in for the client, serving each file's statuses in turn (repeating the last one).
+    """
+
+    def __init__(self, statuses: Dict[int, List[FileStatus]]) -> None:
+        self._statuses = statuses
+        self._lock = threading.Lock()
+        self.calls: List[List[int]] = []
+
+    def _list_files(self, file_id: List[int], limit: int) -> dict:
+        files = []
+        with self._lock:
+            self.calls.append(file_id)
+            for single_id in file_id:
+                statuses = self._statuses.get(single_id)
+                if statuses:
+                    status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+                    files.append(_file_info(file_id=single_id, status=status))
+
+        return {"files": files[:limit], "total": len(files)}
+
+    def iter_report(self, file_id: int, **_) -> Iterator[dict]:
+        yield from ({"email": f"{file_id}-{row}@gmail.com"} for row in range(2))
+
+
+def _file_info(
+    file_id: int, status: FileStatus, percent: int = 0, estimated_time_sec: int = 0
+) -> dict:
+    return {
+        "file_id": file_id,
+        "status": status,
+        "percent": percent,
+        "estimated_time_sec": estimated_time_sec,
+        "error": "",
+    }
+
+
+def _poller(client: _FakeClient) -> BulkPoller:
+    return BulkPoller(client=client, min_interval=0.01, max_interval=0.05)
+
+
+def test_wait_for_many_jobs() -> None:
+    client = _FakeClient(
+        statuses={
+            1: [
+                FileStatus.IN_QUEUE_TO_START,
+                FileStatus.IN_PROGRESS,
+                FileStatus.FINISHED,
+            ],
+            2: [FileStatus.IN_PROGRESS, FileStatus.FINISHED],
+        }
+    )
+    poller = _poller(client=client)
+    jobs = [
+        poller.track(
+            info=_file_info(file_id=file_id, status=FileStatus.IN_QUEUE_TO_START)
+        )
+        for file_id in (1, 2)
+    ]
+    for job in jobs:
+        assert job.wait(timeout=5)["status"] == FileStatus.FINISHED
+        assert job.done
+
+    # finished jobs are no longer polled:
+    calls = len(client.calls)
+    threading.Event().wait(0.1)
+    assert len(client.calls) == calls
+
+
+def test_finished_job_is_not_polled() -> None:
+    client = _FakeClient(statuses={})
+    job = _poller(client=client).track(
+        info=_file_info(file_id=1, status=FileStatus.FINISHED)
+    )
+    assert job.wait(timeout=0)["status"] == FileStatus.FINISHED
+    assert client.calls == []
+
+
+@pytest.mark.parametrize("status", [FileStatus.ERROR, FileStatus.CANCELED])
+def test_failed_job(status: FileStatus) -> None:
+    client = _FakeClient(statuses={1: [FileStatus.IN_PROGRESS, status]})
+    job = _poller(client=client).track(
+        info=_file_info(file_id=1, status=FileStatus.IN_PROGRESS)
+    )
+    with pytest.raises(BulkJobFailed) as error:
+        job.wait(timeout=5)
+
+    assert error.value.file_info["status"] == status
+
+
+def test_paused_job() -> None:
+    client = _FakeClient(statuses={1: [FileStatus.PAUSED]})
+    job = _poller(client=client).track(
+        info=_file_info(file_id=1, status=FileStatus.IN_PROGRESS)
+    )
+    with pytest.raises(TimeoutError):
+        job.wait(timeout=0.1)
+
+    with pytest.raises(BulkJobFailed):
+        job.wait(timeout=5, fail_on_pause=True)
+
+
+@contextmanager
+def _poll_server(error: str) -> Iterator[Tuple[MockMillionVerifierServer, BulkJob]]:
+    with MockMillionVerifierServer(api_key="key", rows_per_second=1000) as server:
+        # without the client's own retries, every error reaches the poller:
+        client = MillionVerifierClient(
+            api_key="key",
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        info = server.add_file(contents="\n".join(["ok@example.com"] * 100))
+        server.inject_error(error=error, times=2, path=FILE_LIST_PATH)
+        yield server, _poller(client=client).track(
+            info=client.get_file_info(file_id=info["file_id"])
+        )
+
+
+def test_transient_poll_errors() -> None:
+    with _poll_server(error="server_error") as (server, job):
+        # the job stays pending, rather than failing on the first error:
+        assert job.wait(timeout=5)["status"] == FileStatus.FINISHED
+        assert server.requests[FILE_LIST_PATH] >= 3
+
+
+def test_permanent_poll_errors() -> None:
+    with _poll_server(error="apikey_not_found") as (_, job):
+        with pytest.raises(InvalidAPIKey):
+            job.wait(timeout=5)
+
+        assert job.done
+
+
+def test_stop_finished_job(client: MillionVerifierClient) -> None:
+    info = client.upload_emails(emails=[f"{row}@example.com" for row in range(10)])
+    job = client._get_bulk_poller().track(info=info)
+    assert job.wait(timeout=5)["status"] == FileStatus.FINISHED
+    job.stop()
+    # the job is no longer polled, so it can't fail on a late refresh:
+    job._update(error=RuntimeError("late refresh"))
+    assert job.done
+    assert job.wait(timeout=0)["status"] == FileStatus.FINISHED
+    assert len(list(job.iter_report(timeout=0))) == 10
+
+
+def test_poll_interval() -> None:
+    poller = BulkPoller(
+        client=_FakeClient(statuses={}), min_interval=1, max_interval=60
+    )
+    job = BulkJob(
+        client=poller._client,
+        info=_file_info(file_id=1, status=FileStatus.IN_PROGRESS),
+        poller=poller,
+    )
+    job._update(
+        info=_file_info(file_id=1, status=FileStatus.IN_PROGRESS, estimated_time_sec=40)
+    )
+    assert job._next_poll_interval(min_interval=1, max_interval=60) == 20
+    job._update(
+        info=_file_info(
+            file_id=1, status=FileStatus.IN_PROGRESS, estimated_time_sec=1000
+        )
+    )
+    assert job._next_poll_interval(min_interval=1, max_interval=60) == 60
+    job._update(
+        info=_file_info(file_id=1, status=FileStatus.PAUSED, estimated_time_sec=4)
+    )
+    assert job._next_poll_interval(min_interval=1, max_interval=60) == 60
+    job._update(info=_file_info(file_id=1, status=FileStatus.IN_PROGRESS))
+    assert job._next_poll_interval(min_interval=1, max_interval=60) == 1
+
+
+def test_watcher_batches_requests() -> None:
+    client = _FakeClient(
+        statuses={file_id: [FileStatus.IN_PROGRESS] for file_id in range(120)}
+    )
+    watcher = FileWatcher(client=client, file_ids=range(120))
+    changes = watcher.refresh()
+    assert [len(chunk) for chunk in client.calls] == [50, 50, 20]
+    assert [change["file_id"] for change in changes] == list(range(120))
+    assert all(change["previous"] is None for change in changes)
+    # nothing changed, so nothing is emitted:
+    assert watcher.refresh() == []
+
+
+def test_watcher_emits_changes() -> None:
+    client = _FakeClient(
+        statuses={
+            1: [FileStatus.IN_PROGRESS, FileStatus.FINISHED],
+            2: [FileStatus.IN_PROGRESS],
+        }
+    )
+    emitted = []
+    watcher = FileWatcher(client=client, file_ids=[1, 2], on_change=emitted.append)
+    watcher.refresh()
+    del client._statuses[2]
+    changes = watcher.refresh()
+    assert emitted[2:] == changes
+    assert [
+        (
+            change["previous"]["status"],
+            change["current"] and change["current"]["status"],
+        )
+        for change in changes
+    ] == [(FileStatus.IN_PROGRESS, FileStatus.FINISHED), (FileStatus.IN_PROGRESS, None)]
+    # the file that no longer exists is no longer watched:
+    assert watcher.file_ids == [1]
+
+
+def test_sharded_job_merges_reports_in_order() -> None:
+    client = _FakeClient(
+        statuses={
+            1: [FileStatus.IN_PROGRESS, FileStatus.IN_PROGRESS, FileStatus.FINISHED],
+            2: [FileStatus.FINISHED],
+        }
+    )
+    poller = _poller(client=client)
+    job = ShardedBulkJob(
+        jobs=[
+            poller.track(
+                info=_file_info(file_id=file_id, status=FileStatus.IN_PROGRESS)
+            )
+            for file_id in (1, 2)
+        ]
+    )
+    assert [entry["email"] for entry in job.iter_report(timeout=5)] == [
+        "1-0@gmail.com",
+        "1-1@gmail.com",
+        "2-0@gmail.com",
+        "2-1@gmail.com",
+    ]
+    assert job.done
+
+
+def test_sharded_job_skips_failed_shards() -> None:
+    client = _FakeClient(statuses={1: [FileStatus.FINISHED], 2: [FileStatus.ERROR]})
+    poller = _poller(client=client)
+    upload_error = APIException("Upload failed.")
+    job = ShardedBulkJob(
+        jobs=[
+            upload_error,
+            *[
+                poller.track(
+                    info=_file_info(file_id=file_id, status=FileStatus.IN_PROGRESS)
+                )
+                for file_id in (1, 2)
+            ],
+        ]
+    )
+    with pytest.raises(APIException):
+        list(job.iter_report(timeout=5))
+
+    assert [entry["email"] for entry in job.iter_report(timeout=5, partial=True)] == [
+        "1-0@gmail.com",
+        "1-1@gmail.com",
+    ]
+    assert [info["file_id"] for info in job.wait(timeout=5, partial=True)] == [1]
+    failed = job.failed_shards
+    assert list(failed) == [1, 3]
+    assert failed[1] is upload_error
+    assert isinstance(failed[3], BulkJobFailed)
+
+
+def test_sharded_upload_keeps_uploaded_shards(
+    server: MockMillionVerifierServer, client: MillionVerifierClient
+) -> None:
+    server.inject_error(error="server_error", times=1, path=UPLOAD_PATH)
+    emails = [f"{row}@example.com" for row in range(6)]
+    job = client.verify_file_sharded(emails, shard_rows=2, max_workers=1)
+    assert list(job.failed_shards) == [1]
+    assert len(job.jobs) == 2
+    assert [entry["email"] for entry in job.iter_report(timeout=5, partial=True)] == (
+        emails[2:]
+    )
+    # without a single uploaded shard, there is no job:
+    server.inject_error(error="server_error", times=1, path=UPLOAD_PATH)
+    with pytest.raises(APIException):
+        client.verify_file_sharded(emails[:2], shard_rows=2)
+
+
+def test_iter_shards() -> None:
+    lines = [
+        "email",
+        "a@gmail.com",
+        "b@gmail.com",
+        " A@Gmail.com",
+        "c@gmail.com",
+        "d@gmail.com",
+    ]
+    assert list(iter_shards(lines, shard_rows=2, has_header=True)) == [
+        b"email\na@gmail.com\nb@gmail.com\n",
+        b"email\nc@gmail.com\nd@gmail.com\n",
+    ]
+    shards = list(iter_shards(lines, shard_bytes=30))
+    assert all(len(shard) <= 30 for shard in shards)
+    assert b"".join(shards).count(b"\n") == 5
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from million_verifier import (
+    MemoryVerificationCache,
+    SQLiteVerificationCache,
+    VerificationCache,
+    EmailVerification,
+    Quality,
+    Result,
+    SubResult,
+)
+
+
+def _verification(email: str, result: Result) -> EmailVerification:
+    return EmailVerification(
+        email=email,
+        quality=Quality.GOOD,
+        result=result,
+        resultcode=1,
+        subresult=SubResult.OK,
+        free=True,
+        role=False,
+        didyoumean="",
+        credits=100,
+        executiontime=1,
+        error="",
+        livemode=True,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache_factory(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryVerificationCache(**kwargs)
+
+        return SQLiteVerificationCache(path=str(tmp_path / "cache.sqlite"), **kwargs)
+
+    return factory
+
+
+def test_cache_hit_and_miss(cache_factory) -> None:
+    cache = cache_factory()
+    assert cache.get(email="matthew@gmail.com") is None
+    cache.set(
+        email="matthew@gmail.com",
+        verification=_verification("matthew@gmail.com", Result.OK),
+    )
+    # keyed on the normalised address:
+    cached = cache.get(email=" Matthew@Gmail.com")
+    assert set(cached) == set(EmailVerification.__annotations__)
+    assert cached["email"] == " Matthew@Gmail.com"
+    assert cached["result"] == Result.OK
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_ttl_per_result(cache_factory) -> None:
+    cache = cache_factory(ttl={Result.OK: 60, Result.UNKNOWN: 0.05})
+    cache.set(
+        email="ok@gmail.com", verification=_verification("ok@gmail.com", Result.OK)
+    )
+    cache.set(
+        email="unknown@gmail.com",
+        verification=_verification("unknown@gmail.com", Result.UNKNOWN),
+    )
+    # not in the mapping, so not cached:
+    cache.set(
+        email="invalid@gmail.com",
+        verification=_verification("invalid@gmail.com", Result.INVALID),
+    )
+    assert cache.get(email="unknown@gmail.com") is not None
+    assert cache.get(email="invalid@gmail.com") is None
+    time.sleep(0.1)
+    assert cache.get(email="unknown@gmail.com") is None
+    assert cache.get(email="ok@gmail.com") is not None
+
+
+def test_memory_cache_lru_eviction() -> None:
+    cache = MemoryVerificationCache(max_size=2)
+    for email in ("a@gmail.com", "b@gmail.com"):
+        cache.set(email=email, verification=_verification(email, Result.OK))
+
+    # touch a, such that b is the least recently used:
+    assert cache.get(email="a@gmail.com") is not None
+    cache.set(email="c@gmail.com", verification=_verification("c@gmail.com", Result.OK))
+    assert cache.get(email="b@gmail.com") is None
+    assert cache.get(email="a@gmail.com") is not None
+    assert cache.stats()["size"] == 2
+
+
+def test_cache_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        VerificationCache()
+
+    class PartialCache(VerificationCache):
+        def clear(self) -> None:
+            pass
+
+    # every storage method needs implementing:
+    with pytest.raises(TypeError):
+        PartialCache()
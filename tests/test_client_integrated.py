@@ -67,3 +67,20 @@ def test_actions() -> None:
         desired_type=ActionResponse,
     )
     assert delete_response["result"] == "ok"
+
+
+def test_upload_emails() -> None:
+    emails = (f"test-{index}@gmail.com" for index in range(10))
+    upload_response = CLIENT.upload_emails(
+        emails=emails, file_name="generated-emails.txt"
+    )
+    assert_typed_dict(
+        obj=upload_response,
+        desired_type=FileInfo,
+    )
+    assert upload_response["file_name"] == "generated-emails.txt"
+    # clean up:
+    time.sleep(3)
+    CLIENT.stop_a_file_in_progress(file_id=upload_response["file_id"])
+    time.sleep(3)
+    CLIENT.delete_file(file_id=upload_response["file_id"])
@@ -0,0 +1,128 @@
+import pytest
+
+from million_verifier import (
+    MillionVerifierClient,
+    ReportColumns,
+    ResultFilter,
+    Quality,
+    SubResult,
+)
+from million_verifier.testing import MockMillionVerifierServer
+
+
+LINES = [
+    "email,quality,result,subresult,free,role\n",
+    "a@gmail.com,good,ok,ok,yes,no\n",
+    "b@example.com,bad,invalid,no_mailbox,no,yes\n",
+    "c@example.com,risky,unknown,brand_new_sub_result,No,No\n",
+    "d@example.com\n",
+]
+
+
+def test_report_columns() -> None:
+    columns = ReportColumns.from_lines(lines=LINES[:-1])
+    assert len(columns) == 3
+    # unknown sub-results extend the categories:
+    assert columns.categories["subresult"][-1] == "brand_new_sub_result"
+    assert columns.categories["quality"] == [member.value for member in Quality]
+
+
+def test_report_columns_unrecognised_value() -> None:
+    with pytest.raises(ValueError):
+        ReportColumns.from_lines(lines=[LINES[0], "a@gmail.com,great,ok,ok,yes,no\n"])
+
+
+def test_report_columns_many_subresults() -> None:
+    # more distinct sub-results than an int8 code can refer to:
+    lines = [LINES[0]] + [
+        f"{index}@example.com,risky,unknown,sub_result_{index},no,no\n"
+        for index in range(300)
+    ]
+    columns = ReportColumns.from_lines(lines=lines)
+    assert len(columns) == 300
+    assert columns.categories["subresult"][-300:] == [
+        f"sub_result_{index}" for index in range(300)
+    ]
+    pytest.importorskip("pandas")
+    assert columns.to_pandas()["subresult"].tolist() == [
+        f"sub_result_{index}" for index in range(300)
+    ]
+
+
+def test_to_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    arrays = ReportColumns.from_lines(lines=LINES).to_numpy()
+    assert arrays["email"].tolist() == [
+        "a@gmail.com",
+        "b@example.com",
+        "c@example.com",
+        "d@example.com",
+    ]
+    assert arrays["quality"].dtype == np.int16
+    assert [Quality.all()[code] for code in arrays["quality"][:3]] == [
+        Quality.GOOD,
+        Quality.BAD,
+        Quality.RISKY,
+    ]
+    # missing values are coded as -1:
+    assert arrays["quality"][3] == -1
+    assert arrays["free"].dtype == bool
+    # missing flags are masked, rather than "no":
+    assert arrays["free"].tolist() == [True, False, False, None]
+
+
+def test_to_arrow() -> None:
+    pytest.importorskip("pyarrow")
+    table = ReportColumns.from_lines(lines=LINES).to_arrow()
+    assert table.column_names == [
+        "email",
+        "quality",
+        "result",
+        "subresult",
+        "free",
+        "role",
+    ]
+    assert table.column("email").to_pylist() == [
+        "a@gmail.com",
+        "b@example.com",
+        "c@example.com",
+        "d@example.com",
+    ]
+    assert table.column("subresult").to_pylist() == [
+        SubResult.OK,
+        SubResult.NO_MAILBOX,
+        "brand_new_sub_result",
+        None,
+    ]
+    assert table.column("role").to_pylist() == [False, True, False, None]
+
+
+def test_to_pandas() -> None:
+    pytest.importorskip("pandas")
+    frame = ReportColumns.from_lines(lines=LINES).to_pandas()
+    assert frame["quality"].tolist()[:3] == ["good", "bad", "risky"]
+    assert frame["quality"].isna().tolist() == [False, False, False, True]
+    assert frame["free"].dtype == "boolean"
+    assert frame["free"].isna().tolist() == [False, False, False, True]
+    assert frame["free"].tolist()[:3] == [True, False, False]
+
+
+def test_get_report_columns(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    pytest.importorskip("pandas")
+    info = server.add_file(
+        contents="email,name\n"
+        "ok@example.com,Jane\n"
+        "invalid@example.com,John\n"
+        "info@gmail.com,Info\n"
+    )
+    client.bulk_job(file_id=info["file_id"]).wait(timeout=10)
+    for result_filter in (ResultFilter.ALL, ResultFilter.OK):
+        columns = client.get_report_columns(
+            file_id=info["file_id"], result_filter=result_filter
+        )
+        report = client.get_report(file_id=info["file_id"], result_filter=result_filter)
+        assert columns.headings == list(report[0])
+        # the columns hold the same rows as the report:
+        assert columns.to_pandas().to_dict(orient="records") == report
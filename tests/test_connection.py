@@ -0,0 +1,86 @@
+import asyncio
+from typing import Callable
+
+import pytest
+import requests
+
+from million_verifier import (
+    MillionVerifierClient,
+    AsyncMillionVerifierClient,
+    ConnectionConfig,
+    RetryPolicy,
+)
+from million_verifier.testing import MockMillionVerifierServer
+
+
+# a slow server, for timeouts and for warm-up requests to overlap:
+with_latency = pytest.mark.parametrize("server", [{"latency": 0.2}], indirect=True)
+Client = Callable[..., MillionVerifierClient]
+
+
+def opened(client: MillionVerifierClient, server: MockMillionVerifierServer) -> int:
+    pools = client._session.get_adapter(server.url).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+
+def test_timeouts() -> None:
+    config = ConnectionConfig(connect_timeout=5, read_timeout=30)
+    assert config.timeout() == (5, 30)
+    # verifications may need longer than the read timeout, but never shorter:
+    assert config.timeout(min_read_timeout=62) == (5, 62)
+    assert config.timeout(min_read_timeout=10) == (5, 30)
+    assert ConnectionConfig(read_timeout=None).timeout(min_read_timeout=62)[1] is None
+
+
+@with_latency
+def test_pool_sizing(server: MockMillionVerifierServer, make_client: Client) -> None:
+    client = make_client(
+        connection_config=ConnectionConfig(pool_maxsize=3, pool_block=True)
+    )
+    adapter = client._session.get_adapter(server.url)
+    assert adapter._pool_maxsize == 3 and adapter._pool_block
+
+
+@with_latency
+def test_read_timeout(server: MockMillionVerifierServer, make_client: Client) -> None:
+    client = make_client(
+        retry_policy=RetryPolicy(max_attempts=1),
+        connection_config=ConnectionConfig(read_timeout=0.05),
+    )
+    with pytest.raises(requests.ReadTimeout):
+        client.check_credits()
+
+    # verifications wait at least as long as the verification timeout:
+    assert client.verify_email_address(email="ok@example.com", timeout=2)["result"]
+
+
+@with_latency
+def test_warm_up(server: MockMillionVerifierServer, make_client: Client) -> None:
+    client = make_client(
+        connection_config=ConnectionConfig(pool_maxsize=4),
+    )
+    with pytest.raises(AssertionError):
+        client.warm_up(connections=0)
+
+    # both API URLs point at the server, so that's 2 connections per warm-up:
+    client.warm_up(connections=2)
+    assert opened(client=client, server=server) == 4
+    client.check_credits()
+    assert opened(client=client, server=server) == 4
+
+
+@with_latency
+def test_async_warm_up(server: MockMillionVerifierServer) -> None:
+    pytest.importorskip("httpx")
+
+    async def warm_up() -> None:
+        async with AsyncMillionVerifierClient(
+            api_key="key", single_api_url=server.url, bulk_api_url=server.url
+        ) as client:
+            with pytest.raises(AssertionError):
+                await client.warm_up(connections=0)
+
+            await client.warm_up(connections=2)
+            assert len(client._session._transport._pool.connections) == 4
+
+    asyncio.run(warm_up())
@@ -0,0 +1,166 @@
+import asyncio
+from typing import Callable
+
+import pytest
+
+from million_verifier import (
+    MillionVerifierClient,
+    AsyncMillionVerifierClient,
+    CreditBudget,
+    CreditsSummary,
+    FileStatus,
+    InsufficientCredits,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import VERIFY_PATH, CREDITS_PATH, UPLOAD_PATH
+
+
+# a server with few credits, to run out of:
+with_few_credits = pytest.mark.parametrize(
+    "server", [{"credits": 5, "bulk_credits": 10}], indirect=True
+)
+
+
+def test_reserve_and_release() -> None:
+    budget = CreditBudget(minimum=2)
+    assert budget.stale and budget.credits is None
+    # an unseeded budget leaves it to the API:
+    budget.reserve(credits=100)
+    budget.release(credits=100)
+    budget.update(
+        summary=CreditsSummary(credits=5, bulk_credits=0, renewing_credits=0, plan=0)
+    )
+    assert not budget.stale
+    assert budget.credits == 3
+    budget.reserve(credits=3)
+    with pytest.raises(InsufficientCredits):
+        budget.reserve()
+
+    with pytest.raises(InsufficientCredits):
+        budget.reserve(bulk=True)
+
+    budget.release(credits=3)
+    budget.observe_verification(verification={"credits": 4})
+    # out of order responses can't raise the count:
+    budget.observe_verification(verification={"credits": 5})
+    assert budget.credits == 2
+
+
+def test_track_files() -> None:
+    budget = CreditBudget()
+    budget.update(
+        summary=CreditsSummary(credits=0, bulk_credits=100, renewing_credits=0, plan=0)
+    )
+    budget.track_file(
+        file_info={"file_id": 1, "credit": 10, "status": FileStatus.IN_PROGRESS}
+    )
+    budget.observe_file(
+        file_info={"file_id": 1, "credit": 30, "status": FileStatus.FINISHED}
+    )
+    budget.observe_file(
+        file_info={"file_id": 1, "credit": 30, "status": FileStatus.FINISHED}
+    )
+    # files that weren't uploaded since the budget was seeded are already accounted for:
+    budget.observe_file(
+        file_info={"file_id": 2, "credit": 50, "status": FileStatus.FINISHED}
+    )
+    assert budget.bulk_credits == 70
+
+
+@with_few_credits
+def test_refreshes_lazily(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    budget = CreditBudget()
+    client = make_client(credit_budget=budget)
+    for index in range(3):
+        client.verify_email_address(email=f"ok.{index}@example.com")
+
+    assert server.requests[CREDITS_PATH] == 1
+    assert budget.credits == server.credits == 2
+
+
+@with_few_credits
+@pytest.mark.parametrize("max_concurrency", [1, 2, 10])
+def test_batch_stops_early(
+    server: MockMillionVerifierServer,
+    make_client: Callable[..., MillionVerifierClient],
+    max_concurrency: int,
+) -> None:
+    client = make_client(credit_budget=CreditBudget(minimum=1))
+    results = []
+    with pytest.raises(InsufficientCredits):
+        for result in client.verify_email_addresses(
+            emails=[f"ok.{index}@example.com" for index in range(20)],
+            max_concurrency=max_concurrency,
+        ):
+            results.append(result)
+
+    # credits are reserved before submitting, so the batch stops at the
+    # minimum whatever the concurrency, without a verification failing:
+    assert all(result["verification"] is not None for result in results)
+    assert len(results) == server.requests[VERIFY_PATH] == 4
+    assert server.credits == 1
+
+
+@with_few_credits
+def test_api_insufficient_credits(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    budget = CreditBudget()
+    client = make_client(credit_budget=budget)
+    client.check_credits()
+    # another user of the API key spends the credits:
+    server.credits = 0
+    with pytest.raises(InsufficientCredits):
+        client.verify_email_address(email="ok@example.com")
+
+    assert budget.credits == 0
+    with pytest.raises(InsufficientCredits):
+        client.verify_email_address(email="ok@example.com")
+
+    assert server.requests[VERIFY_PATH] == 1
+
+
+@with_few_credits
+def test_bulk_credits(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    budget = CreditBudget()
+    client = make_client(credit_budget=budget)
+    client.upload_emails(emails=[f"ok.{index}@example.com" for index in range(10)])
+    assert budget.bulk_credits == server.bulk_credits == 0
+    with pytest.raises(InsufficientCredits):
+        client.upload_emails(emails=["ok@example.com"])
+
+    assert server.requests[UPLOAD_PATH] == 1
+
+
+@with_few_credits
+@pytest.mark.parametrize("max_concurrency", [1, 3, 10])
+def test_async_batch_stops_early(
+    server: MockMillionVerifierServer, max_concurrency: int
+) -> None:
+    pytest.importorskip("httpx")
+
+    async def verify() -> list:
+        results = []
+        async with AsyncMillionVerifierClient(
+            api_key="key",
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+            credit_budget=CreditBudget(),
+        ) as client:
+            with pytest.raises(InsufficientCredits):
+                async for result in client.verify_email_addresses(
+                    emails=[f"ok.{index}@example.com" for index in range(20)],
+                    max_concurrency=max_concurrency,
+                ):
+                    results.append(result)
+
+        return results
+
+    results = asyncio.run(verify())
+    assert all(result["verification"] is not None for result in results)
+    assert len(results) == server.requests[VERIFY_PATH] == 5
+    assert server.credits == 0
@@ -0,0 +1,27 @@
+import pytest
+
+from million_verifier import FileStatus, Quality, Result, SubResult
+
+
+@pytest.mark.parametrize("cls", [FileStatus, Quality, Result, SubResult])
+def test_members_behave_like_their_values(cls) -> None:
+    for member in cls:
+        assert cls.contains(member)
+        assert cls.contains(member.value)
+        assert cls.from_value(member.value) is member
+        assert cls.from_value(member) is member
+        assert member == member.value and member.value == member
+        assert hash(member) == hash(member.value)
+        assert str(member) == member.value
+
+
+def test_unknown_values() -> None:
+    assert not FileStatus.contains("done")
+    assert not FileStatus.contains(None)
+    # members of other enums are compared by value:
+    assert not Result.contains(Quality.GOOD)
+    assert Result.contains(SubResult.OK)
+    assert Quality.GOOD != "bad"
+    assert Quality.GOOD != 1
+    with pytest.raises(ValueError):
+        Quality.from_value("great")
@@ -0,0 +1,114 @@
+import time
+from typing import Callable, List, Optional
+
+import pytest
+
+from million_verifier import MillionVerifierClient, ClientHooks, RequestFinished
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import FILE_LIST_PATH
+
+
+@pytest.fixture
+def file_ids(server: MockMillionVerifierServer) -> List[int]:
+    file_ids = [
+        server.add_file(contents=f"{index}@example.com")["file_id"]
+        for index in range(120)
+    ]
+    # newest first, as the API lists them:
+    return file_ids[::-1]
+
+
+def _ids(files: List[dict]) -> List[int]:
+    return [file["file_id"] for file in files]
+
+
+@pytest.mark.parametrize(
+    "offset, limit",
+    [(0, None), (7, None), (0, 73), (13, 60), (100, None), (0, 0), (130, None)],
+)
+def test_list_files_concurrently(
+    client: MillionVerifierClient,
+    file_ids: List[int],
+    offset: int,
+    limit: Optional[int],
+) -> None:
+    serial = client.list_files(offset=offset, limit=limit)
+    concurrent = client.list_files(offset=offset, limit=limit, max_workers=8)
+    assert _ids(concurrent["files"]) == _ids(serial["files"])
+    assert _ids(concurrent["files"]) == file_ids[offset:][:limit]
+    assert concurrent["total"] == serial["total"] == len(file_ids)
+
+
+class _UploadAfterFirstPage(ClientHooks):
+    """
+    Adds a file once the first page is listed, which shifts the files on the pages that follow.
+    """
+
+    def __init__(self, server: MockMillionVerifierServer) -> None:
+        self.server = server
+        self.added = False
+
+    def request_finished(self, event: RequestFinished) -> None:
+        if event["url"].endswith(FILE_LIST_PATH) and not self.added:
+            self.added = True
+            self.server.add_file(contents="new@example.com")
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_list_files_skips_moved_files(
+    server: MockMillionVerifierServer,
+    make_client: Callable[..., MillionVerifierClient],
+    file_ids: List[int],
+    max_workers: int,
+) -> None:
+    client = make_client(hooks=_UploadAfterFirstPage(server=server))
+    files = client.list_files(max_workers=max_workers)["files"]
+    # the last file of the first page moves to the second page,
+    # but is listed once, and the last file is still picked up:
+    assert _ids(files) == file_ids
+
+
+@pytest.mark.parametrize(
+    "offset, limit",
+    [(0, None), (7, None), (0, 73), (13, 60), (100, None), (0, 0), (130, None)],
+)
+def test_iter_files(
+    client: MillionVerifierClient,
+    file_ids: List[int],
+    offset: int,
+    limit: Optional[int],
+) -> None:
+    assert _ids(list(client.iter_files(offset=offset, limit=limit))) == _ids(
+        client.list_files(offset=offset, limit=limit)["files"]
+    )
+
+
+def test_iter_files_prefetches(
+    server: MockMillionVerifierServer,
+    client: MillionVerifierClient,
+    file_ids: List[int],
+) -> None:
+    files = client.iter_files(limit=73)
+    assert next(files)["file_id"] == file_ids[0]
+    # the next page is fetched while the first is consumed:
+    deadline = time.monotonic() + 5
+    while server.requests[FILE_LIST_PATH] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert server.requests[FILE_LIST_PATH] == 2
+    assert _ids(list(files)) == file_ids[1:73]
+    # nothing is fetched beyond the limit:
+    assert server.requests[FILE_LIST_PATH] == 2
+
+
+def test_iter_files_stops_early(
+    server: MockMillionVerifierServer,
+    client: MillionVerifierClient,
+    file_ids: List[int],
+) -> None:
+    files = client.iter_files()
+    next(files)
+    files.close()
+    time.sleep(0.05)
+    # at most the prefetched page was fetched:
+    assert server.requests[FILE_LIST_PATH] <= 2
@@ -34,6 +34,30 @@ def test_list_files() -> None:
     assert len(files["files"]) == files["total"]
 
 
+def test_list_files_concurrent() -> None:
+    serial_files = CLIENT.list_files()
+    concurrent_files = CLIENT.list_files(max_workers=8)
+    assert concurrent_files["total"] == serial_files["total"]
+    assert [file["file_id"] for file in concurrent_files["files"]] == [
+        file["file_id"] for file in serial_files["files"]
+    ]
+
+
+def test_iter_files() -> None:
+    files = CLIENT.list_files()
+    iterated_files = list(CLIENT.iter_files())
+    for file in iterated_files:
+        assert_typed_dict(
+            obj=file,
+            desired_type=FileInfo,
+        )
+
+    assert [file["file_id"] for file in iterated_files] == [
+        file["file_id"] for file in files["files"]
+    ]
+    assert len(list(CLIENT.iter_files(limit=3))) == min(3, files["total"])
+
+
 # now that we know list_files works (to some degree), let's get all files for ease of use:
 _all_files = CLIENT.list_files()
 ALL_FILES = _all_files["files"]
@@ -126,6 +150,29 @@ def test_get_report() -> None:
         )
 
 
+def test_iter_report() -> None:
+    file_id = _random_file_id()
+    rows = list(CLIENT.iter_report(file_id=file_id))
+    for row in rows:
+        assert_typed_dict(
+            obj=row,
+            desired_type=ReportEntry,
+            file_id=file_id,
+        )
+
+    assert rows == CLIENT.get_report(file_id=file_id)
+
+
+def test_download_report(tmp_path) -> None:
+    file_id = _random_file_id()
+    report = CLIENT.get_report(file_id=file_id)
+    destination = tmp_path / "report.csv"
+    summary = CLIENT.download_report(file_id=file_id, destination=destination)
+    assert summary["rows_written"] == len(report)
+    assert summary["bytes_written"] == destination.stat().st_size
+    assert not summary["resumed"]
+
+
 def test_get_report_fuzz_filters() -> None:
     for _ in range(10):
         # randomly generate arguments:
@@ -168,6 +215,9 @@ def test_file_not_found() -> None:
     with pytest.raises(FileNotFoundError):
         CLIENT.get_report(file_id=fake_file_id)
 
+    with pytest.raises(FileNotFoundError):
+        next(CLIENT.iter_report(file_id=fake_file_id))
+
     with pytest.raises(FileNotFoundError):
         CLIENT.stop_a_file_in_progress(file_id=fake_file_id)
 
@@ -0,0 +1,252 @@
+import io
+import asyncio
+from typing import Callable, List, Any, TYPE_CHECKING
+
+import pytest
+
+from million_verifier import (
+    MillionVerifierClient,
+    AsyncMillionVerifierClient,
+    RetryPolicy,
+    ClientHooks,
+    CombinedHooks,
+    PrometheusHooks,
+    OpenTelemetryHooks,
+    RequestStarted,
+    RequestFinished,
+    RetryEvent,
+    InvalidAPIKey,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import VERIFY_PATH, CREDITS_PATH, DOWNLOAD_PATH
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+
+class RecordingHooks(ClientHooks):
+    def __init__(self) -> None:
+        self.started: List[RequestStarted] = []
+        self.finished: List[RequestFinished] = []
+        self.retried: List[RetryEvent] = []
+
+    def request_started(self, event: RequestStarted) -> None:
+        self.started.append(event)
+
+    def request_finished(self, event: RequestFinished) -> None:
+        self.finished.append(event)
+
+    def request_retried(self, event: RetryEvent) -> None:
+        self.retried.append(event)
+
+
+def test_request_events(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    hooks = RecordingHooks()
+    client = make_client(hooks=hooks)
+    server.inject_error(error="rate_limited", times=1, path=VERIFY_PATH)
+    client.verify_email_address(email="ok@example.com")
+    # a retried request is a single request to the hooks:
+    assert len(hooks.started) == len(hooks.finished) == 1
+    assert [event["status_code"] for event in hooks.retried] == [429]
+    event = hooks.finished[0]
+    assert event["method"] == "GET"
+    assert event["url"] == f"{server.url}{VERIFY_PATH}"
+    assert event["status_code"] == 200
+    assert event["error"] is None
+    assert event["duration"] >= event["parse_time"] >= 0
+    assert event["response_time"] >= 0
+    assert event["response_bytes"] > 0
+    assert event["request_bytes"] == 0
+    assert event["execution_time"] is not None
+
+
+def test_request_errors(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    hooks = RecordingHooks()
+    with pytest.raises(InvalidAPIKey):
+        make_client(hooks=hooks, api_key="wrong").check_credits()
+
+    event = hooks.finished[0]
+    assert event["url"] == f"{server.url}{CREDITS_PATH}"
+    assert isinstance(event["error"], InvalidAPIKey)
+    assert event["execution_time"] is None
+
+
+def test_uploads_and_streams(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    hooks = RecordingHooks()
+    client = make_client(hooks=CombinedHooks(hooks=[ClientHooks(), hooks]))
+    info = client.upload_emails(emails=["ok@example.com"] * 10, file_name="emails.txt")
+    assert hooks.finished[-1]["method"] == "POST"
+    # uploaded emails are streamed, without a known size:
+    assert hooks.finished[-1]["request_bytes"] is None
+    client.bulk_job(file_id=info["file_id"]).wait(timeout=10)
+    report = io.BytesIO()
+    client.download_report(file_id=info["file_id"], destination=report)
+    event = hooks.finished[-1]
+    assert event["url"] == f"{server.url}{DOWNLOAD_PATH}"
+    assert event["response_bytes"] == len(report.getvalue())
+    # streamed bodies are parsed while they're read:
+    assert event["parse_time"] is None
+
+
+def test_async_hooks(server: MockMillionVerifierServer) -> None:
+    pytest.importorskip("httpx")
+    hooks = RecordingHooks()
+
+    async def verify() -> None:
+        async with AsyncMillionVerifierClient(
+            api_key="key",
+            retry_policy=RetryPolicy(backoff_factor=0),
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+            hooks=hooks,
+        ) as client:
+            await asyncio.gather(
+                *[
+                    client.verify_email_address(email=f"ok.{index}@example.com")
+                    for index in range(5)
+                ]
+            )
+
+    server.inject_error(error="rate_limited", times=1, path=VERIFY_PATH)
+    asyncio.run(verify())
+    assert len(hooks.finished) == 5
+    assert len(hooks.retried) == 1
+    assert {event["status_code"] for event in hooks.finished} == {200}
+
+
+def test_prometheus_hooks(
+    server: MockMillionVerifierServer, make_client: Callable[..., MillionVerifierClient]
+) -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    client = make_client(hooks=PrometheusHooks(registry=registry))
+    server.inject_error(error="rate_limited", times=1, path=VERIFY_PATH)
+    client.verify_email_address(email="ok@example.com")
+    client.verify_email_address(email="ok@example.com")
+    labels = {"method": "GET", "path": VERIFY_PATH}
+    assert (
+        registry.get_sample_value(
+            "million_verifier_requests_total", {**labels, "status": "200"}
+        )
+        == 2
+    )
+    assert (
+        registry.get_sample_value(
+            "million_verifier_request_duration_seconds_count", labels
+        )
+        == 2
+    )
+    assert (
+        registry.get_sample_value("million_verifier_response_bytes_total", labels) > 0
+    )
+    assert (
+        registry.get_sample_value(
+            "million_verifier_verification_execution_seconds_count"
+        )
+        == 2
+    )
+    assert (
+        registry.get_sample_value(
+            "million_verifier_retries_total", {"path": VERIFY_PATH, "reason": "429"}
+        )
+        == 1
+    )
+
+
+@pytest.fixture
+def span_exporter() -> "InMemorySpanExporter":
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    return InMemorySpanExporter()
+
+
+def _tracer(span_exporter: "InMemorySpanExporter") -> Any:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    return provider.get_tracer("tests")
+
+
+class ActiveSpanHooks(ClientHooks):
+    def __init__(self) -> None:
+        self.spans: List[Any] = []
+
+    def request_retried(self, event: RetryEvent) -> None:
+        from opentelemetry import trace
+
+        self.spans.append(trace.get_current_span())
+
+
+def test_opentelemetry_hooks(
+    server: MockMillionVerifierServer,
+    make_client: Callable[..., MillionVerifierClient],
+    span_exporter: "InMemorySpanExporter",
+) -> None:
+    tracer = _tracer(span_exporter=span_exporter)
+    active = ActiveSpanHooks()
+    client = make_client(
+        hooks=CombinedHooks(hooks=[OpenTelemetryHooks(tracer=tracer), active])
+    )
+    server.inject_error(error="rate_limited", times=1, path=VERIFY_PATH)
+    with tracer.start_as_current_span("caller") as parent:
+        client.verify_email_address(email="ok@example.com")
+
+    span, _ = span_exporter.get_finished_spans()
+    assert span.name == f"GET {VERIFY_PATH}"
+    assert span.parent.span_id == parent.get_span_context().span_id
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.attributes["million_verifier.execution_time"] >= 0
+    assert span.end_time > span.start_time
+    # the retry is recorded on the request's span, which is active while it runs:
+    (retry,) = span.events
+    assert retry.name == "million_verifier.retry"
+    assert retry.attributes["http.response.status_code"] == 429
+    assert [active_span.get_span_context() for active_span in active.spans] == [
+        span.context
+    ]
+
+
+def test_async_opentelemetry_hooks(
+    server: MockMillionVerifierServer, span_exporter: "InMemorySpanExporter"
+) -> None:
+    tracer = _tracer(span_exporter=span_exporter)
+
+    async def verify() -> None:
+        async with AsyncMillionVerifierClient(
+            api_key="key",
+            retry_policy=RetryPolicy(backoff_factor=0),
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+            hooks=OpenTelemetryHooks(tracer=tracer),
+        ) as client:
+            await asyncio.gather(
+                *[
+                    client.verify_email_address(email=f"ok.{index}@example.com")
+                    for index in range(5)
+                ]
+            )
+
+    server.inject_error(error="rate_limited", times=1, path=VERIFY_PATH)
+    with tracer.start_as_current_span("caller") as parent:
+        asyncio.run(verify())
+
+    spans = span_exporter.get_finished_spans()[:-1]
+    assert len(spans) == 5
+    # concurrent requests each have a span of their own:
+    assert all(
+        span.parent.span_id == parent.get_span_context().span_id for span in spans
+    )
+    assert sum(len(span.events) for span in spans) == 1
@@ -0,0 +1,145 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from million_verifier import (
+    JsonDecoder,
+    FileInfo,
+    FileList,
+    FileStatus,
+    EmailVerification,
+    Quality,
+    SubResult,
+)
+from million_verifier._api import parse_file_list, parse_email_verification
+from million_verifier._json import _BACKENDS, _is_installed
+
+
+BACKENDS = [
+    pytest.param(
+        backend,
+        marks=pytest.mark.skipif(
+            not _is_installed(backend=backend), reason=f"{backend} is not installed"
+        ),
+    )
+    for backend in _BACKENDS
+]
+
+FILE_INFO = {
+    "file_id": "123",
+    "file_name": "emails.csv",
+    "status": "in_progress",
+    "unique_emails": 10,
+    "updated_at": "2024-01-02 10:11:12",
+    "createdate": "2024-01-02 09:00:00",
+    "percent": 50,
+    "total_rows": 10,
+    "verified": 5,
+    "unverified": 5,
+    "ok": 5,
+    "catch_all": 0,
+    "disposable": 0,
+    "invalid": 0,
+    "unknown": 0,
+    "reverify": 0,
+    "credit": 5,
+    "estimated_time_sec": 30,
+    "error": "",
+}
+VERIFICATION = {
+    "email": "matthew@gmail.com",
+    "quality": "good",
+    "result": "ok",
+    "resultcode": 1,
+    "subresult": "ok",
+    "free": True,
+    "role": False,
+    "didyoumean": "",
+    "credits": 100,
+    "executiontime": 1,
+    "error": "",
+    "livemode": True,
+}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decode_file_list(backend: str) -> None:
+    decoder = JsonDecoder(backend=backend)
+    body = json.dumps({"files": [FILE_INFO], "total": "1"}).encode()
+    file_list = parse_file_list(
+        response=decoder.decode(body=body, response_format=FileList), limit=50
+    )
+    assert file_list["total"] == 1
+    info = file_list["files"][0]
+    assert info["file_id"] == 123
+    assert info["status"] is FileStatus.IN_PROGRESS
+    assert info["updated_at"] == datetime(2024, 1, 2, 10, 11, 12)
+    assert info["createdate"] == datetime(2024, 1, 2, 9)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decode_email_verification(backend: str) -> None:
+    decoder = JsonDecoder(backend=backend)
+    body = json.dumps(VERIFICATION).encode()
+    verification = parse_email_verification(
+        response=decoder.decode(body=body, response_format=EmailVerification)
+    )
+    assert verification["quality"] is Quality.GOOD
+    assert verification["subresult"] is SubResult.OK
+    assert verification == {
+        **VERIFICATION,
+        "quality": "good",
+        "result": "ok",
+        "subresult": "ok",
+    }
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decode_error_response(backend: str) -> None:
+    decoder = JsonDecoder(backend=backend)
+    # error responses don't fit the format, so are decoded as they are:
+    assert decoder.decode(
+        body=b'{"error": "apikey not found"}', response_format=FileInfo
+    ) == {"error": "apikey not found"}
+    with pytest.raises(json.JSONDecodeError):
+        decoder.decode(body=b"file_id,email\n", response_format=FileInfo)
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(AssertionError):
+        JsonDecoder(backend="simplejson")
+
+
+def test_decode_unknown_fields() -> None:
+    # fields the API adds (that the formats don't declare yet):
+    verification = {**VERIFICATION, "new_field": "value"}
+    info = {**FILE_INFO, "new_field": 1}
+    decoded = []
+    for backend in _BACKENDS:
+        if not _is_installed(backend=backend):
+            continue
+
+        decoder = JsonDecoder(backend=backend)
+        decoded.append(
+            (
+                parse_email_verification(
+                    response=decoder.decode(
+                        body=json.dumps(verification).encode(),
+                        response_format=EmailVerification,
+                    )
+                ),
+                parse_file_list(
+                    response=decoder.decode(
+                        body=json.dumps({"files": [info], "total": 1}).encode(),
+                        response_format=FileList,
+                    ),
+                    limit=50,
+                ),
+            )
+        )
+
+    # every backend keeps them, and decodes the same:
+    assert decoded[0][0]["new_field"] == "value"
+    assert decoded[0][1]["files"][0]["new_field"] == 1
+    assert all(output == decoded[0] for output in decoded)
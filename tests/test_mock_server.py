@@ -0,0 +1,302 @@
+import time
+import asyncio
+import pathlib
+
+import pytest
+import requests
+
+from million_verifier import (
+    MillionVerifierClient,
+    AsyncMillionVerifierClient,
+    FileStatus,
+    Quality,
+    Result,
+    SubResult,
+    ResultFilter,
+    ReportStatus,
+    InvalidAPIKey,
+    IPAddressBlocked,
+    Preprocessor,
+    RetryPolicy,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import VERIFY_PATH, DOWNLOAD_PATH, UPLOAD_PATH
+
+
+def test_verify_email_address(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    verification = client.verify_email_address(email="info@gmail.com")
+    assert verification["email"] == "info@gmail.com"
+    assert verification["free"] and verification["role"]
+    # the result is the same for every request:
+    assert (
+        client.verify_email_address(email="info@gmail.com")["result"]
+        == verification["result"]
+    )
+
+    verification = client.verify_email_address(email="invalid.jane@example.com")
+    assert verification["result"] == Result.INVALID
+    assert verification["quality"] == Quality.BAD
+    assert not verification["free"] and not verification["role"]
+    assert (
+        client.verify_email_address(email="not-an-email")["subresult"]
+        == SubResult.INVALID_SYNTAX
+    )
+    assert client.check_credits()["credits"] == server.credits == 1_000_000 - 4
+
+
+def test_invalid_api_key(server: MockMillionVerifierServer) -> None:
+    client = MillionVerifierClient(
+        api_key="wrong", single_api_url=server.url, bulk_api_url=server.url
+    )
+    with pytest.raises(InvalidAPIKey):
+        client.check_credits()
+
+
+def test_injected_errors(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    # rate-limited requests are retried, even though verifications aren't idempotent:
+    server.inject_error(error="rate_limited", times=2, path=VERIFY_PATH)
+    assert client.verify_email_address(email="ok@example.com")["result"] == Result.OK
+    assert server.requests[VERIFY_PATH] == 3
+
+    server.inject_error(error="ip_address_blocked")
+    with pytest.raises(IPAddressBlocked):
+        client.check_credits()
+
+    server.inject_error(error="file_not_found")
+    with pytest.raises(FileNotFoundError):
+        client.get_file_info(file_id=1)
+
+
+def test_bulk_verification(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    emails = [
+        "ok@example.com",
+        "catch_all@example.com",
+        "invalid@example.com",
+        "info@gmail.com",
+        "ok@example.com",
+    ]
+    info = client.upload_emails(emails=emails, file_name="emails.txt")
+    assert info["total_rows"] == 5
+    assert info["unique_emails"] == 4
+    job = client.bulk_job(file_id=info["file_id"])
+    assert job.wait(timeout=10)["status"] == FileStatus.FINISHED
+
+    report = client.get_report(file_id=info["file_id"])
+    assert [entry["email"] for entry in report] == emails
+    assert [entry["result"] for entry in report[:3]] == [
+        Result.OK,
+        Result.CATCH_ALL,
+        Result.INVALID,
+    ]
+    report = client.get_report(file_id=info["file_id"], result_filter=ResultFilter.OK)
+    assert {entry["result"] for entry in report} == {Result.OK}
+    report = client.get_report(
+        file_id=info["file_id"],
+        result_filter=ResultFilter.CUSTOM,
+        status=[ReportStatus.OK, ReportStatus.CATCH_ALL],
+        include_free_domains=False,
+    )
+    assert [entry["email"] for entry in report] == [
+        "ok@example.com",
+        "catch_all@example.com",
+        "ok@example.com",
+    ]
+
+    files = client.list_files(file_id=info["file_id"])
+    assert [file["file_id"] for file in files["files"]] == [info["file_id"]]
+    assert client.delete_file(file_id=info["file_id"]) == {"result": "ok"}
+    with pytest.raises(FileNotFoundError):
+        client.get_file_info(file_id=info["file_id"])
+
+
+def test_preprocessed_upload(server: MockMillionVerifierServer) -> None:
+    preprocessor = Preprocessor()
+    client = MillionVerifierClient(
+        api_key="key",
+        single_api_url=server.url,
+        bulk_api_url=server.url,
+        preprocessor=preprocessor,
+    )
+    rows = ["email,name\n", "Jane@Example.com,Jane\n", "jane@example.com,J\n", "no,x\n"]
+    info = client.upload_emails(emails=rows, file_name="emails.csv", has_header=True)
+    # the header is kept, the duplicate and the invalid address are dropped:
+    assert info["total_rows"] == 1
+    assert server._files[info["file_id"]].headings == ["email", "name"]
+    assert server._files[info["file_id"]].emails == ["jane@example.com"]
+    # every input row maps back to the entry of its address:
+    report = client.bulk_job(file_id=info["file_id"]).iter_report(timeout=5)
+    assert [
+        (email, entry and entry["email"])
+        for email, entry in preprocessor.map_report(
+            lines=rows, report=report, has_header=True
+        )
+    ] == [
+        ("Jane@Example.com", "jane@example.com"),
+        ("jane@example.com", "jane@example.com"),
+        ("no", None),
+    ]
+
+
+def test_progress_and_stop(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    server.rows_per_second = 10
+    info = server.add_file(
+        contents="email,name\n"
+        + "".join(f"user{index}@example.com,User\n" for index in range(100))
+    )
+    assert info["status"] == FileStatus.IN_PROGRESS
+    assert info["estimated_time_sec"] == 10
+    client.stop_a_file_in_progress(file_id=info["file_id"])
+    info = client.get_file_info(file_id=info["file_id"])
+    assert info["status"] == FileStatus.CANCELED
+    # the report holds the rows verified before it was stopped:
+    assert len(client.get_report(file_id=info["file_id"])) == info["verified"] < 100
+
+
+def test_download_report_resumes(
+    client: MillionVerifierClient, server: MockMillionVerifierServer, tmp_path
+) -> None:
+    info = server.add_file(
+        contents="".join(f"user{index}@example.com\n" for index in range(100))
+    )
+    client.bulk_job(file_id=info["file_id"]).wait(timeout=10)
+    destination = tmp_path / "report.csv"
+    summary = client.download_report(file_id=info["file_id"], destination=destination)
+    assert not summary["resumed"] and summary["rows_written"] == 100
+    full = destination.read_bytes()
+    # an interrupted download:
+    destination.write_bytes(full[:1000])
+    summary = client.download_report(
+        file_id=info["file_id"], destination=destination, resume=True
+    )
+    assert summary["resumed"] and summary["bytes_written"] == len(full) - 1000
+    assert destination.read_bytes() == full
+    # resuming a complete report leaves it as is:
+    summary = client.download_report(
+        file_id=info["file_id"], destination=destination, resume=True
+    )
+    assert summary["resumed"] and summary["bytes_written"] == 0
+    assert destination.read_bytes() == full
+    # a partial report of a different report is downloaded again:
+    destination.write_bytes(full[:1000])
+    summary = client.download_report(
+        file_id=info["file_id"],
+        destination=destination,
+        result_filter=ResultFilter.OK,
+        resume=True,
+    )
+    assert not summary["resumed"]
+    assert destination.read_bytes() == server._files[info["file_id"]].report(
+        now=time.time(), params={"filter": ResultFilter.OK.value}
+    )
+
+
+def test_download_report_starts_over(
+    client: MillionVerifierClient, server: MockMillionVerifierServer, tmp_path
+) -> None:
+    info = server.add_file(contents="ok@example.com\n")
+    client.bulk_job(file_id=info["file_id"]).wait(timeout=10)
+    destination = tmp_path / "report.csv"
+    destination.write_bytes(b"stale")
+    # without resume (or without a validator), the report is downloaded in full:
+    for resume in (False, True):
+        summary = client.download_report(
+            file_id=info["file_id"], destination=destination, resume=resume
+        )
+        assert not summary["resumed"] and summary["rows_written"] == 1
+        (tmp_path / "report.csv.validator").unlink()
+
+
+def test_download_ranges(
+    client: MillionVerifierClient, server: MockMillionVerifierServer
+) -> None:
+    info = server.add_file(contents="ok@example.com\ninvalid@example.com\n")
+    client.bulk_job(file_id=info["file_id"]).wait(timeout=10)
+    url = f"{server.url}{DOWNLOAD_PATH}"
+    params = {"key": "key", "file_id": info["file_id"], "filter": "all"}
+    report = requests.get(url, params=params).content
+    response = requests.get(url, params=params, headers={"Range": "bytes=10-"})
+    assert response.status_code == 206
+    assert response.content == report[10:]
+    # a range starting at (or past) the end can't be satisfied:
+    for start in (len(report), len(report) + 10):
+        response = requests.get(
+            url, params=params, headers={"Range": f"bytes={start}-"}
+        )
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{len(report)}"
+
+
+def test_async_client(server: MockMillionVerifierServer) -> None:
+    pytest.importorskip("httpx")
+
+    async def verify() -> list:
+        async with AsyncMillionVerifierClient(
+            api_key="key",
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+        ) as client:
+            return await asyncio.gather(
+                *[
+                    client.verify_email_address(email=f"ok.{index}@example.com")
+                    for index in range(10)
+                ]
+            )
+
+    assert {verification["result"] for verification in asyncio.run(verify())} == {
+        Result.OK
+    }
+
+
+def test_async_client_bulk(
+    server: MockMillionVerifierServer, tmp_path: pathlib.Path
+) -> None:
+    pytest.importorskip("httpx")
+    emails = [f"ok.{row}@example.com" for row in range(20)]
+    path = tmp_path / "emails.txt"
+    path.write_text("\n".join(emails))
+
+    async def run() -> tuple:
+        async with AsyncMillionVerifierClient(
+            api_key="key",
+            retry_policy=RetryPolicy(backoff_factor=0),
+            single_api_url=server.url,
+            bulk_api_url=server.url,
+        ) as client:
+            results = [
+                result
+                async for result in client.verify_email_addresses(
+                    emails=emails[:5], max_concurrency=2
+                )
+            ]
+            # the upload is rewound after being rate-limited:
+            server.inject_error(error="rate_limited", times=1, path=UPLOAD_PATH)
+            info = await client.upload_file(file_path=str(path))
+            while (await client.get_file_info(file_id=info["file_id"]))[
+                "status"
+            ] != FileStatus.FINISHED:
+                await asyncio.sleep(0.01)
+
+            return (
+                results,
+                info,
+                await client.list_files(),
+                await client.get_report(file_id=info["file_id"]),
+                await client.check_credits(),
+            )
+
+    results, info, files, report, mv_credits = asyncio.run(run())
+    assert sorted(result["index"] for result in results) == list(range(5))
+    assert all(result["error"] is None for result in results)
+    assert server.requests[UPLOAD_PATH] == 2
+    assert info["total_rows"] == len(emails)
+    assert [file["file_id"] for file in files["files"]] == [info["file_id"]]
+    assert [entry["email"] for entry in report] == emails
+    assert mv_credits["credits"] == 1_000_000 - 5
@@ -0,0 +1,151 @@
+import threading
+from contextlib import nullcontext
+
+import pytest
+
+from million_verifier import (
+    MillionVerifierClient,
+    Preprocessor,
+    BloomFilter,
+    EmailVerification,
+    BatchVerification,
+    Quality,
+    Result,
+    SubResult,
+    canonicalise_email,
+    is_valid_syntax,
+)
+from million_verifier._preprocess import BatchFanOut
+
+
+@pytest.mark.parametrize(
+    "email, valid",
+    [
+        ("matthew@gmail.com", True),
+        ("first.last+tag@sub.domain.co.uk", True),
+        ("user@xn--bcher-kva.ch", True),
+        ("matthew", False),
+        ("matthew@gmail", False),
+        ("matthew@@gmail.com", False),
+        ("matt hew@gmail.com", False),
+        (".matthew@gmail.com", False),
+        ("matt..hew@gmail.com", False),
+        ("matthew@gmail..com", False),
+        ("matthew@-gmail.com", False),
+        (f"{'a' * 65}@gmail.com", False),
+    ],
+)
+def test_is_valid_syntax(email: str, valid: bool) -> None:
+    assert is_valid_syntax(email=email) == valid
+
+
+def test_canonicalise_email() -> None:
+    assert canonicalise_email(email="j.doe+news@googlemail.com") == "jdoe@gmail.com"
+    assert canonicalise_email(email="j.doe+news@hotmail.com") == "j.doe@outlook.com"
+    assert (
+        canonicalise_email(email="j.doe+news@example.com") == "j.doe+news@example.com"
+    )
+
+
+def test_bloom_filter() -> None:
+    bloom_filter = BloomFilter(capacity=10_000, error_rate=0.01)
+    for index in range(10_000):
+        bloom_filter.add(f"{index}@gmail.com")
+
+    assert all(f"{index}@gmail.com" in bloom_filter for index in range(10_000))
+    false_positives = sum(
+        f"{index}@yahoo.com" in bloom_filter for index in range(10_000)
+    )
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize("bloom_filter_capacity", [None, 1000])
+def test_filter_lines(bloom_filter_capacity) -> None:
+    # the Bloom filter silently drops unique addresses, so it warns:
+    with pytest.warns(UserWarning) if bloom_filter_capacity else nullcontext():
+        preprocessor = Preprocessor(
+            canonicalise_providers=True, bloom_filter_capacity=bloom_filter_capacity
+        )
+
+    lines = [
+        "email,name\n",
+        " J.Doe@Gmail.com,John\n",
+        "jdoe@gmail.com,Johnny\n",
+        "not-an-email,Nobody\n",
+        "\n",
+        "jane@example.com",
+    ]
+    assert list(preprocessor.filter_lines(lines=lines, has_header=True)) == [
+        b"email,name\n",
+        b"jdoe@gmail.com,John\n",
+        b"jane@example.com",
+    ]
+
+
+def _verification(email: str) -> EmailVerification:
+    return EmailVerification(
+        email=email,
+        quality=Quality.GOOD,
+        result=Result.OK,
+        resultcode=1,
+        subresult=SubResult.OK,
+        free=True,
+        role=False,
+        didyoumean="",
+        credits=100,
+        executiontime=1,
+        error="",
+        livemode=True,
+    )
+
+
+def test_verify_email_addresses_fans_out() -> None:
+    client = MillionVerifierClient(api_key="key", preprocessor=Preprocessor())
+    verified = []
+    lock = threading.Lock()
+
+    def verify(email: str, timeout: int, as_records: bool) -> EmailVerification:
+        with lock:
+            verified.append(email)
+
+        return _verification(email=email)
+
+    # no requests are made, so the key doesn't need to be valid:
+    client._verify_email_address = verify
+    emails = ["a@gmail.com", "A@gmail.com ", "invalid", "b@gmail.com", "a@gmail.com"]
+    results = sorted(
+        client.verify_email_addresses(emails=emails), key=lambda result: result["index"]
+    )
+    assert sorted(verified) == ["a@gmail.com", "b@gmail.com"]
+    assert [result["email"] for result in results] == emails
+    assert [result["verification"]["email"] for result in results] == emails
+    assert [result["verification"]["subresult"] for result in results] == [
+        SubResult.OK,
+        SubResult.OK,
+        SubResult.INVALID_SYNTAX,
+        SubResult.OK,
+        SubResult.OK,
+    ]
+
+
+def test_fan_out_is_bounded() -> None:
+    fan_out = BatchFanOut(preprocessor=Preprocessor(dedupe_window=10))
+    # a stream of any length, with every address repeated right away:
+    emails = (f"user.{index // 2}@gmail.com" for index in range(10_000))
+    fanned_out = 0
+    for index, email in enumerate(emails):
+        verify, results = fan_out.admit(index=index, email=email)
+        fanned_out += len(results)
+        if verify:
+            fan_out.complete(
+                result=BatchVerification(
+                    index=index,
+                    email=email,
+                    verification=_verification(email=email),
+                    error=None,
+                )
+            )
+
+        assert len(fan_out._done) <= 10 and not fan_out._waiting
+
+    assert fanned_out == 5_000
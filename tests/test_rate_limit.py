@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from million_verifier import (
+    TokenBucket,
+    FileTokenBucket,
+    RateLimiter,
+    MV_SINGLE_API_URL,
+    MV_BULK_API_URL,
+)
+
+
+def test_token_bucket_burst_then_rate() -> None:
+    bucket = TokenBucket(rate=10, capacity=5)
+    waits = [bucket.reserve() for _ in range(10)]
+    # the burst is free, after which every token costs 1 / rate seconds:
+    assert waits[:5] == [0.0] * 5
+    for i, wait in enumerate(waits[5:], start=1):
+        assert abs(wait - i / 10) < 0.01
+
+
+def test_token_bucket_threads() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        waits = sorted(executor.map(lambda _: bucket.reserve(), range(100)))
+
+    # no two callers are handed the same slot (tokens
+    # refill while reserving, hence the elapsed time):
+    assert waits[-1] >= 0.99 - (time.monotonic() - start)
+
+
+def test_file_token_bucket_shared(tmp_path) -> None:
+    path = str(tmp_path / "bucket")
+    # two buckets on the same path behave like one (as they would across processes):
+    first = FileTokenBucket(path=path, rate=10, capacity=2)
+    second = FileTokenBucket(path=path, rate=10, capacity=2)
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() > 0.05
+    assert second.reserve() > 0.15
+
+
+def test_rate_limiter_per_host() -> None:
+    limiter = RateLimiter(
+        buckets={
+            MV_SINGLE_API_URL: TokenBucket(rate=1, capacity=1),
+            "bulkapi.millionverifier.com": TokenBucket(rate=1, capacity=1),
+        }
+    )
+    assert limiter.reserve(url=f"{MV_SINGLE_API_URL}/api/v3") == 0.0
+    assert limiter.reserve(url=f"{MV_SINGLE_API_URL}/api/v3") > 0.9
+    assert limiter.reserve(url=f"{MV_BULK_API_URL}/bulkapi/v2/filelist") == 0.0
+    assert limiter.reserve(url="https://example.com") == 0.0
+
+
+def test_rate_limiter_blocking(tmp_path) -> None:
+    limiter = RateLimiter(
+        buckets={
+            MV_SINGLE_API_URL: FileTokenBucket(path=str(tmp_path / "bucket"), rate=1),
+            MV_BULK_API_URL: TokenBucket(rate=1),
+        }
+    )
+    # async clients reserve from file buckets in a thread, off the event loop:
+    assert limiter.blocking(url=f"{MV_SINGLE_API_URL}/api/v3")
+    assert not limiter.blocking(url=f"{MV_BULK_API_URL}/bulkapi/v2/filelist")
+    assert not limiter.blocking(url="https://example.com")
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+import pytest
+
+from million_verifier import (
+    MillionVerifierClient,
+    AsyncMillionVerifierClient,
+    JsonDecoder,
+    EmailVerificationRecord,
+    FileInfoRecord,
+    ReportEntryRecord,
+    ReportDecoder,
+    FileStatus,
+    Quality,
+    Result,
+    SubResult,
+)
+from million_verifier.testing import MockMillionVerifierServer
+
+
+def test_email_verification_record() -> None:
+    verification = {
+        "email": "matthew@gmail.com",
+        "quality": Quality.GOOD,
+        "result": Result.OK,
+        "resultcode": 1,
+        "subresult": SubResult.OK,
+        "free": True,
+        "role": False,
+        "didyoumean": "",
+        "credits": 100,
+        "executiontime": 1,
+        "error": "",
+        "livemode": True,
+    }
+    record = EmailVerificationRecord.from_dict(verification)
+    assert record.result == Result.OK
+    assert record.to_dict() == verification
+    assert not hasattr(record, "__dict__")
+
+
+def test_file_info_record() -> None:
+    info = {
+        "file_id": 1,
+        "file_name": "emails.txt",
+        "status": FileStatus.FINISHED,
+        "unique_emails": 2,
+        "updated_at": datetime(2024, 1, 1),
+        "createdate": datetime(2024, 1, 1),
+        "percent": 100,
+        "total_rows": 2,
+        "verified": 2,
+        "unverified": 0,
+        "ok": 2,
+        "catch_all": 0,
+        "disposable": 0,
+        "invalid": 0,
+        "unknown": 0,
+        "reverify": 0,
+        "credit": 2,
+        "estimated_time_sec": 0,
+        "error": "",
+    }
+    assert FileInfoRecord.from_dict(info).to_dict() == info
+
+
+def test_report_entry_records() -> None:
+    lines = [
+        "email,name,quality,result,free,role\n",
+        "a@gmail.com,Matthew,good,ok,yes,no\n",
+    ]
+    records = list(ReportDecoder.iter_records(lines=lines))
+    assert records == [
+        ReportEntryRecord(
+            email="a@gmail.com",
+            quality=Quality.GOOD,
+            result=Result.OK,
+            free=True,
+            role=False,
+            extra_columns=("name",),
+            extra_values=("Matthew",),
+        )
+    ]
+    assert records[0].extra == {"name": "Matthew"}
+    # records hold the same data as the dicts:
+    assert [record.to_dict() for record in records] == list(
+        ReportDecoder.iter_report(lines=lines)
+    )
+    assert ReportEntryRecord.from_dict(records[0].to_dict()) == records[0]
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def decoding_client(
+    request: pytest.FixtureRequest, make_client: Callable[..., MillionVerifierClient]
+) -> MillionVerifierClient:
+    pytest.importorskip(request.param)
+    return make_client(json_decoder=JsonDecoder(backend=request.param))
+
+
+def test_client_records(
+    server: MockMillionVerifierServer, decoding_client: MillionVerifierClient
+) -> None:
+    record = decoding_client.verify_email_address(
+        email="ok@example.com", as_records=True
+    )
+    assert isinstance(record, EmailVerificationRecord)
+    assert record.result == Result.OK
+    verification = decoding_client.verify_email_address(email="ok@example.com")
+    assert record.to_dict() == {**verification, "credits": record.credits}
+    results = list(
+        decoding_client.verify_email_addresses(
+            emails=["ok@example.com", "invalid@example.com"], as_records=True
+        )
+    )
+    assert all(
+        isinstance(result["verification"], EmailVerificationRecord)
+        for result in results
+    )
+    file_id = server.add_file(contents="ok@example.com")["file_id"]
+    info = decoding_client.get_file_info(file_id=file_id, as_records=True)
+    assert isinstance(info, FileInfoRecord)
+    assert info.to_dict() == decoding_client.get_file_info(file_id=file_id)
+    files = decoding_client.list_files(as_records=True)["files"]
+    assert [file.to_dict() for file in files] == decoding_client.list_files()["files"]
+
+
+def test_async_client_records(server: MockMillionVerifierServer) -> None:
+    async def verify() -> Tuple[EmailVerificationRecord, List[FileInfoRecord]]:
+        async with AsyncMillionVerifierClient(
+            api_key="key", single_api_url=server.url, bulk_api_url=server.url
+        ) as client:
+            record = await client.verify_email_address(
+                email="ok@example.com", as_records=True
+            )
+            return record, (await client.list_files(as_records=True))["files"]
+
+    server.add_file(contents="ok@example.com")
+    record, files = asyncio.run(verify())
+    assert isinstance(record, EmailVerificationRecord)
+    assert record.email == "ok@example.com"
+    assert all(isinstance(file, FileInfoRecord) for file in files)
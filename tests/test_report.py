@@ -0,0 +1,70 @@
+import pytest
+
+from million_verifier import ReportDecoder, Quality, Result, SubResult
+
+
+HEADINGS = ["email", "quality", "result", "subresult", "free", "role"]
+
+
+def test_decode_report() -> None:
+    lines = [
+        "email,quality,result,subresult,free,role\n",
+        "a@gmail.com,good,ok,ok,yes,no\n",
+        "b@example.com,bad,invalid,no_mailbox,NO,Yes\n",
+    ]
+    assert list(ReportDecoder.iter_report(lines=lines)) == [
+        {
+            "email": "a@gmail.com",
+            "quality": Quality.GOOD,
+            "result": Result.OK,
+            "subresult": SubResult.OK,
+            "free": True,
+            "role": False,
+        },
+        {
+            "email": "b@example.com",
+            "quality": Quality.BAD,
+            "result": Result.INVALID,
+            "subresult": SubResult.NO_MAILBOX,
+            "free": False,
+            "role": True,
+        },
+    ]
+
+
+def test_decode_converts_to_enums() -> None:
+    entry = ReportDecoder(headings=HEADINGS).decode(
+        ["a@gmail.com", "Risky", "catch_all", "new_sub_result", "no", "no"]
+    )
+    assert isinstance(entry["quality"], Quality) and entry["quality"] == Quality.RISKY
+    assert isinstance(entry["result"], Result)
+    # unrecognised sub-results are kept as they are:
+    assert entry["subresult"] == "new_sub_result"
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        ["a@gmail.com", "great", "ok", "ok", "yes", "no"],
+        ["a@gmail.com", "good", "ok", "ok", "maybe", "no"],
+    ],
+)
+def test_decode_unrecognised_value(row) -> None:
+    with pytest.raises(ValueError):
+        ReportDecoder(headings=HEADINGS).decode(row)
+
+
+def test_decode_short_row() -> None:
+    assert ReportDecoder(headings=HEADINGS).decode(["a@gmail.com", "good"]) == {
+        "email": "a@gmail.com",
+        "quality": Quality.GOOD,
+    }
+
+
+def test_decode_many_batches() -> None:
+    lines = ["email,quality\n"] + [f"{index}@gmail.com,good\n" for index in range(3000)]
+    entries = list(ReportDecoder.iter_report(lines=lines))
+    assert [entry["email"] for entry in entries] == [
+        f"{index}@gmail.com" for index in range(3000)
+    ]
+    assert list(ReportDecoder.iter_report(lines=[])) == []
@@ -0,0 +1,69 @@
+import pytest
+import requests
+
+from million_verifier import RetryPolicy, MillionVerifierClient
+from million_verifier._retry import connection_refused
+
+# nothing listens on port 1, so connections are refused:
+CLOSED_URL = "http://127.0.0.1:1"
+
+
+def test_retryable_statuses() -> None:
+    policy = RetryPolicy()
+    for status_code in (500, 502, 503, 504):
+        assert policy.is_retryable_status(status_code=status_code, idempotent=True)
+        # non-idempotent requests may already have been processed:
+        assert not policy.is_retryable_status(status_code=status_code, idempotent=False)
+
+    # rate-limited requests were never processed:
+    assert policy.is_retryable_status(status_code=429, idempotent=False)
+    assert not policy.is_retryable_status(status_code=404, idempotent=True)
+
+
+def test_retryable_errors() -> None:
+    policy = RetryPolicy()
+    assert policy.is_retryable_error(connected=False, idempotent=False)
+    assert policy.is_retryable_error(connected=True, idempotent=True)
+    assert not policy.is_retryable_error(connected=True, idempotent=False)
+
+
+def test_backoff() -> None:
+    policy = RetryPolicy(max_attempts=5, backoff_factor=1, max_backoff=3)
+    assert policy.can_retry(attempt=4)
+    assert not policy.can_retry(attempt=5)
+    for attempt in range(1, 10):
+        assert 0 <= policy.backoff(attempt=attempt) <= min(3, 2 ** (attempt - 1))
+
+    # the server's Retry-After takes precedence over max_backoff:
+    assert policy.backoff(attempt=1, retry_after="10") >= 10
+    assert policy.backoff(attempt=1, retry_after="not a date") <= 1
+    assert not RetryPolicy(respect_retry_after=False).backoff(1, retry_after="10") > 1
+
+
+def test_connection_refused() -> None:
+    with pytest.raises(requests.ConnectionError) as error:
+        requests.get(CLOSED_URL)
+
+    assert connection_refused(error=error.value)
+    assert not connection_refused(error=requests.ConnectionError("reset"))
+    httpx = pytest.importorskip("httpx")
+    with pytest.raises(httpx.ConnectError) as error:
+        httpx.get(CLOSED_URL)
+
+    assert connection_refused(error=error.value)
+
+
+def test_retries_refused_verifications() -> None:
+    events = []
+    client = MillionVerifierClient(
+        api_key="key",
+        single_api_url=CLOSED_URL,
+        retry_policy=RetryPolicy(
+            max_attempts=2, backoff_factor=0, on_retry=events.append
+        ),
+    )
+    # verifications aren't idempotent, but a refused one was never sent:
+    with pytest.raises(requests.ConnectionError):
+        client.verify_email_address(email="matthew@gmail.com")
+
+    assert len(events) == 1
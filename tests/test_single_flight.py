@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from million_verifier import (
+    SingleFlight,
+    AsyncSingleFlight,
+    MillionVerifierClient,
+)
+from million_verifier.testing import MockMillionVerifierServer
+from million_verifier._api import VERIFY_PATH
+
+
+def test_single_flight_shares_call() -> None:
+    single_flight = SingleFlight()
+    calls = []
+    lock = threading.Lock()
+
+    def fetch() -> str:
+        with lock:
+            calls.append(1)
+
+        time.sleep(0.1)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(
+            executor.map(lambda _: single_flight.do(key="key", fn=fetch), range(10))
+        )
+
+    assert results == ["result"] * 10
+    assert len(calls) == 1
+    # once the call is done, the next call is made afresh:
+    assert single_flight.do(key="key", fn=fetch) == "result"
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_exception() -> None:
+    single_flight = SingleFlight()
+
+    def fail() -> None:
+        time.sleep(0.1)
+        raise FileNotFoundError("file_not_found")
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(single_flight.do, key="key", fn=fail) for _ in range(5)
+        ]
+        for future in futures:
+            with pytest.raises(FileNotFoundError):
+                future.result()
+
+
+def test_async_single_flight() -> None:
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch(value: str) -> str:
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    async def run() -> list:
+        return await asyncio.gather(
+            *[single_flight.do(key="a", fn=lambda: fetch("a")) for _ in range(5)],
+            *[single_flight.do(key="b", fn=lambda: fetch("b")) for _ in range(5)],
+        )
+
+    results = asyncio.run(run())
+    assert results == ["a"] * 5 + ["b"] * 5
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_coalesced_results_are_copies() -> None:
+    emails = ["Ok.Jane@example.com", "ok.jane@example.com ", "ok.jane@example.com"]
+    with MockMillionVerifierServer(api_key="key", latency=0.2) as server:
+        client = MillionVerifierClient(
+            api_key="key", single_api_url=server.url, bulk_api_url=server.url
+        )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            verifications = list(
+                executor.map(
+                    lambda email: client.verify_email_address(email=email), emails
+                )
+            )
+
+        assert server.requests[VERIFY_PATH] == 1
+
+    # every caller gets its own copy, with its own address:
+    assert [verification["email"] for verification in verifications] == emails
+    verifications[0]["result"] = None
+    assert all(verification["result"] for verification in verifications[1:])
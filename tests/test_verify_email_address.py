@@ -20,3 +20,27 @@ def test_verify_email_address() -> None:
                 desired_type=EmailVerification,
             )
             assert verification["email"] == address
+
+
+def test_verify_email_addresses() -> None:
+    addresses = [
+        "matthew@gmail.com",
+        "mark@outlook.com",
+        "luke@hotmail.com",
+        "john@yahoo.com",
+        "howdy",
+    ]
+    results = list(
+        FREE_CLIENT.verify_email_addresses(
+            emails=addresses,
+            max_concurrency=3,
+        )
+    )
+    assert sorted(result["index"] for result in results) == list(range(len(addresses)))
+    for result in results:
+        assert result["error"] is None
+        assert_typed_dict(
+            obj=result["verification"],
+            desired_type=EmailVerification,
+        )
+        assert result["verification"]["email"] == addresses[result["index"]]